@@ -5,6 +5,7 @@ Connects the agent system with the RAG knowledge base for smarter task planning.
 
 import sys
 import os
+from collections import OrderedDict
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 import logging
@@ -18,6 +19,7 @@ if str(sevdo_frontend_path) not in sys.path:
 try:
     from sevdo_frontend.rag.similarity_search import SimilaritySearchService
     from sevdo_frontend.rag.embeddings import EmbeddingsService
+    from sevdo_frontend.rag.registry import get_registry
 
     RAG_AVAILABLE = True
 except ImportError as e:
@@ -26,20 +28,47 @@ except ImportError as e:
 
 logger = logging.getLogger(__name__)
 
+# Max number of batch-searched contexts kept for later get_relevant_context calls
+PREFETCH_LIMIT = 128
+
 
 class AgentRAGService:
     """RAG service specifically designed for agent system integration."""
 
-    def __init__(self, knowledge_base_dir: str = "knowledge_base_RAG"):
+    def __init__(
+        self,
+        knowledge_base_dir: str = "knowledge_base_RAG",
+        model_name: Optional[str] = None,
+        shared: bool = True,
+    ):
+        """
+        Args:
+            knowledge_base_dir: Knowledge base directory, relative to project root
+            model_name: Embedding model name (default model if None)
+            shared: Reuse the process-wide warmed-up search service instead of
+                    loading the model and knowledge base again
+        """
         self.rag_service = None
         self.is_initialized = False
+        self.shared = shared
+        # (description, top_k) -> (index generation, context items)
+        self._prefetched: "OrderedDict[tuple, tuple]" = OrderedDict()
 
         if RAG_AVAILABLE:
             try:
                 # Use relative path from project root
                 kb_path = project_root / knowledge_base_dir
-                self.rag_service = SimilaritySearchService(str(kb_path))
-                self.is_initialized = self.rag_service.initialize()
+                if shared:
+                    registry = get_registry()
+                    self.rag_service = registry.get(str(kb_path), model_name)
+                    self.is_initialized = registry.is_ready(
+                        str(kb_path), model_name
+                    )
+                else:
+                    self.rag_service = SimilaritySearchService(
+                        str(kb_path), model_name=model_name
+                    )
+                    self.is_initialized = self.rag_service.initialize()
                 if self.is_initialized:
                     logger.info(
                         "RAG service successfully initialized for agents"
@@ -53,6 +82,35 @@ class AgentRAGService:
                 "RAG system not available - running without RAG integration"
             )
 
+    @staticmethod
+    def warm_up(
+        knowledge_base_dir: str = "knowledge_base_RAG",
+        model_name: Optional[str] = None,
+        background: bool = True,
+    ):
+        """Warm up the shared RAG service ahead of the first agent request."""
+        if not RAG_AVAILABLE:
+            return None
+        return get_registry().warm_up(
+            str(project_root / knowledge_base_dir), model_name, background
+        )
+
+    @staticmethod
+    async def awarm_up(
+        knowledge_base_dir: str = "knowledge_base_RAG",
+        model_name: Optional[str] = None,
+    ) -> None:
+        """
+        Await the shared RAG service's warm-up without blocking the event loop.
+
+        Afterwards constructing a shared AgentRAGService returns at once.
+        """
+        if not RAG_AVAILABLE:
+            return
+        await get_registry().aget(
+            str(project_root / knowledge_base_dir), model_name
+        )
+
     def get_relevant_context(
         self, task_description: str, top_k: int = 3
     ) -> List[Dict[str, Any]]:
@@ -60,30 +118,79 @@ class AgentRAGService:
         if not self.is_initialized or not self.rag_service:
             return []
 
+        prefetched = self._prefetched.get((task_description, top_k))
+        if prefetched is not None and prefetched[0] == self._index_generation():
+            return list(prefetched[1])
+
         try:
             search_results = self.rag_service.search(
                 task_description, top_k=top_k
             )
-
-            context_items = []
-            for result in search_results:
-                context_items.append(
-                    {
-                        "title": result.document.title,
-                        "content": result.matching_chunks[0][0]
-                        if result.matching_chunks
-                        else "",
-                        "similarity": result.similarity_score,
-                        "doc_id": result.document.doc_id,
-                    }
-                )
-
-            return context_items
+            return self._to_context_items(search_results)
 
         except Exception as e:
             logger.error(f"RAG search failed: {e}")
             return []
 
+    def search_many(
+        self, task_descriptions: List[str], top_k: int = 3
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Get relevant context for several task descriptions in one batch.
+
+        All descriptions are embedded in a single round trip. Results are
+        also remembered so later get_relevant_context() calls for the same
+        description (e.g. from solve_subtask or suggest_tokens) reuse them,
+        until the knowledge base is reindexed or clear_prefetched() is called.
+        """
+        if not self.is_initialized or not self.rag_service:
+            return [[] for _ in task_descriptions]
+
+        try:
+            batch_results = self.rag_service.search_many(
+                task_descriptions, top_k=top_k
+            )
+        except Exception as e:
+            logger.error(f"RAG batch search failed: {e}")
+            return [[] for _ in task_descriptions]
+
+        contexts = []
+        for description, search_results in zip(
+            task_descriptions, batch_results
+        ):
+            items = self._to_context_items(search_results)
+            self._remember((description, top_k), items)
+            contexts.append(items)
+        return contexts
+
+    def clear_prefetched(self) -> None:
+        """Forget the contexts remembered by search_many()."""
+        self._prefetched.clear()
+
+    def _index_generation(self) -> int:
+        return getattr(self.rag_service, "index_generation", 0)
+
+    def _remember(self, key: tuple, items: List[Dict[str, Any]]) -> None:
+        self._prefetched[key] = (self._index_generation(), items)
+        self._prefetched.move_to_end(key)
+        while len(self._prefetched) > PREFETCH_LIMIT:
+            self._prefetched.popitem(last=False)
+
+    def _to_context_items(self, search_results) -> List[Dict[str, Any]]:
+        context_items = []
+        for result in search_results:
+            context_items.append(
+                {
+                    "title": result.document.title,
+                    "content": result.matching_chunks[0][0]
+                    if result.matching_chunks
+                    else "",
+                    "similarity": result.similarity_score,
+                    "doc_id": result.document.doc_id,
+                }
+            )
+        return context_items
+
     def _get_backend_tokens(self) -> List[str]:
         """Get backend-specific tokens from knowledge base."""
         import re
@@ -194,6 +301,8 @@ class AgentRAGService:
         return {
             "rag_available": RAG_AVAILABLE,
             "initialized": self.is_initialized,
+            "shared": self.shared,
+            "registry": get_registry().status() if RAG_AVAILABLE else [],
             "service_info": self.rag_service.get_info()
             if self.rag_service
             else None,
@@ -186,6 +186,12 @@ def execute_task(
 
     logger.info(f"📋 Executing {len(subtasks)} subtasks")
 
+    # One embedding round trip for every subtask's RAG context, remembered
+    # until this task is done
+    rag_service.search_many(
+        [sub.get("task", "") for sub in subtasks if sub.get("task")]
+    )
+
     results: List[Dict[str, Any]] = []
 
     for i, sub in enumerate(subtasks):
@@ -236,4 +242,5 @@ def execute_task(
 
         results.append(result)
 
+    rag_service.clear_prefetched()
     return {"task": task, "subtasks": subtasks, "results": results}
@@ -3,18 +3,23 @@ from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
 from pathlib import Path
+from collections.abc import Mapping
+import json
 import os
-import threading
-from time import time
 from hashlib import sha256
 import concurrent.futures as cf
 
 # Import endpoint registry
 from sevdo_backend.endpoints import (
-    load_all_endpoints,
+    ROUTE_DECORATOR_RE,
     get_endpoint_module,
+    get_manifest_entry,
     list_available_tokens,
 )
+from sevdo_backend.code_assembly import assemble_module
+from sevdo_common.batch_stream import batch_stream_response, check_stream_mode
+from sevdo_common.disk_cache import open_disk_cache
+from sevdo_common.translation_cache import TranslationCache
 
 # Core imports that are always included
 CORE_IMPORTS = """
@@ -140,6 +145,216 @@ class UserResponse(BaseModel):
 
 """
 
+# Core header for backends that ship the shared models.py/schemas.py next to
+# the generated module instead of defining models inline
+SHARED_MODELS_CORE_IMPORTS = """
+from fastapi import FastAPI, Depends, HTTPException, Header
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from passlib.context import CryptContext
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, ForeignKey, Boolean, Text
+from sqlalchemy.orm import sessionmaker, declarative_base, Session, relationship
+from typing import Generator, Optional, List, Dict
+from datetime import datetime, timedelta
+import uuid
+import os
+from dotenv import load_dotenv
+import logging
+
+# Import models and schemas (CORRECTED ORDER)
+from models import Base, UserDB, SessionDB, ContactFormDB, BlogPostDB, BlogTagDB, PostTagDB, NewsletterSubscriberDB, ChatRoomDB, ChatMessageDB, EmailLogDB
+from schemas import User, UserResponse, ContactFormData, BlogPostResponse, BlogPostsListResponse, BlogTagResponse, BlogPostDetailResponse, BlogSearchResult, BlogSearchResponse, BlogTagsListResponse, TaggedPostsResponse, NewsletterSubscriptionData, ChatMessageData, EmailFormData
+
+# FastAPI app
+app = FastAPI(default_response_class=ORJSONResponse)
+
+# Add CORS middleware
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],  # In production, specify your frontend domain
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Load environment variables from a .env file if present
+load_dotenv()
+DB_USER = os.getenv("DB_USER", "postgres")
+DB_PASSWORD = os.getenv("DB_PASSWORD", "postgres")
+DB_HOST = os.getenv("DB_HOST", "localhost")
+DB_PORT = os.getenv("DB_PORT", "5432")
+DB_NAME = os.getenv("DB_NAME", "app_db")
+
+# uncomment this for postgresql
+# DATABASE_URL = (
+#     f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# )
+
+DATABASE_URL = "sqlite:///./blog.db"
+engine = create_engine(
+    DATABASE_URL,
+    pool_pre_ping=True,
+    pool_size=5,
+    max_overflow=10,
+    future=True,
+)
+
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def get_db() -> Generator[Session, None, None]:
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# ---- Authentication helpers ---- 
+TOKEN_HEADER = "Authorization"
+
+def extract_token(auth_header: Optional[str]) -> str:
+    if not auth_header:
+        raise HTTPException(status_code=401, detail="Missing Authorization header")
+    parts = auth_header.split()
+    if len(parts) == 2 and parts[0].lower() == "bearer":
+        return parts[1]
+    if len(parts) == 1:
+        return parts[0]
+    raise HTTPException(status_code=401, detail="Invalid Authorization header")
+
+def get_current_session(authorization: Optional[str] = Header(None, alias=TOKEN_HEADER),
+                        db: Session = Depends(get_db)) -> "SessionDB":
+    token = extract_token(authorization)
+    session = db.query(SessionDB).filter(SessionDB.id == token).first()
+    if not session or session.expiry < datetime.utcnow():
+        raise HTTPException(status_code=401, detail="Invalid or expired session")
+    return session
+
+def get_current_user(session: "SessionDB" = Depends(get_current_session),
+                     db: Session = Depends(get_db)) -> "UserDB":
+    user = db.query(UserDB).filter(UserDB.id == session.user_id).first()
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+    return user
+
+# Auto-create tables on startup
+Base.metadata.create_all(bind=engine)
+
+@app.on_event("startup")
+def seed_database():
+    \"\"\"Create test data if database is empty\"\"\"
+    db = SessionLocal()
+    try:
+        # Only seed if no blog posts exist
+        if db.query(BlogPostDB).count() == 0:
+            print("🌱 Seeding database with test data...")
+            
+            # Create test user
+            test_user = UserDB(
+                username="admin", 
+                password=pwd_context.hash("admin123"), 
+                email="admin@devinsights.com",
+                is_active=True
+            )
+            db.add(test_user)
+            db.commit()
+            db.refresh(test_user)
+            
+            # Create test tags first
+            tags_data = [
+                "React", "Design", "Tutorial", "JavaScript", "Web Development", "TypeScript"
+            ]
+            
+            tag_objects = {}
+            for tag_name in tags_data:
+                tag = BlogTagDB(name=tag_name)
+                db.add(tag)
+                tag_objects[tag_name] = tag
+            
+            db.commit()
+            
+            # Create test blog posts (using data from blog_list.py)
+            posts_data = [
+                {
+                    "title": "Getting Started with React Hooks",
+                    "content": "Learn how to use React Hooks to build more efficient and cleaner functional components in your applications. React Hooks revolutionized how we write React components by allowing us to use state and other React features in functional components. This comprehensive guide will take you through everything you need to know about React Hooks, from the basics to advanced patterns.",
+                    "excerpt": "Learn how to use React Hooks to build more efficient and cleaner functional components in your applications.",
+                    "slug": "getting-started-with-react-hooks",
+                    "tags": ["React", "JavaScript", "Tutorial"],
+                },
+                {
+                    "title": "CSS Grid vs Flexbox: When to Use What",
+                    "content": "A comprehensive guide to understanding the differences between CSS Grid and Flexbox and when to use each layout method. Both CSS Grid and Flexbox are powerful layout systems, but they serve different purposes. Understanding when to use each one will make you a more effective web developer.",
+                    "excerpt": "A comprehensive guide to understanding the differences between CSS Grid and Flexbox and when to use each layout method.",
+                    "slug": "css-grid-vs-flexbox-when-to-use-what",
+                    "tags": ["Design", "Web Development"],
+                },
+                {
+                    "title": "Building REST APIs with Node.js",
+                    "content": "Step-by-step tutorial on creating robust and scalable REST APIs using Node.js, Express, and MongoDB. REST APIs are the backbone of modern web applications. In this tutorial, we'll build a complete API from scratch, covering authentication, validation, error handling, and best practices.",
+                    "excerpt": "Step-by-step tutorial on creating robust and scalable REST APIs using Node.js, Express, and MongoDB.",
+                    "slug": "building-rest-apis-with-nodejs",
+                    "tags": ["JavaScript", "Tutorial", "Web Development"],
+                },
+                {
+                    "title": "Modern JavaScript ES6+ Features",
+                    "content": "Explore the latest JavaScript features including arrow functions, destructuring, async/await, and more. ES6+ brought many powerful features to JavaScript that make code more readable, maintainable, and enjoyable to write. Let's explore these features with practical examples.",
+                    "excerpt": "Explore the latest JavaScript features including arrow functions, destructuring, async/await, and more.",
+                    "slug": "modern-javascript-es6-plus-features", 
+                    "tags": ["JavaScript", "Tutorial"],
+                },
+                {
+                    "title": "Responsive Web Design Best Practices",
+                    "content": "Learn the fundamental principles of responsive web design and how to create websites that work on all devices. Responsive design is no longer optional - it's essential. This guide covers everything from flexible grids to media queries and modern CSS techniques.",
+                    "excerpt": "Learn the fundamental principles of responsive web design and how to create websites that work on all devices.",
+                    "slug": "responsive-web-design-best-practices",
+                    "tags": ["Design", "Web Development"],
+                },
+                {
+                    "title": "Introduction to TypeScript",
+                    "content": "Discover how TypeScript can improve your JavaScript development with static typing and better tooling. TypeScript adds type safety to JavaScript, making your code more reliable and easier to maintain. Learn the basics and see how it can transform your development workflow.",
+                    "excerpt": "Discover how TypeScript can improve your JavaScript development with static typing and better tooling.",
+                    "slug": "introduction-to-typescript",
+                    "tags": ["TypeScript", "JavaScript", "Tutorial"],
+                },
+            ]
+            
+            # Create blog posts
+            for i, post_data in enumerate(posts_data):
+                post = BlogPostDB(
+                    title=post_data["title"],
+                    slug=post_data["slug"],
+                    content=post_data["content"],
+                    excerpt=post_data["excerpt"],
+                    published=True,
+                    author_id=test_user.id,
+                    created_at=datetime.utcnow() - timedelta(days=i*2)  # Spread posts over time
+                )
+                db.add(post)
+                db.commit()
+                db.refresh(post)
+                
+                # Add tags to posts
+                for tag_name in post_data["tags"]:
+                    if tag_name in tag_objects:
+                        post_tag = PostTagDB(post_id=post.id, tag_id=tag_objects[tag_name].id)
+                        db.add(post_tag)
+                
+            db.commit()
+            print(f"✅ Seeded database with {len(posts_data)} blog posts and {len(tags_data)} tags")
+        else:
+            print("ℹ️  Database already contains data, skipping seed")
+            
+    except Exception as e:
+        print(f"❌ Error seeding database: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+"""
+
 # Legacy mapping for backward compatibility
 legacy_mapping = {
     "r": """
@@ -214,73 +429,124 @@ def revoke_session_endpoint(session_id: str, current_user: UserDB = Depends(get_
 }
 
 
-class BackendCompiler:
-    def __init__(self):
-        # Load all endpoint modules
-        load_all_endpoints()
+class EndpointMapping(Mapping):
+    """
+    token -> legacy snippet or endpoint module.
+
+    Keys come from the legacy snippets and the endpoint manifest; a module
+    is imported the first time its token is looked up, and module endpoints
+    override legacy snippets with the same token.
+    """
 
-        # Combine legacy mapping with dynamic endpoints
-        self.mapping = legacy_mapping.copy()
+    def __init__(self, legacy):
+        self._legacy = dict(legacy)
+        modules = list_available_tokens()
+        self._modules = set(modules)
+        self._tokens = list(self._legacy) + [
+            t for t in modules if t not in self._legacy
+        ]
 
-        # Add dynamically loaded endpoints - NEW ENDPOINTS OVERRIDE LEGACY
-        available_tokens = list_available_tokens()
-        for token in available_tokens:
+    def __getitem__(self, token):
+        if token in self._modules:
             module = get_endpoint_module(token)
-            if module and hasattr(module, "render_endpoint"):
-                # Let new endpoints override legacy
-                self.mapping[token] = module
+            if module is not None and hasattr(module, "render_endpoint"):
+                return module
+        return self._legacy[token]
+
+    def __contains__(self, token):
+        return token in self._modules or token in self._legacy
+
+    def __iter__(self):
+        return iter(self._tokens)
+
+    def __len__(self):
+        return len(self._tokens)
+
+    def is_module(self, token):
+        return token in self._modules
+
+
+class BackendCompiler:
+    # Header emitted before the endpoints when include_imports is set
+    core_imports = CORE_IMPORTS
+
+    def __init__(self):
+        # Endpoint modules are imported lazily through the manifest
+        self.mapping = EndpointMapping(legacy_mapping)
 
         # Build index of (method, path) -> token for reverse lookup
         self._route_index = self._build_route_index()
 
+    def _get_required_model_modules(self, tokens):
+        """Model modules the endpoints of ``tokens`` need, from the manifest."""
+        # Always include auth models
+        model_modules = {"auth_models"}
+        for token in tokens:
+            entry = get_manifest_entry(token)
+            if entry is not None and entry["required_models"]:
+                model_modules.update(entry["required_models"])
+            elif token in {"bp", "bg", "bt", "bs"}:
+                model_modules.add("blog_models")
+        return model_modules
+
+    def _generate_model_imports(self, model_modules):
+        """Generate import code for required models - DEPRECATED (now using centralized models.py)"""
+        return ""  # No longer needed since we have centralized models.py
+
     def _build_route_index(self):
+        """(METHOD, path) -> token for every route each mapping entry emits."""
         index = {}
-        for token, snippet_or_module in self.mapping.items():
-            if isinstance(snippet_or_module, str):
-                # Legacy string-based mapping
-                decorator_start = snippet_or_module.find("@app.")
-                if decorator_start == -1:
-                    continue
-                line_end = snippet_or_module.find("\n", decorator_start)
-                line = snippet_or_module[
-                    decorator_start : line_end if line_end != -1 else None
-                ]
-                try:
-                    after_app = line.split("@app.", 1)[1]
-                    method = after_app.split("(", 1)[0].strip()
-                    first_quote = line.find('"', line.find("(") + 1)
-                    second_quote = line.find('"', first_quote + 1)
-                    path = line[first_quote + 1 : second_quote]
-                    index[(method.upper(), path)] = token
-                except Exception:
-                    continue
-            # For module-based endpoints, we'd need to extract path info from the module
-            # This could be added later if needed
+        for token in self.mapping:
+            if self.mapping.is_module(token):
+                # Routes of the module's default render, from the manifest
+                for method, path in get_manifest_entry(token)["routes"]:
+                    index[(method, path)] = token
+                continue
+            for match in ROUTE_DECORATOR_RE.finditer(legacy_mapping[token]):
+                index[(match.group(1).upper(), match.group(2))] = token
         return index
 
     def tokens_to_code(self, tokens, include_imports=True):
-        tokens = list(tokens)
-        parts = []
-
-        if include_imports:
-            parts.append(CORE_IMPORTS)
-
+        """
+        Backend module for ``tokens``.
+
+        Fragments go through ``assemble_module``: imports (including those
+        inside endpoint functions) are hoisted and de-duplicated, and a
+        model or route repeated across tokens is emitted once.
+        """
+        fragments = []
         for token in tokens:
             if token in self.mapping:
-                item = self.mapping[token]
-                if isinstance(item, str):
-                    # Legacy string-based endpoint
-                    parts.append(item + "\n\n")
-                else:
-                    # Module-based endpoint
-                    try:
-                        code = item.render_endpoint()
-                        parts.append(code + "\n\n")
-                    except Exception as e:
-                        print(f"Error rendering endpoint {token}: {e}")
-                        continue
-
-        return "".join(parts)
+                try:
+                    fragments.append(self.render_fragment(token))
+                except Exception as e:
+                    print(f"Error rendering endpoint {token}: {e}")
+                    continue
+
+        return assemble_module(
+            self.core_imports if include_imports else "", fragments
+        )
+
+    def render_fragment(self, token, args=None, props=None):
+        """
+        Code of one endpoint.
+
+        Module renders are memoized in ``ENDPOINT_FRAGMENT_CACHE`` by token,
+        normalized args/props and ``MAPPING_VERSION``, so any token list is
+        a join of cached fragments. Legacy snippets are returned as-is.
+        """
+        item = self.mapping[token]
+        if isinstance(item, str):
+            return item
+        key = _key_fragment(token, args, props)
+        code = ENDPOINT_FRAGMENT_CACHE.get(key)
+        if code is None:
+            if args is None and props is None:
+                code = item.render_endpoint()
+            else:
+                code = item.render_endpoint(args, props)
+            ENDPOINT_FRAGMENT_CACHE.set(key, code)
+        return code
 
     def file_tokens_to_code(self, input_path="input.txt", output_path="output.py"):
         with open(input_path, "r") as f:
@@ -290,15 +556,28 @@ class BackendCompiler:
             f.write(code)
         return code
 
+    def code_to_token_offsets(self, code):
+        """
+        ``(token, offset)`` for each known route in ``code``, in source order.
+
+        One scan over the code: every route decorator is matched by
+        ``ROUTE_DECORATOR_RE`` and looked up in the route index, so the cost
+        is linear in the code size however many routes are known. A token
+        is reported once, at its first route.
+        """
+        found = []
+        seen = set()
+        for match in ROUTE_DECORATOR_RE.finditer(code):
+            token = self._route_index.get(
+                (match.group(1).upper(), match.group(2))
+            )
+            if token is not None and token not in seen:
+                seen.add(token)
+                found.append((token, match.start()))
+        return found
+
     def code_to_tokens(self, code):
-        found = []  # list of (pos, token)
-        for (method, path), token in self._route_index.items():
-            signature = f'@app.{method.lower()}("{path}")'
-            pos = code.find(signature)
-            if pos != -1:
-                found.append((pos, token))
-        found.sort(key=lambda x: x[0])
-        return [t for _, t in found]
+        return [token for token, _ in self.code_to_token_offsets(code)]
 
     def file_code_to_tokens(self, code_path="output.py"):
         with open(code_path, "r") as f:
@@ -308,20 +587,17 @@ class BackendCompiler:
     def list_available_endpoints(self):
         """List all available endpoint tokens and their descriptions."""
         endpoints = {}
-        for token, item in self.mapping.items():
-            if isinstance(item, str):
-                # Extract description from legacy endpoints
-                lines = item.split("\n")
-                for line in lines:
-                    if "def " in line and "_endpoint" in line:
-                        endpoints[token] = f"Legacy endpoint: {line.strip()}"
-                        break
-            else:
-                # Module-based endpoint
-                if hasattr(item, "__doc__") and item.__doc__:
-                    endpoints[token] = item.__doc__.strip()
-                else:
-                    endpoints[token] = f"Endpoint module: {token}"
+        for token in self.mapping:
+            if self.mapping.is_module(token):
+                # Module docstring, from the manifest
+                doc = get_manifest_entry(token)["doc"]
+                endpoints[token] = doc or f"Endpoint module: {token}"
+                continue
+            # Extract description from legacy endpoints
+            for line in legacy_mapping[token].split("\n"):
+                if "def " in line and "_endpoint" in line:
+                    endpoints[token] = f"Legacy endpoint: {line.strip()}"
+                    break
         return endpoints
 
 
@@ -330,19 +606,36 @@ MAX_FILE_BYTES = int(os.getenv("TRANSLATE_MAX_FILE_BYTES", "1048576"))
 BATCH_MAX_WORKERS = int(os.getenv("TRANSLATE_BATCH_MAX_WORKERS", "4"))
 CACHE_TTL_SECONDS = int(os.getenv("TRANSLATE_CACHE_TTL_SECONDS", "1800"))
 CACHE_MAXSIZE = int(os.getenv("TRANSLATE_CACHE_MAXSIZE", "256"))
+CACHE_MAX_BYTES = int(os.getenv("TRANSLATE_CACHE_MAX_BYTES", str(64 << 20)))
+# Optional persistent cache tier shared by workers (disabled when unset)
+DISK_CACHE_DIR = os.getenv("TRANSLATE_DISK_CACHE_DIR", "")
+DISK_CACHE_MAX_BYTES = int(
+    os.getenv("TRANSLATE_DISK_CACHE_MAX_BYTES", str(256 << 20))
+)
 
 
 def _compute_mapping_version() -> str:
-    # Stable hash to invalidate caches when mapping changes
+    # Stable hash to invalidate caches when mapping changes: legacy snippets
+    # plus the source of every endpoint module
     items = []
     for k in sorted(legacy_mapping.keys()):
         items.append(k)
         items.append(legacy_mapping[k])
+    endpoints_dir = Path(__file__).parent / "endpoints"
+    for file_path in sorted(endpoints_dir.glob("*.py")):
+        items.append(file_path.name)
+        items.append(file_path.read_text(encoding="utf-8"))
     digest = sha256("\u0001".join(items).encode("utf-8")).hexdigest()
     return digest
 
 
 MAPPING_VERSION = _compute_mapping_version()
+# Generated code also depends on this module (core imports, templates) and
+# on how fragments are assembled
+COMPILER_VERSION = sha256(
+    Path(__file__).read_bytes()
+    + (Path(__file__).parent / "code_assembly.py").read_bytes()
+).hexdigest()
 
 
 def _read_text_with_limits(path: str, max_bytes: int = MAX_FILE_BYTES) -> str:
@@ -406,43 +699,53 @@ def _validate_tokens(tokens: List[str], mapping_keys: List[str]):
         )
 
 
-class SimpleTTLCache:
-    def __init__(self, maxsize: int = CACHE_MAXSIZE, ttl: int = CACHE_TTL_SECONDS):
-        self.maxsize = maxsize
-        self.ttl = ttl
-        self._store = {}
-        self._lock = threading.Lock()
-
-    def get(self, key):
-        with self._lock:
-            item = self._store.get(key)
-            if not item:
-                return None
-            value, expiry = item
-            if expiry < time():
-                self._store.pop(key, None)
-                return None
-            return value
-
-    def set(self, key, value):
-        with self._lock:
-            if len(self._store) >= self.maxsize:
-                # naive eviction: pop an arbitrary item
-                self._store.pop(next(iter(self._store)))
-            self._store[key] = (value, time() + self.ttl)
+DISK_CACHE = open_disk_cache(DISK_CACHE_DIR, DISK_CACHE_MAX_BYTES)
+TOKENS_TO_CODE_CACHE = TranslationCache(
+    "tokens_to_code",
+    CACHE_MAXSIZE,
+    CACHE_TTL_SECONDS,
+    CACHE_MAX_BYTES,
+    disk=DISK_CACHE,
+)
+CODE_TO_TOKENS_CACHE = TranslationCache(
+    "code_to_tokens",
+    CACHE_MAXSIZE,
+    CACHE_TTL_SECONDS,
+    CACHE_MAX_BYTES,
+    disk=DISK_CACHE,
+)
+# Rendered module endpoints; memory only, they are cheap to store and
+# rebuilt once per process
+ENDPOINT_FRAGMENT_CACHE = TranslationCache(
+    "endpoint_fragments",
+    int(os.getenv("TRANSLATE_FRAGMENT_CACHE_MAXSIZE", "1024")),
+    ttl=0,
+    max_bytes=int(os.getenv("TRANSLATE_FRAGMENT_CACHE_MAX_BYTES", str(16 << 20))),
+)
 
 
-TOKENS_TO_CODE_CACHE = SimpleTTLCache()
-CODE_TO_TOKENS_CACHE = SimpleTTLCache()
+def _key_fragment(token: str, args=None, props=None) -> str:
+    raw = json.dumps(
+        [token, args.strip() if isinstance(args, str) else args, props],
+        sort_keys=True,
+        default=str,
+    )
+    return sha256(f"{raw}|v={MAPPING_VERSION}".encode("utf-8")).hexdigest()
 
 
 def _key_tokens(tokens: List[str], include_imports: bool) -> str:
-    raw = "|".join(tokens) + f"|imports={include_imports}|v={MAPPING_VERSION}"
+    raw = (
+        "|".join(tokens)
+        + f"|imports={include_imports}|v={MAPPING_VERSION}|c={COMPILER_VERSION}"
+    )
     return sha256(raw.encode("utf-8")).hexdigest()
 
 
 def _key_code(code: str) -> str:
-    raw = sha256(code.encode("utf-8")).hexdigest() + f"|v={MAPPING_VERSION}"
+    raw = (
+        sha256(code.encode("utf-8")).hexdigest()
+        + f"|v={MAPPING_VERSION}|c={COMPILER_VERSION}"
+    )
     return sha256(raw.encode("utf-8")).hexdigest()
 
 
@@ -609,10 +912,30 @@ def decompile_api(body: DecompileRequest):
         )
 
 
-@app.post("/api/translate/to-s-batch")
-def compile_batch_api(body: BatchCompileRequest):
-    results = [None] * len(body.jobs)
+def _iter_batch_results(process, jobs):
+    """Run ``process(idx, job)`` on the batch pool, yielding results as they finish."""
+    with cf.ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS) as executor:
+        futures = [executor.submit(process, i, job) for i, job in enumerate(jobs)]
+        for fut in cf.as_completed(futures):
+            yield fut.result()
+
+
+def _batch_response(process, jobs, stream: Optional[str]):
+    """One JSON body with every result, or a stream of them (see batch_stream)."""
+    if stream:
+        return batch_stream_response(_iter_batch_results(process, jobs), stream)
+    results = [None] * len(jobs)
     ok = 0
+    for idx, success, payload in _iter_batch_results(process, jobs):
+        results[idx] = payload
+        if success:
+            ok += 1
+    return {"results": results, "totals": {"ok": ok, "failed": len(results) - ok}}
+
+
+@app.post("/api/translate/to-s-batch")
+def compile_batch_api(body: BatchCompileRequest, stream: Optional[str] = None):
+    stream = check_stream_mode(stream)
 
     def process(idx: int, job: BatchCompileJob):
         job_id = job.id or str(idx)
@@ -656,21 +979,12 @@ def compile_batch_api(body: BatchCompileRequest):
                 },
             )
 
-    with cf.ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS) as executor:
-        futures = [executor.submit(process, i, job) for i, job in enumerate(body.jobs)]
-        for fut in futures:
-            idx, success, payload = fut.result()
-            results[idx] = payload
-            if success:
-                ok += 1
-
-    return {"results": results, "totals": {"ok": ok, "failed": len(results) - ok}}
+    return _batch_response(process, body.jobs, stream)
 
 
 @app.post("/api/translate/from-s-batch")
-def decompile_batch_api(body: BatchDecompileRequest):
-    results = [None] * len(body.jobs)
-    ok = 0
+def decompile_batch_api(body: BatchDecompileRequest, stream: Optional[str] = None):
+    stream = check_stream_mode(stream)
 
     def process(idx: int, job: BatchDecompileJob):
         job_id = job.id or str(idx)
@@ -717,38 +1031,24 @@ def decompile_batch_api(body: BatchDecompileRequest):
                 },
             )
 
-    with cf.ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS) as executor:
-        futures = [executor.submit(process, i, job) for i, job in enumerate(body.jobs)]
-        for fut in futures:
-            idx, success, payload = fut.result()
-            results[idx] = payload
-            if success:
-                ok += 1
-
-    return {"results": results, "totals": {"ok": ok, "failed": len(results) - ok}}
+    return _batch_response(process, body.jobs, stream)
 
 
 @app.get("/api/cache/stats")
 def cache_stats():
     return {
         "mapping_version": MAPPING_VERSION,
-        "tokens_to_code": {
-            "size": len(TOKENS_TO_CODE_CACHE._store),
-            "maxsize": TOKENS_TO_CODE_CACHE.maxsize,
-            "ttl_seconds": TOKENS_TO_CODE_CACHE.ttl,
-        },
-        "code_to_tokens": {
-            "size": len(CODE_TO_TOKENS_CACHE._store),
-            "maxsize": CODE_TO_TOKENS_CACHE.maxsize,
-            "ttl_seconds": CODE_TO_TOKENS_CACHE.ttl,
-        },
+        "tokens_to_code": TOKENS_TO_CODE_CACHE.stats(),
+        "code_to_tokens": CODE_TO_TOKENS_CACHE.stats(),
+        "endpoint_fragments": ENDPOINT_FRAGMENT_CACHE.stats(),
     }
 
 
 @app.post("/api/cache/flush")
 def cache_flush():
-    TOKENS_TO_CODE_CACHE._store.clear()
-    CODE_TO_TOKENS_CACHE._store.clear()
+    TOKENS_TO_CODE_CACHE.clear()
+    CODE_TO_TOKENS_CACHE.clear()
+    ENDPOINT_FRAGMENT_CACHE.clear()
     return {"flushed": True}
 
 
@@ -799,8 +1099,8 @@ async def health():
         "version": "1.0.0",
         "available_tokens": list(legacy_mapping.keys()),
         "cache_status": {
-            "tokens_to_code": len(TOKENS_TO_CODE_CACHE._store),
-            "code_to_tokens": len(CODE_TO_TOKENS_CACHE._store),
+            "tokens_to_code": len(TOKENS_TO_CODE_CACHE),
+            "code_to_tokens": len(CODE_TO_TOKENS_CACHE),
         },
     }
 
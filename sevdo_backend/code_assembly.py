@@ -0,0 +1,235 @@
+"""
+Assembly of generated backend modules from endpoint fragments.
+
+Endpoint snippets used to be concatenated verbatim, so repeated tokens
+emitted the same models and routes twice and every endpoint function
+carried its own imports. ``assemble_module`` parses the fragments and
+emits one ordered module:
+
+    header (core imports and app setup, verbatim)
+    imports: module-level fragment imports plus imports hoisted out of
+             endpoint functions, de-duplicated
+    models and other module-level statements, in their original order
+    endpoint functions, in their original order
+
+Identical statements are emitted once. When a fragment does not parse,
+or moving functions after the module-level statements could change what
+they refer to, the fragments are concatenated verbatim as before.
+"""
+
+import ast
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+
+class _LocalImport(NamedTuple):
+    key: str  # ast.dump of the import, equal for equal imports
+    text: str
+    names: Tuple[str, ...]  # names it binds
+    lines: Tuple[int, int]  # first/last line within the statement text
+
+
+class _Statement(NamedTuple):
+    kind: str  # "import", "class", "function" or "other"
+    key: str
+    text: str  # source with decorators and leading comments
+    names: Tuple[str, ...]  # module-level names it binds
+    loads: FrozenSet[str]  # names it reads
+    local_imports: Tuple[_LocalImport, ...]
+
+
+def _import_names(node: ast.AST) -> Tuple[str, ...]:
+    if isinstance(node, ast.Import):
+        return tuple(a.asname or a.name.split(".")[0] for a in node.names)
+    return tuple(a.asname or a.name for a in node.names)
+
+
+def _assigned_names(node: ast.AST) -> Tuple[str, ...]:
+    names = []
+    for sub in ast.walk(node):
+        if isinstance(sub, ast.Name) and isinstance(sub.ctx, ast.Store):
+            names.append(sub.id)
+    return tuple(names)
+
+
+def _local_imports(
+    func: ast.AST, first_line: int
+) -> Tuple[_LocalImport, ...]:
+    """Imports at the top level of ``func``'s body that can move to module level."""
+    body = func.body
+    found = []
+    for i, stmt in enumerate(body):
+        if not isinstance(stmt, (ast.Import, ast.ImportFrom)):
+            continue
+        if isinstance(stmt, ast.ImportFrom) and (
+            stmt.level or any(a.name == "*" for a in stmt.names)
+        ):
+            continue
+        # Must own its lines (no `import re; x = 1`)
+        if i > 0 and body[i - 1].end_lineno >= stmt.lineno:
+            continue
+        if i + 1 < len(body) and body[i + 1].lineno <= stmt.end_lineno:
+            continue
+        found.append(
+            _LocalImport(
+                ast.dump(stmt),
+                ast.unparse(stmt),
+                _import_names(stmt),
+                (stmt.lineno - first_line, stmt.end_lineno - first_line),
+            )
+        )
+    if len(found) == len(body):
+        # Keep one statement so the body stays valid
+        found.pop()
+    if not found:
+        return ()
+    # Names the function rebinds itself must stay local
+    local = set(a.arg for a in ast.walk(func.args) if isinstance(a, ast.arg))
+    imported = {imp.lines for imp in found}
+    for stmt in body:
+        if (stmt.lineno - first_line, stmt.end_lineno - first_line) in imported:
+            continue
+        local.update(_assigned_names(stmt))
+        for sub in ast.walk(stmt):
+            if isinstance(sub, (ast.Import, ast.ImportFrom)):
+                local.update(_import_names(sub))
+    return tuple(imp for imp in found if not local.intersection(imp.names))
+
+
+@lru_cache(maxsize=512)
+def _analyze(text: str) -> Optional[Tuple[_Statement, ...]]:
+    """Split fragment source into statements; None if it cannot be reordered."""
+    try:
+        tree = ast.parse(text)
+    except SyntaxError:
+        return None
+    lines = text.splitlines()
+    statements = []
+    consumed = 0
+    for node in tree.body:
+        start = min(
+            [node.lineno]
+            + [d.lineno for d in getattr(node, "decorator_list", [])]
+        )
+        if start <= consumed:
+            # Shares a line with the previous statement
+            return None
+        chunk = lines[consumed : node.end_lineno]
+        while chunk and not chunk[0].strip():
+            chunk.pop(0)
+        first_line = node.end_lineno - len(chunk) + 1
+        consumed = node.end_lineno
+        loads = frozenset(
+            sub.id
+            for sub in ast.walk(node)
+            if isinstance(sub, ast.Name) and isinstance(sub.ctx, ast.Load)
+        )
+        local_imports: Tuple[_LocalImport, ...] = ()
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            kind, names = "import", _import_names(node)
+        elif isinstance(node, ast.ClassDef):
+            kind, names = "class", (node.name,)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            kind, names = "function", (node.name,)
+            local_imports = _local_imports(node, first_line)
+        else:
+            kind, names = "other", _assigned_names(node)
+        statements.append(
+            _Statement(
+                kind,
+                ast.dump(node),
+                "\n".join(chunk),
+                names,
+                loads,
+                local_imports,
+            )
+        )
+    if any(line.strip() for line in lines[consumed:]):
+        # Trailing comments have no statement to travel with
+        return None
+    return tuple(statements)
+
+
+def _concatenate(header: str, fragments: List[str]) -> str:
+    return header + "".join(fragment + "\n\n" for fragment in fragments)
+
+
+def _without_lines(text: str, ranges: List[Tuple[int, int]]) -> str:
+    drop = set()
+    for first, last in ranges:
+        drop.update(range(first, last + 1))
+    return "\n".join(
+        line for i, line in enumerate(text.splitlines()) if i not in drop
+    )
+
+
+def assemble_module(header: str, fragments: List[str]) -> str:
+    """
+    One module from ``header`` (emitted verbatim) and endpoint fragments.
+
+    See the module docstring for the layout. Falls back to verbatim
+    concatenation when the fragments cannot be reordered safely.
+    """
+    header_statements = _analyze(header) if header.strip() else ()
+    analyzed = [_analyze(fragment) for fragment in fragments]
+    if header_statements is None or any(a is None for a in analyzed):
+        return _concatenate(header, fragments)
+
+    seen = {s.key for s in header_statements}
+    imports: List[str] = []
+    body: List[_Statement] = []
+    functions: List[_Statement] = []
+    for statements in analyzed:
+        for statement in statements:
+            if statement.key in seen:
+                continue
+            seen.add(statement.key)
+            if statement.kind == "import":
+                imports.append(statement.text)
+            elif statement.kind == "function":
+                functions.append(statement)
+            else:
+                body.append(statement)
+
+    # Functions move after every other statement: bail out if a module-level
+    # statement refers to one of them
+    function_names = {name for f in functions for name in f.names}
+    if any(function_names & statement.loads for statement in body):
+        return _concatenate(header, fragments)
+
+    # Module-level name -> key of the import that binds it (None: not an import)
+    bound: Dict[str, Optional[str]] = {}
+    for statement in list(header_statements) + body + functions:
+        for name in statement.names:
+            bound.setdefault(
+                name, statement.key if statement.kind == "import" else None
+            )
+    for statements in analyzed:
+        for statement in statements:
+            if statement.kind == "import":
+                for name in statement.names:
+                    bound.setdefault(name, statement.key)
+
+    function_texts = []
+    for function in functions:
+        hoisted = []
+        for imp in function.local_imports:
+            if all(bound.get(name, imp.key) == imp.key for name in imp.names):
+                for name in imp.names:
+                    bound[name] = imp.key
+                if imp.key not in seen:
+                    seen.add(imp.key)
+                    imports.append(imp.text)
+                hoisted.append(imp.lines)
+        function_texts.append(
+            _without_lines(function.text, hoisted) if hoisted else function.text
+        )
+
+    sections = []
+    if header.strip():
+        sections.append(header.rstrip())
+    if imports:
+        sections.append("\n".join(imports))
+    sections.extend(statement.text for statement in body)
+    sections.extend(function_texts)
+    return "\n\n\n".join(sections) + "\n"
@@ -2,52 +2,195 @@
 """
 Backend endpoints for SEVDO system.
 Each endpoint file defines a render_endpoint function that returns FastAPI endpoint code.
+
+Endpoints are discovered from ``manifest.json`` (token -> module, routes,
+required model modules) and a module is only imported the first time its
+token is rendered. The manifest records a hash of each endpoint file; files
+that were added or changed since it was generated are re-described (which
+imports them) in memory only, so running the compiler never rewrites the
+tracked file. Regenerate it with ``build_manifest()``.
 """
 
+import importlib
+import json
 import os
+import re
+import tempfile
+import threading
+from hashlib import sha256
 from pathlib import Path
 
-# Global registry of all available endpoints
+MANIFEST_PATH = Path(__file__).parent / "manifest.json"
+MANIFEST_FORMAT_VERSION = 1
+
+# `@app.<method>("<path>"` closed by `)` or followed by more decorator args
+ROUTE_DECORATOR_RE = re.compile(r'@app\.([a-z]+)\(\s*"([^"\n]*)"\s*[,)]')
+
+# Global registry of imported endpoint modules, filled on first use
 ENDPOINT_REGISTRY = {}
 
+_MANIFEST = None
+_TOKEN_MODULES = {}
+_LOCK = threading.RLock()
+
 
 def register_endpoint(token, module_name):
     """Register an endpoint with its token."""
     ENDPOINT_REGISTRY[token] = module_name
 
 
-def load_all_endpoints():
-    """Load all endpoint modules and register them."""
-    endpoints_dir = Path(__file__).parent
+def _endpoint_files():
+    return sorted(
+        p for p in Path(__file__).parent.glob("*.py") if not p.name.startswith("__")
+    )
+
+
+def _import_endpoint(module_name):
+    return importlib.import_module(f"{__name__}.{module_name}")
+
+
+def _describe_endpoint(module_name, digest):
+    """Manifest entry for one endpoint file; imports it. None if not an endpoint."""
+    try:
+        module = _import_endpoint(module_name)
+    except Exception as e:
+        print(f"Error loading endpoint {module_name}: {e}")
+        return None
+    if not (hasattr(module, "ENDPOINT_TOKEN") and hasattr(module, "render_endpoint")):
+        print(f"Warning: {module_name} missing ENDPOINT_TOKEN or render_endpoint")
+        return None
+
+    try:
+        code = module.render_endpoint()
+    except Exception as e:
+        # Still an endpoint, just without routes for reverse lookup
+        print(f"Error indexing endpoint {module.ENDPOINT_TOKEN}: {e}")
+        code = ""
+    required = getattr(module, "REQUIRED_MODELS", [])
+    if isinstance(required, str):
+        required = [required]
+    return {
+        "token": module.ENDPOINT_TOKEN,
+        "module": module_name,
+        "sha256": digest,
+        "routes": [
+            [m.group(1).upper(), m.group(2)] for m in ROUTE_DECORATOR_RE.finditer(code)
+        ],
+        "required_models": list(required),
+        "doc": (module.__doc__ or "").strip(),
+    }
+
+
+def _write_manifest(manifest, path):
+    """Replace ``path`` atomically, so readers never see a partial file."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".manifest-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(json.dumps(manifest, indent=2) + "\n")
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
 
-    for file_path in endpoints_dir.glob("*.py"):
-        if file_path.name.startswith("__"):
-            continue
 
-        module_name = file_path.stem
+def _set_manifest(manifest):
+    global _MANIFEST
+    _MANIFEST = manifest
+    _TOKEN_MODULES.clear()
+    for module_name, entry in sorted(manifest["endpoints"].items()):
+        # Files that are not endpoints are recorded by hash only
+        if "token" in entry:
+            _TOKEN_MODULES[entry["token"]] = module_name
+
+
+def _scan_endpoints(stored):
+    """
+    Manifest for the endpoint files on disk, reusing ``stored`` entries.
+
+    Returns the manifest and whether it differs from ``stored``.
+    """
+    endpoints = {}
+    changed = False
+    for file_path in _endpoint_files():
+        digest = sha256(file_path.read_bytes()).hexdigest()
+        entry = stored.get(file_path.stem)
+        if entry is None or entry.get("sha256") != digest:
+            entry = _describe_endpoint(file_path.stem, digest) or {"sha256": digest}
+            changed = True
+        endpoints[file_path.stem] = entry
+    changed = changed or set(stored) != set(endpoints)
+    return {"format_version": MANIFEST_FORMAT_VERSION, "endpoints": endpoints}, changed
+
+
+def build_manifest(path=MANIFEST_PATH):
+    """Import every endpoint file, write a fresh manifest and return it."""
+    with _LOCK:
+        manifest, _ = _scan_endpoints({})
+        _write_manifest(manifest, Path(path))
+        _set_manifest(manifest)
+        return manifest
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """
+    The endpoint manifest, loaded once per process.
+
+    Only endpoint files whose hash differs from the stored one are imported
+    to refresh their entries; an unchanged tree imports nothing. Refreshed
+    entries are kept in memory; ``path`` is never written here.
+    """
+    with _LOCK:
+        if _MANIFEST is not None:
+            return _MANIFEST
         try:
-            # Import the module
-            module = __import__(f"endpoints.{module_name}", fromlist=[module_name])
+            manifest = json.loads(Path(path).read_text(encoding="utf-8"))
+            if manifest.get("format_version") != MANIFEST_FORMAT_VERSION:
+                raise ValueError("manifest format changed")
+            stored = manifest["endpoints"]
+        except (OSError, ValueError, KeyError, TypeError):
+            stored = {}
+        manifest, changed = _scan_endpoints(stored)
+        if changed:
+            print(
+                f"Endpoint manifest {path} is out of date; "
+                "run build_manifest() to regenerate it"
+            )
+        _set_manifest(manifest)
+        return _MANIFEST
+
 
-            # Check if module has required attributes
-            if hasattr(module, "ENDPOINT_TOKEN") and hasattr(module, "render_endpoint"):
-                token = module.ENDPOINT_TOKEN
-                ENDPOINT_REGISTRY[token] = module
-                print(f"Registered endpoint: {token} -> {module_name}")
-            else:
-                print(
-                    f"Warning: {module_name} missing ENDPOINT_TOKEN or render_endpoint"
-                )
+def get_manifest_entry(token):
+    """Manifest entry of ``token``, or None; never imports the module."""
+    load_manifest()
+    module_name = _TOKEN_MODULES.get(token)
+    return _MANIFEST["endpoints"][module_name] if module_name else None
 
-        except Exception as e:
-            print(f"Error loading endpoint {module_name}: {e}")
+
+def load_all_endpoints():
+    """Import every endpoint module listed in the manifest and register it."""
+    for token in list_available_tokens():
+        get_endpoint_module(token)
 
 
 def get_endpoint_module(token):
-    """Get endpoint module by token."""
-    return ENDPOINT_REGISTRY.get(token)
+    """Get endpoint module by token, importing it on first use."""
+    module = ENDPOINT_REGISTRY.get(token)
+    if module is not None:
+        return module
+    entry = get_manifest_entry(token)
+    if entry is None:
+        return None
+    with _LOCK:
+        if token not in ENDPOINT_REGISTRY:
+            try:
+                ENDPOINT_REGISTRY[token] = _import_endpoint(entry["module"])
+            except Exception as e:
+                print(f"Error loading endpoint {entry['module']}: {e}")
+                return None
+        return ENDPOINT_REGISTRY[token]
 
 
 def list_available_tokens():
     """List all available endpoint tokens."""
-    return list(ENDPOINT_REGISTRY.keys())
+    load_manifest()
+    return list(_TOKEN_MODULES)
@@ -0,0 +1 @@
+"""Helpers shared by the SEVDO backend and frontend translation services."""
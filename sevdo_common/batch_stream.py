@@ -0,0 +1,121 @@
+"""
+Streaming responses for the translation batch endpoints.
+
+Batch endpoints normally answer with one JSON body once every job is done.
+With ``?stream=ndjson`` (or ``?stream=sse``) each job's result is sent as
+soon as it finishes, followed by one summary record, so clients can start
+writing files while later jobs are still compiling.
+
+Records, one per NDJSON line or SSE ``data:`` field:
+
+    {"type": "result", "index": 3, "ok": true, "result": {...}}
+    {"type": "summary", "totals": {"ok": 9, "failed": 1}}
+
+``result`` is exactly the entry the non-streaming response would put at
+``results[index]``.
+"""
+
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+
+def check_stream_mode(mode: Optional[str]) -> Optional[str]:
+    """Validate the ``stream`` query parameter; None means no streaming."""
+    if mode is None or mode == "":
+        return None
+    if mode not in STREAM_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "code": "invalid_stream_mode",
+                "stream": mode,
+                "allowed": sorted(STREAM_MEDIA_TYPES),
+            },
+        )
+    return mode
+
+
+def batch_records(
+    results: Iterable[Tuple[int, bool, Dict]],
+) -> Iterator[Dict]:
+    """Result records for ``(index, success, payload)`` tuples, then a summary."""
+    ok = failed = 0
+    for idx, success, payload in results:
+        if success:
+            ok += 1
+        else:
+            failed += 1
+        yield {"type": "result", "index": idx, "ok": success, "result": payload}
+    yield {"type": "summary", "totals": {"ok": ok, "failed": failed}}
+
+
+async def abatch_records(
+    results: AsyncIterable[Tuple[int, bool, Dict]],
+) -> AsyncIterator[Dict]:
+    """``batch_records`` for an async iterable of results."""
+    ok = failed = 0
+    async for idx, success, payload in results:
+        if success:
+            ok += 1
+        else:
+            failed += 1
+        yield {"type": "result", "index": idx, "ok": success, "result": payload}
+    yield {"type": "summary", "totals": {"ok": ok, "failed": failed}}
+
+
+def _encode_record(record: Dict, mode: str) -> bytes:
+    data = orjson.dumps(record)
+    if mode == "sse":
+        return b"event: " + record["type"].encode() + b"\ndata: " + data + b"\n\n"
+    return data + b"\n"
+
+
+def _encode(records: Iterator[Dict], mode: str) -> Iterator[bytes]:
+    for record in records:
+        yield _encode_record(record, mode)
+
+
+async def _aencode(records: AsyncIterator[Dict], mode: str) -> AsyncIterator[bytes]:
+    async for record in records:
+        yield _encode_record(record, mode)
+
+
+def batch_stream_response(
+    results: Union[
+        Iterable[Tuple[int, bool, Dict]], AsyncIterable[Tuple[int, bool, Dict]]
+    ],
+    mode: str,
+) -> StreamingResponse:
+    """
+    Stream batch results as they complete.
+
+    ``results`` may be a blocking generator, which Starlette iterates in a
+    worker thread so the event loop stays free while jobs run, or an async
+    iterable such as one fed by a bounded compile queue.
+    """
+    if hasattr(results, "__aiter__"):
+        body = _aencode(abatch_records(results), mode)
+    else:
+        body = _encode(batch_records(results), mode)
+    return StreamingResponse(
+        body,
+        media_type=STREAM_MEDIA_TYPES[mode],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
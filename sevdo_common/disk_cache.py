@@ -0,0 +1,228 @@
+"""
+Content-addressed on-disk second tier for the translation caches.
+
+Entries live in one SQLite database (WAL mode) so every uvicorn worker on a
+host shares them and they survive restarts and deploys. Values are stored
+as JSON under ``(namespace, key)``; callers already derive keys from sha256
+hashes of the input plus the mapping/prefab versions, so an entry can never
+be served for a different compiler state. When the total stored size
+exceeds ``max_bytes`` the least recently used entries are deleted. Each
+process keeps a running total of the stored bytes, adjusted on every write
+and delete; since other workers write to the same database, it is re-read
+from the table every ``_RESYNC_WRITES`` writes and before evicting.
+
+Disk errors are logged and counted but never raised: a broken cache
+directory only costs the speed-up.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import defaultdict
+from time import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DB_FILENAME = "translation_cache.sqlite3"
+# Access times are refreshed at most this often, sparing a write per hit
+_TOUCH_INTERVAL_SECONDS = 60.0
+# Evict down to this fraction of the budget so eviction is not run per write
+_EVICT_TARGET = 0.9
+# Writes between re-reads of the stored size written by other processes
+_RESYNC_WRITES = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+"""
+
+
+class DiskCache:
+    """
+    SQLite-backed key/value store shared by several cache namespaces.
+
+    Args:
+        directory: Directory holding the database (created if missing)
+        max_bytes: Budget for the summed size of all stored values
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 << 20):
+        self.directory = directory
+        self.path = os.path.join(directory, DB_FILENAME)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "misses": 0, "writes": 0, "errors": 0}
+        )
+        self.evictions = 0
+        # Running SUM(size) of all entries; None until read from the table
+        self._total_bytes: Optional[int] = None
+        self._writes_since_sync = 0
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(
+            self.path, timeout=5.0, check_same_thread=False
+        )
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+            self._sync_total_locked()
+
+    def _sync_total_locked(self) -> int:
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+        self._writes_since_sync = 0
+        return self._total_bytes
+
+    def _count(self, namespace: str, field: str) -> None:
+        with self._lock:
+            self._counters[namespace][field] += 1
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        now = time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, accessed FROM entries "
+                    "WHERE namespace = ? AND key = ?",
+                    (namespace, key),
+                ).fetchone()
+                if row is not None and now - row[1] > _TOUCH_INTERVAL_SECONDS:
+                    self._conn.execute(
+                        "UPDATE entries SET accessed = ? "
+                        "WHERE namespace = ? AND key = ?",
+                        (now, namespace, key),
+                    )
+                    self._conn.commit()
+            if row is None:
+                self._count(namespace, "misses")
+                return None
+            value = json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            self._count(namespace, "errors")
+            logger.warning("Disk cache read failed (%s): %s", namespace, e)
+            return None
+        self._count(namespace, "hits")
+        return value
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        try:
+            payload = json.dumps(value)
+            size = len(payload)
+            if self.max_bytes and size > self.max_bytes:
+                return
+            with self._lock:
+                try:
+                    old = self._conn.execute(
+                        "SELECT size FROM entries WHERE namespace = ? AND key = ?",
+                        (namespace, key),
+                    ).fetchone()
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO entries "
+                        "(namespace, key, value, size, accessed) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (namespace, key, payload, size, time()),
+                    )
+                    if self._total_bytes is not None:
+                        self._total_bytes += size - (old[0] if old else 0)
+                    self._writes_since_sync += 1
+                    self._evict_locked()
+                    self._conn.commit()
+                except sqlite3.Error:
+                    # The running total may no longer match the table
+                    self._total_bytes = None
+                    raise
+                self._counters[namespace]["writes"] += 1
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            self._count(namespace, "errors")
+            logger.warning("Disk cache write failed (%s): %s", namespace, e)
+
+    def _evict_locked(self) -> None:
+        """Delete least recently used entries once over the byte budget."""
+        if not self.max_bytes:
+            return
+        if (
+            self._total_bytes is not None
+            and self._total_bytes <= self.max_bytes
+            and self._writes_since_sync < _RESYNC_WRITES
+        ):
+            return
+        # Over budget or due for a re-read: other workers may have written
+        # or evicted since
+        total = self._sync_total_locked()
+        if total <= self.max_bytes:
+            return
+        excess = total - int(self.max_bytes * _EVICT_TARGET)
+        victims = []
+        freed = 0
+        for rowid, size in self._conn.execute(
+            "SELECT rowid, size FROM entries ORDER BY accessed"
+        ):
+            victims.append((rowid,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM entries WHERE rowid = ?", victims)
+        self._total_bytes = total - freed
+        self.evictions += len(victims)
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        try:
+            with self._lock:
+                self._total_bytes = None
+                if namespace is None:
+                    self._conn.execute("DELETE FROM entries")
+                else:
+                    self._conn.execute(
+                        "DELETE FROM entries WHERE namespace = ?", (namespace,)
+                    )
+                self._conn.commit()
+                self._sync_total_locked()
+        except sqlite3.Error as e:
+            logger.warning("Disk cache clear failed: %s", e)
+
+    def stats(self, namespace: str) -> Dict[str, Any]:
+        """Per-process counters plus the namespace's on-disk size."""
+        entries, size = 0, 0
+        try:
+            with self._lock:
+                entries, size = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries "
+                    "WHERE namespace = ?",
+                    (namespace,),
+                ).fetchone()
+                counters = dict(self._counters[namespace])
+        except sqlite3.Error as e:
+            logger.warning("Disk cache stats failed: %s", e)
+            counters = dict(self._counters[namespace])
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            **counters,
+        }
+
+
+def open_disk_cache(directory: str, max_bytes: int) -> Optional[DiskCache]:
+    """Open the shared disk cache, or None if ``directory`` is empty/unusable."""
+    if not directory:
+        return None
+    try:
+        return DiskCache(directory, max_bytes)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("Disk cache disabled, cannot open %s: %s", directory, e)
+        return None
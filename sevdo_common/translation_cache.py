@@ -0,0 +1,151 @@
+"""
+Thread-safe LRU cache with TTL and a byte budget for translation results.
+
+Both translation services keep one cache per direction (for example
+``tokens_to_code`` or ``dsl_to_jsx``). Each cache is a namespace with its
+own hit/miss/eviction counters so the stats endpoints can report them.
+An optional ``DiskCache`` adds a persistent second tier shared between
+worker processes.
+"""
+
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .disk_cache import DiskCache
+
+
+def entry_size(value: Any) -> int:
+    """Approximate size of a cached value: string length, summed for lists."""
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(entry_size(v) for v in value)
+    if isinstance(value, dict):
+        return sum(entry_size(k) + entry_size(v) for k, v in value.items())
+    return len(str(value))
+
+
+class TranslationCache:
+    """
+    LRU cache bounded by entry count and total entry size.
+
+    Args:
+        namespace: Name reported in stats
+        maxsize: Max entries (0 disables caching)
+        ttl: Entry lifetime in seconds (0 = no expiry)
+        max_bytes: Max summed ``sizeof`` of keys and values (0 = unbounded)
+        sizeof: Size function for keys and values
+        disk: Optional persistent second tier; memory misses are looked up
+              there and promoted, and every ``set`` writes through
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        maxsize: int = 256,
+        ttl: int = 1800,
+        max_bytes: int = 0,
+        sizeof: Callable[[Any], int] = entry_size,
+        disk: Optional[DiskCache] = None,
+    ):
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self.disk = disk
+        # key -> (value, expires_at or None, size)
+        self._store: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._get_memory(key)
+            if value is not None:
+                self.hits += 1
+                return value
+        value = self.disk.get(self.namespace, key) if self.disk else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+        self._set_memory(key, value)
+        return value
+
+    def _get_memory(self, key: Hashable) -> Optional[Any]:
+        item = self._store.get(key)
+        if item is None:
+            return None
+        value, expires_at, _ = item
+        if expires_at is not None and expires_at < monotonic():
+            self._remove(key)
+            self.expirations += 1
+            return None
+        self._store.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.disk is not None:
+            self.disk.set(self.namespace, key, value)
+        self._set_memory(key, value)
+
+    def _set_memory(self, key: Hashable, value: Any) -> None:
+        size = self._sizeof(key) + self._sizeof(value)
+        if self.maxsize <= 0 or (self.max_bytes and size > self.max_bytes):
+            return
+        expires_at = monotonic() + self.ttl if self.ttl > 0 else None
+        with self._lock:
+            if key in self._store:
+                self._remove(key)
+            self._store[key] = (value, expires_at, size)
+            self._bytes += size
+            while len(self._store) > self.maxsize or (
+                self.max_bytes and self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._store))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._store.pop(key)
+        self._bytes -= size
+
+    def clear(self, include_disk: bool = True) -> None:
+        with self._lock:
+            self._store.clear()
+            self._bytes = 0
+        if include_disk and self.disk is not None:
+            self.disk.clear(self.namespace)
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def stats(self) -> Dict[str, Any]:
+        disk = self.disk.stats(self.namespace) if self.disk else None
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "namespace": self.namespace,
+                "size": len(self._store),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "disk_hits": self.disk_hits,
+                "disk": disk,
+            }
@@ -5,10 +5,23 @@ from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional, Tuple, Dict
 from pathlib import Path
+import asyncio
 import os
 import concurrent.futures as cf
 import tempfile
 import re
+import json
+import bisect
+import difflib
+import threading
+import time
+from hashlib import sha256
+
+import orjson
+
+from sevdo_common.batch_stream import batch_stream_response, check_stream_mode
+from sevdo_common.disk_cache import open_disk_cache
+from sevdo_common.translation_cache import TranslationCache
 
 
 class ParseError(Exception):
@@ -28,35 +41,130 @@ def get_prefab_module(token):
     return COMPONENT_REGISTRY.get(token)
 
 
-def load_prefabs():
-    prefabs_dir = Path(__file__).parent / "prefabs"
-    if not prefabs_dir.exists():
-        return
+PREFABS_DIR = Path(__file__).parent / "prefabs"
+# Prefab file name -> (mtime_ns, size, source sha256, tokens registered)
+_PREFAB_FILES: Dict[str, Tuple[int, int, str, List[str]]] = {}
+# Prefab file name -> version hash of its source and PREFAB_METADATA
+PREFAB_VERSIONS: Dict[str, str] = {}
+PREFAB_SET_VERSION = ""
+_PREFAB_LOCK = threading.RLock()
+_PREFAB_LAST_CHECK = 0.0
+
 
+def _prefab_version(source_hash: str, module) -> str:
+    metadata = getattr(module, "PREFAB_METADATA", None)
+    raw = source_hash + "|" + json.dumps(metadata, sort_keys=True, default=str)
+    return sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _load_prefab_file(file: Path, source_hash: str) -> List[str]:
+    """Import one prefab file and register its component; returns tokens."""
     import importlib.util
     import sys
 
-    for file in prefabs_dir.glob("*.py"):
-        if file.name == "__init__.py":
-            continue
-        try:
-            # Import using file path instead of module name
-            spec = importlib.util.spec_from_file_location(file.stem, file)
-            if spec and spec.loader:
-                module = importlib.util.module_from_spec(spec)
-                sys.modules[file.stem] = module
-                spec.loader.exec_module(module)
-
-                if hasattr(module, "COMPONENT_TOKEN") and hasattr(
-                    module, "render_prefab"
-                ):
-                    register_component(module.COMPONENT_TOKEN, module.render_prefab)
-                    # Also register the module itself for metadata access
-                    COMPONENT_REGISTRY[module.COMPONENT_TOKEN + "_module"] = module
-        except Exception as e:
-            print(f"Error loading component {file.name}: {e}")
-            # Skip files that can't be imported
-            pass
+    try:
+        # Import using file path instead of module name
+        spec = importlib.util.spec_from_file_location(file.stem, file)
+        if not (spec and spec.loader):
+            return []
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[file.stem] = module
+        spec.loader.exec_module(module)
+    except Exception as e:
+        print(f"Error loading component {file.name}: {e}")
+        # Skip files that can't be imported
+        PREFAB_VERSIONS[file.name] = source_hash
+        return []
+
+    PREFAB_VERSIONS[file.name] = _prefab_version(source_hash, module)
+    if hasattr(module, "COMPONENT_TOKEN") and hasattr(module, "render_prefab"):
+        register_component(module.COMPONENT_TOKEN, module.render_prefab)
+        # Also register the module itself for metadata access
+        COMPONENT_REGISTRY[module.COMPONENT_TOKEN + "_module"] = module
+        return [module.COMPONENT_TOKEN]
+    return []
+
+
+def _unregister_prefab(name: str) -> None:
+    _, _, _, tokens = _PREFAB_FILES.pop(name)
+    PREFAB_VERSIONS.pop(name, None)
+    for token in tokens:
+        COMPONENT_REGISTRY.pop(token, None)
+        COMPONENT_REGISTRY.pop(token + "_module", None)
+
+
+def _compute_prefab_set_version() -> str:
+    # Stable hash of every prefab version, so caches miss when prefabs change
+    digest = sha256()
+    for name in sorted(PREFAB_VERSIONS):
+        digest.update(f"{name}={PREFAB_VERSIONS[name]}\x01".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_prefabs() -> Dict[str, List[str]]:
+    """
+    Load new or changed prefabs and drop deleted ones.
+
+    Files whose mtime and size are unchanged are skipped without reading;
+    touched files are re-imported only if their source hash changed. Safe
+    to call repeatedly for hot reload.
+
+    Returns:
+        {"loaded": [...], "removed": [...]} prefab file names
+    """
+    global PREFAB_SET_VERSION
+    prefabs_dir = PREFABS_DIR
+    loaded: List[str] = []
+    removed: List[str] = []
+    with _PREFAB_LOCK:
+        files = (
+            {f.name: f for f in sorted(prefabs_dir.glob("*.py"))}
+            if prefabs_dir.exists()
+            else {}
+        )
+        files.pop("__init__.py", None)
+        for name in [n for n in _PREFAB_FILES if n not in files]:
+            _unregister_prefab(name)
+            removed.append(name)
+
+        for name, file in files.items():
+            previous = _PREFAB_FILES.get(name)
+            try:
+                stat = file.stat()
+                if previous and previous[:2] == (stat.st_mtime_ns, stat.st_size):
+                    continue
+                source_hash = sha256(file.read_bytes()).hexdigest()
+            except OSError as e:
+                print(f"Error reading component {name}: {e}")
+                continue
+            if previous and previous[2] == source_hash:
+                _PREFAB_FILES[name] = (
+                    stat.st_mtime_ns, stat.st_size, source_hash, previous[3]
+                )
+                continue
+            if previous:
+                _unregister_prefab(name)
+            tokens = _load_prefab_file(file, source_hash)
+            _PREFAB_FILES[name] = (
+                stat.st_mtime_ns, stat.st_size, source_hash, tokens
+            )
+            loaded.append(name)
+
+        if loaded or removed or not PREFAB_SET_VERSION:
+            PREFAB_SET_VERSION = _compute_prefab_set_version()
+    return {"loaded": loaded, "removed": removed}
+
+
+def _maybe_reload_prefabs() -> None:
+    """Hot-reload changed prefabs at most every FE_PREFAB_RELOAD_INTERVAL s."""
+    global _PREFAB_LAST_CHECK
+    if PREFAB_RELOAD_INTERVAL <= 0:
+        return
+    now = time.monotonic()
+    if now - _PREFAB_LAST_CHECK < PREFAB_RELOAD_INTERVAL:
+        return
+    _PREFAB_LAST_CHECK = now
+    load_prefabs()
 
 
 def get_prefab_metadata(token):
@@ -109,140 +217,270 @@ def _parse_invocation(stmt: str) -> Tuple[str, Optional[str], Dict[str, str]]:
 
 
 # ----------------- Nested DSL parser -----------------
+#
+# Single pass over one comment-stripped string: the recursive descent walks
+# offsets instead of slicing out and rescanning each nested level. Brackets
+# are matched with ``str.find`` when nothing nests inside them; otherwise
+# the enclosing region is scanned once and the pairs of every bracket in it
+# are recorded, so deeply nested containers stay linear. Every node records
+# its span in the original source.
 
 CONTAINER_TOKENS = {"c", "f"}
 
+_WS_RE = re.compile(r"\s*")
+# Leading whitespace, the token identifier, trailing whitespace
+_HEAD_RE = re.compile(r"\s*([^\W\d_]*)\s*")
+_PAREN_RE = re.compile(r"[()]")
+_BRACE_RE = re.compile(r"[{}]")
+# Comma-separated prop entries; commas inside quotes do not split
+_PROP_PART_RE = re.compile(r"""(?:"[^"]*"|'[^']*'|[^,])+""")
 
-class _Cursor:
-    def __init__(self, text: str):
-        self.text = text
-        self.pos = 0
-
-    def eof(self) -> bool:
-        return self.pos >= len(self.text)
-
-    def peek(self) -> str:
-        return self.text[self.pos] if not self.eof() else ""
-
-    def advance(self, n: int = 1):
-        self.pos += n
-
-    def skip_ws(self):
-        while not self.eof() and self.text[self.pos].isspace():
-            self.pos += 1
 
-
-def _parse_identifier(cur: _Cursor) -> str:
-    start = cur.pos
-    while not cur.eof() and cur.text[cur.pos].isalpha():
-        cur.pos += 1
-    return cur.text[start : cur.pos]
-
-
-def _extract_balanced(cur: _Cursor, open_ch: str, close_ch: str) -> str:
-    if cur.peek() != open_ch:
-        return ""
-    cur.advance(1)
-    depth = 1
-    start = cur.pos
-    while not cur.eof():
-        ch = cur.peek()
-        if ch == open_ch:
-            depth += 1
-        elif ch == close_ch:
-            depth -= 1
-            if depth == 0:
-                content = cur.text[start : cur.pos]
-                cur.advance(1)
-                return content
-        cur.advance(1)
-    raise ParseError("Unbalanced parentheses or braces in DSL")
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
 
 
 def _parse_props_from_text(text: str) -> Dict[str, str]:
+    """``k=v, flag, label="a, b"`` -> props; quoted values are unquoted."""
     props: Dict[str, str] = {}
-    raw = text.strip()
-    if not raw:
-        return props
-    for part in raw.split(","):
-        if not part.strip():
+    for part in _PROP_PART_RE.findall(text):
+        part = part.strip()
+        if not part:
             continue
         if "=" in part:
             k, v = part.split("=", 1)
-            props[k.strip()] = v.strip()
+            props[k.strip()] = _unquote(v.strip())
         else:
-            props[part.strip()] = "true"
+            props[part] = "true"
     return props
 
 
 class Node:
+    """One parsed statement; ``__slots__`` keeps large trees compact."""
+
+    __slots__ = ("token", "args", "props", "children", "span")
+
     def __init__(
         self,
         token: str,
         args: Optional[str] = None,
         props: Optional[Dict[str, str]] = None,
         children: Optional[List["Node"]] = None,
+        span: Optional[Tuple[int, int]] = None,
     ):
         self.token = token
         self.args = args
         self.props = props or {}
         self.children = children or []
+        # (start, end) offsets of the statement in the parsed source
+        self.span = span
+
+    def __repr__(self) -> str:
+        return (
+            f"Node({self.token!r}, args={self.args!r}, props={self.props!r}, "
+            f"children={len(self.children)}, span={self.span!r})"
+        )
 
 
-def _parse_statement(cur: _Cursor) -> Optional[Node]:
-    cur.skip_ws()
-    if cur.eof():
-        return None
-    token = _parse_identifier(cur)
+def _scan_pairs(text: str, pairs: Dict[int, int], pos: int, end: int) -> int:
+    """Match the bracket at ``pos`` by depth, recording every pair inside it."""
+    pattern = _PAREN_RE if text[pos] == "(" else _BRACE_RE
+    stack: List[int] = []
+    for m in pattern.finditer(text, pos, end):
+        if m.group() in "({":
+            stack.append(m.start())
+        else:
+            pairs[stack.pop()] = m.start()
+            if not stack:
+                return m.start()
+    return -1
+
+
+def _closing(text: str, pairs: Dict[int, int], pos: int, end: int) -> int:
+    """Offset of the bracket closing ``text[pos]`` before ``end``."""
+    close = pairs.get(pos)
+    if close is None:
+        open_ch = text[pos]
+        close = text.find(")" if open_ch == "(" else "}", pos + 1, end)
+        if close != -1 and text.find(open_ch, pos + 1, close) != -1:
+            close = _scan_pairs(text, pairs, pos, end)
+    if close == -1 or close >= end:
+        raise ParseError("Unbalanced parentheses or braces in DSL")
+    return close
+
+
+def _parse_node(
+    text: str, pairs: Dict[int, int], pos: int, end: int
+) -> Tuple[Optional[Node], int]:
+    """Parse one statement at ``pos`` (bounded by ``end``); returns (node, next pos)."""
+    head = _HEAD_RE.match(text, pos, end)
+    token = head.group(1)
     if not token:
-        return None
+        return None, head.start(1)
+    start = head.start(1)
+    stop = head.end(1)
+    pos = head.end()
 
-    cur.skip_ws()
     args_text: Optional[str] = None
     children: List[Node] = []
-    if cur.peek() == "(":
-        inner = _extract_balanced(cur, "(", ")")
-        # For container tokens, parse children from inner
+    if pos < end and text[pos] == "(":
+        close = _closing(text, pairs, pos, end)
         if token in CONTAINER_TOKENS:
-            child_cur = _Cursor(inner)
-            kids: List[Node] = []
+            child_pos = pos + 1
             while True:
-                child = _parse_statement(child_cur)
+                child, child_pos = _parse_node(text, pairs, child_pos, close)
                 if child is None:
                     break
-                kids.append(child)
-            children = kids
+                children.append(child)
         else:
-            args_text = inner.strip()
+            args_text = text[pos + 1 : close].strip()
+        stop = close + 1
+        pos = _WS_RE.match(text, stop, end).end()
 
-    cur.skip_ws()
     props: Dict[str, str] = {}
-    if cur.peek() == "{":
-        props_text = _extract_balanced(cur, "{", "}")
-        props = _parse_props_from_text(props_text)
+    if pos < end and text[pos] == "{":
+        close = _closing(text, pairs, pos, end)
+        props = _parse_props_from_text(text[pos + 1 : close])
+        stop = pos = close + 1
 
-    return Node(token=token, args=args_text, props=props, children=children)
+    node = Node(token, args_text, props, children, span=(start, stop))
+    return node, pos
 
 
-def parse_dsl(source: str) -> List[Node]:
-    def _strip_comments(src: str) -> str:
-        lines = src.splitlines()
-        out = []
-        for ln in lines:
-            s = ln.lstrip()
-            if s.startswith("//") or s.startswith("#"):
-                continue
-            out.append(ln)
-        return "\n".join(out)
+def _strip_comments(
+    src: str, offsets: Optional[List[Tuple[int, int]]] = None
+) -> str:
+    """
+    Drop ``//`` and ``#`` comment lines.
+
+    If ``offsets`` is given it is filled with (offset in the result, offset
+    in ``src``) for the start of every kept line.
+    """
+    out = []
+    stripped_pos = 0
+    source_pos = 0
+    for ln in src.splitlines(keepends=True):
+        line = ln.splitlines()[0]
+        s = line.lstrip()
+        if not (s.startswith("//") or s.startswith("#")):
+            if offsets is not None:
+                offsets.append((stripped_pos, source_pos))
+            out.append(line)
+            stripped_pos += len(line) + 1
+        source_pos += len(ln)
+    return "\n".join(out)
+
+
+def _remap_spans(nodes: List[Node], offsets: List[Tuple[int, int]]) -> None:
+    """Translate spans from comment-stripped offsets to source offsets."""
+    starts = [stripped for stripped, _ in offsets]
+    shifts = [source - stripped for stripped, source in offsets]
+    bisect_right = bisect.bisect_right
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+        start, end = node.span
+        node.span = (
+            start + shifts[bisect_right(starts, start) - 1],
+            end + shifts[bisect_right(starts, end) - 1],
+        )
+        stack.extend(node.children)
+
+
+def parse_statements(source: str) -> List[Tuple[str, Node]]:
+    """
+    Parse top-level statements, each with its (stripped) source text.
 
-    cur = _Cursor(_strip_comments(source))
-    nodes: List[Node] = []
+    Node spans are offsets into ``source`` itself, comments included.
+    """
+    offsets: List[Tuple[int, int]] = []
+    text = _strip_comments(source, offsets)
+    pairs: Dict[int, int] = {}
+    statements: List[Tuple[str, Node]] = []
+    pos, end = 0, len(text)
     while True:
-        node = _parse_statement(cur)
+        node, pos = _parse_node(text, pairs, pos, end)
         if node is None:
             break
-        nodes.append(node)
-    return nodes
+        statements.append((text[node.span[0] : node.span[1]], node))
+    # Offsets only ever shift forward, so an unshifted last line means
+    # nothing was dropped before it
+    if offsets and offsets[-1][0] != offsets[-1][1]:
+        _remap_spans([node for _, node in statements], offsets)
+    return statements
+
+
+def parse_dsl(source: str) -> List[Node]:
+    return [node for _, node in parse_statements(source)]
+
+
+# ----------------- AST serialization -----------------
+#
+# Parsed statements flatten to one pre-order list of primitives, six fields
+# per node, so trees go through JSON/orjson (disk cache, worker processes)
+# without recursion or per-node objects on the wire.
+
+AST_FORMAT_VERSION = 1
+_AST_FIELDS = 6
+
+
+def ast_to_compact(statements: List[Tuple[str, Node]]) -> list:
+    """
+    ``[version, statement texts, flat nodes]`` for parsed statements.
+
+    Each node contributes token, args, props, child count, span start and
+    span end, in pre-order.
+    """
+    flat: list = []
+    stack = [node for _, node in reversed(statements)]
+    while stack:
+        node = stack.pop()
+        start, end = node.span or (None, None)
+        flat.extend(
+            # Copied: the result is cached, the nodes stay the caller's
+            (node.token, node.args, dict(node.props), len(node.children), start, end)
+        )
+        stack.extend(reversed(node.children))
+    return [AST_FORMAT_VERSION, [text for text, _ in statements], flat]
+
+
+def compact_to_ast(data: list) -> List[Tuple[str, Node]]:
+    """Rebuild parsed statements from ``ast_to_compact`` output."""
+    version, texts, flat = data
+    if version != AST_FORMAT_VERSION:
+        raise ValueError(f"Unsupported AST format version: {version}")
+    roots: List[Node] = []
+    # [children list being filled, nodes still expected in it]
+    pending = [[roots, len(texts)]]
+    for i in range(0, len(flat), _AST_FIELDS):
+        token, args, props, n_children, start, end = flat[i : i + _AST_FIELDS]
+        node = Node(
+            token,
+            args,
+            dict(props),
+            None,
+            None if start is None else (start, end),
+        )
+        parent = pending[-1]
+        parent[0].append(node)
+        parent[1] -= 1
+        if not parent[1]:
+            pending.pop()
+        if n_children:
+            pending.append([node.children, n_children])
+    return list(zip(texts, roots))
+
+
+def dump_ast(statements: List[Tuple[str, Node]]) -> bytes:
+    """Serialize parsed statements to compact bytes."""
+    return orjson.dumps(ast_to_compact(statements))
+
+
+def load_ast(data: bytes) -> List[Tuple[str, Node]]:
+    """Inverse of ``dump_ast``."""
+    return compact_to_ast(orjson.loads(data))
 
 
 def _join_class_names(existing: Optional[str], extra: Optional[str]) -> str:
@@ -365,6 +603,119 @@ def _jsx_for_token(
     raise ParseError(f"Unknown token: {token}")
 
 
+# ----------------- Subtree memoization -----------------
+
+# Rendered subtrees keyed by their structural hash; identical headers,
+# footers and containers across pages and edits are rendered once
+SUBTREE_CACHE = TranslationCache(
+    "jsx_subtrees",
+    int(os.getenv("FE_SUBTREE_CACHE_MAXSIZE", "4096")),
+    ttl=0,
+    max_bytes=int(os.getenv("FE_SUBTREE_CACHE_MAX_BYTES", str(32 << 20))),
+)
+
+# (jsx, imports, state_variables, effects, hooks) of one rendered subtree
+_Subtree = Tuple[str, Tuple[str, ...], Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]
+
+
+def _subtree_keys(
+    node: Node, api_props: Dict[str, Dict], level: int
+) -> Dict[int, Tuple[str, Dict[str, str]]]:
+    """
+    Structural hash and effective props of ``node`` and its descendants.
+
+    The hash covers token, args, effective props (DSL props overridden by
+    ``api_props``), indent level, the children's hashes and the prefab-set
+    version. Returns {id(node): (hash, effective props)}.
+    """
+    keys: Dict[int, Tuple[str, Dict[str, str]]] = {}
+
+    def visit(current: Node, depth: int) -> str:
+        effective_props = current.props.copy()
+        if current.token in api_props:
+            # API props override DSL props
+            effective_props.update(api_props[current.token])
+            print(
+                f"🔧 Merged API props for {current.token}: "
+                f"{api_props[current.token]}"
+            )
+        child_keys = [visit(child, depth + 1) for child in current.children]
+        raw = repr(
+            (
+                current.token,
+                current.args,
+                sorted(effective_props.items()),
+                depth,
+                child_keys,
+                PREFAB_SET_VERSION,
+            )
+        )
+        key = sha256(raw.encode("utf-8")).hexdigest()
+        keys[id(current)] = (key, effective_props)
+        return key
+
+    visit(node, level)
+    return keys
+
+
+def _render_subtree(
+    node: Node, keys: Dict[int, Tuple[str, Dict[str, str]]], level: int
+) -> _Subtree:
+    """Render ``node`` to JSX with its prefab metadata, reusing cached subtrees."""
+    key, effective_props = keys[id(node)]
+    cached = SUBTREE_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    indent = "      "  # 6 spaces for proper JSX indentation
+    imports: List[str] = []
+    state_vars: List[str] = []
+    effects: List[str] = []
+    hooks: List[str] = []
+    metadata = get_prefab_metadata(node.token)
+    if metadata:
+        imports.extend(metadata.get("imports", []))
+        state_vars.extend(metadata.get("state_variables", []))
+        effects.extend(metadata.get("effects", []))
+        hooks.extend(metadata.get("hooks", []))
+
+    children_jsx = []
+    for child in node.children:
+        jsx, c_imports, c_state, c_effects, c_hooks = _render_subtree(
+            child, keys, level + 1
+        )
+        children_jsx.append(jsx)
+        imports.extend(c_imports)
+        state_vars.extend(c_state)
+        effects.extend(c_effects)
+        hooks.extend(c_hooks)
+
+    if node.token == "c":
+        base = "flex flex-col gap-4"
+        extra = effective_props.get("class")
+        class_name = _join_class_names(base, extra)
+        if not node.children:
+            jsx = f'{indent}<div className="{class_name}"></div>'
+        else:
+            jsx = (
+                f'{indent}<div className="{class_name}">\n'
+                + "\n".join(children_jsx)
+                + f"\n{indent}</div>"
+            )
+    elif node.token == "f":
+        if not node.children:
+            jsx = f"{indent}<form></form>"
+        else:
+            jsx = f"{indent}<form>\n" + "\n".join(children_jsx) + f"\n{indent}</form>"
+    else:
+        # Standard JSX fragment rendering
+        jsx = indent + _jsx_for_token(node.token, node.args, effective_props)
+
+    result = (jsx, tuple(imports), tuple(state_vars), tuple(effects), tuple(hooks))
+    SUBTREE_CACHE.set(key, result)
+    return result
+
+
 def clean_jsx_comments(jsx_content: str) -> str:
     """Remove HTML comments from JSX content"""
     # Remove HTML comments: <!-- anything -->
@@ -383,83 +734,35 @@ def dsl_to_jsx(
     if api_props is None:
         api_props = {}
 
-    nodes = parse_dsl(dsl_source)
+    rendered = [
+        _render_statement(node, api_props)
+        for _, node in parse_statements_cached(dsl_source)
+    ]
+    return _assemble_component(rendered, include_imports, component_name)
+
 
-    # Collect metadata from all prefabs used
+def _render_statement(node: Node, api_props: Dict[str, Dict]) -> _Subtree:
+    """Render one top-level statement (memoized per subtree)."""
+    return _render_subtree(node, _subtree_keys(node, api_props, 1), 1)
+
+
+def _assemble_component(
+    rendered: List[_Subtree], include_imports: bool, component_name: str
+) -> str:
+    """Join rendered top-level statements into the final component source."""
+    # Collect the metadata contributions of the prefabs used, in document
+    # order
     all_imports = set()
     all_state_vars = []
     all_effects = []
     all_hooks = []
+    for _, imports, state_vars, effects, hooks in rendered:
+        all_imports.update(imports)
+        all_state_vars.extend(state_vars)
+        all_effects.extend(effects)
+        all_hooks.extend(hooks)
 
-    def collect_prefab_metadata(node: Node):
-        """Recursively collect metadata from prefabs"""
-        # Check if this token has metadata
-        metadata = get_prefab_metadata(node.token)
-        if metadata:
-            # Add imports
-            if "imports" in metadata:
-                all_imports.update(metadata["imports"])
-
-            # Add state variables
-            if "state_variables" in metadata:
-                all_state_vars.extend(metadata["state_variables"])
-
-            # Add effects
-            if "effects" in metadata:
-                all_effects.extend(metadata["effects"])
-
-            # Add hooks
-            if "hooks" in metadata:
-                all_hooks.extend(metadata["hooks"])
-
-        # Recursively check children
-        for child in node.children:
-            collect_prefab_metadata(child)
-
-    # Collect metadata from all nodes
-    for node in nodes:
-        collect_prefab_metadata(node)
-
-    # Standard JSX rendering for all components (no more complex detection)
-    def render(node: Node, level: int = 1) -> str:
-        indent = "      "  # 6 spaces for proper JSX indentation
-
-        # Check if this token has API props and merge them
-        effective_props = node.props.copy()
-        if node.token in api_props:
-            # API props override DSL props
-            effective_props.update(api_props[node.token])
-            print(f"🔧 Merged API props for {node.token}: {api_props[node.token]}")
-
-        if node.token == "c":
-            base = "flex flex-col gap-4"
-            extra = effective_props.get("class")
-            class_name = _join_class_names(base, extra)
-            if not node.children:
-                return f'{indent}<div className="{class_name}"></div>'
-            children_jsx = "\n".join(
-                render(child, level + 1) for child in node.children
-            )
-            return (
-                f'{indent}<div className="{class_name}">\n'
-                f"{children_jsx}\n"
-                f"{indent}</div>"
-            )
-        if node.token == "f":
-            if not node.children:
-                return f"{indent}<form></form>"
-            children_jsx = "\n".join(
-                render(child, level + 1) for child in node.children
-            )
-            return f"{indent}<form>\n{children_jsx}\n{indent}</form>"
-
-        # Standard JSX fragment rendering
-        jsx_result = _jsx_for_token(node.token, node.args, effective_props)
-
-        return f"{indent}" + jsx_result
-
-    # Standard JSX rendering
-    inner = "\n".join(render(n) for n in nodes) if nodes else ""
+    inner = "\n".join(jsx for jsx, _, _, _, _ in rendered)
 
     if not include_imports:
         return inner
@@ -550,6 +853,112 @@ def dsl_to_jsx(
     return component
 
 
+# ----------------- Incremental recompilation -----------------
+
+# Handle -> (statement sources, rendered statements, prefab set version,
+# api_props digest) of a compiled source
+INCREMENTAL_STATES = TranslationCache(
+    "incremental_states",
+    int(os.getenv("FE_INCREMENTAL_CACHE_MAXSIZE", "256")),
+    ttl=int(os.getenv("TRANSLATE_CACHE_TTL_SECONDS", "1800")),
+    max_bytes=int(os.getenv("FE_INCREMENTAL_CACHE_MAX_BYTES", str(32 << 20))),
+)
+
+
+def _api_props_digest(api_props: Dict[str, Dict]) -> str:
+    raw = json.dumps(api_props, sort_keys=True, default=str)
+    return sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _incremental_handle(source: str, api_props: Dict[str, Dict]) -> str:
+    raw = repr((source, _api_props_digest(api_props), PREFAB_SET_VERSION))
+    return sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _statement_change(index: int, source: str, node: Node) -> Dict:
+    return {"index": index, "token": node.token, "source": source}
+
+
+def compile_incremental(
+    dsl_source: str,
+    previous_handle: Optional[str] = None,
+    previous_source: Optional[str] = None,
+    include_imports: bool = True,
+    component_name: str = "GeneratedComponent",
+    api_props: Optional[Dict[str, Dict]] = None,
+) -> Dict:
+    """
+    Recompile an edited DSL source, re-rendering only changed statements.
+
+    Top-level statements are diffed against the previous compile, found by
+    ``previous_handle`` (returned by an earlier call) or re-parsed from
+    ``previous_source``. Statements that are unchanged and were rendered
+    under that handle are reused as-is, unless the prefab set or
+    ``api_props`` changed since; the rest go through the subtree cache.
+    Returns the component code, a handle for the next call and a
+    node-level change summary.
+    """
+    if api_props is None:
+        api_props = {}
+    _maybe_reload_prefabs()
+    props_digest = _api_props_digest(api_props)
+    statements = parse_statements_cached(dsl_source)
+    texts = [text for text, _ in statements]
+
+    previous = INCREMENTAL_STATES.get(previous_handle) if previous_handle else None
+    if previous is not None:
+        old_texts, old_rendered, prefab_version, old_digest = previous
+        if prefab_version != PREFAB_SET_VERSION or old_digest != props_digest:
+            # Rendered under other prefabs or props: only the diff is reusable
+            old_rendered = None
+        old_nodes: List[Optional[Node]] = [None] * len(old_texts)
+    else:
+        old_statements = parse_statements_cached(previous_source or "")
+        old_texts = tuple(text for text, _ in old_statements)
+        old_rendered = None
+        old_nodes = [node for _, node in old_statements]
+
+    rendered: List[Optional[_Subtree]] = [None] * len(statements)
+    changes: Dict[str, List[Dict]] = {"added": [], "removed": [], "modified": []}
+    unchanged = 0
+    matcher = difflib.SequenceMatcher(None, old_texts, texts, autojunk=False)
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == "equal":
+            unchanged += j2 - j1
+            if old_rendered is not None:
+                rendered[j1:j2] = old_rendered[i1:i2]
+            continue
+        paired = min(i2 - i1, j2 - j1) if op == "replace" else 0
+        for k in range(paired):
+            change = _statement_change(j1 + k, *statements[j1 + k])
+            change["previous_index"] = i1 + k
+            changes["modified"].append(change)
+        for j in range(j1 + paired, j2):
+            changes["added"].append(_statement_change(j, *statements[j]))
+        for i in range(i1 + paired, i2):
+            node = old_nodes[i] or parse_statements(old_texts[i])[0][1]
+            changes["removed"].append(_statement_change(i, old_texts[i], node))
+
+    rerendered = 0
+    for j, (_, node) in enumerate(statements):
+        if rendered[j] is None:
+            rendered[j] = _render_statement(node, api_props)
+            rerendered += 1
+
+    handle = _incremental_handle(dsl_source, api_props)
+    INCREMENTAL_STATES.set(
+        handle,
+        (tuple(texts), tuple(rendered), PREFAB_SET_VERSION, props_digest),
+    )
+    return {
+        "code": _assemble_component(rendered, include_imports, component_name),
+        "handle": handle,
+        "previous_handle_found": previous is not None,
+        "changes": {**changes, "unchanged": unchanged},
+        "rendered_statements": rerendered,
+    }
+
+
 def jsx_to_dsl(jsx_source: str) -> List[str]:
     """Very lightweight reverse: detect known patterns and produce tokens."""
     tokens: List[str] = []
@@ -601,6 +1010,14 @@ class FEDirectCompileRequest(BaseModel):
     use_cache: bool = True
 
 
+class FEIncrementalCompileRequest(BaseModel):
+    dsl_content: str
+    previous_handle: Optional[str] = None
+    previous_content: Optional[str] = None
+    include_imports: bool = True
+    component_name: str = "GeneratedComponent"
+
+
 class FEDecompileRequest(BaseModel):
     code_path: str
     use_cache: bool = True
@@ -610,43 +1027,96 @@ class CacheStats(BaseModel):
     items: int
 
 
-# ----------------- File helpers and tiny in-memory cache -----------------
+# ----------------- File helpers and in-memory cache -----------------
 
 MAX_FILE_BYTES = int(os.getenv("TRANSLATE_MAX_FILE_BYTES", "1048576"))
 CACHE_TTL_SECONDS = int(os.getenv("TRANSLATE_CACHE_TTL_SECONDS", "1800"))
 CACHE_MAXSIZE = int(os.getenv("TRANSLATE_CACHE_MAXSIZE", "256"))
+CACHE_MAX_BYTES = int(os.getenv("TRANSLATE_CACHE_MAX_BYTES", str(64 << 20)))
 BATCH_MAX_WORKERS = int(os.getenv("TRANSLATE_BATCH_MAX_WORKERS", "4"))
+# "thread" (default) or "process": batch jobs in a pool of worker processes
+# that each compile in parallel, sidestepping the GIL
+BATCH_EXECUTOR = os.getenv("FE_BATCH_EXECUTOR", "thread").lower()
+BATCH_PROCESS_WORKERS = int(
+    os.getenv("FE_BATCH_PROCESS_WORKERS", str(os.cpu_count() or 1))
+)
+# Jobs per task sent to a worker process
+BATCH_CHUNK_SIZE = int(os.getenv("FE_BATCH_CHUNK_SIZE", "8"))
+# Threads running blocking compile/file work off the event loop, and how
+# many requests may wait for one (0 = unbounded) before getting a 503
+COMPILE_WORKERS = int(os.getenv("FE_COMPILE_WORKERS", "4"))
+COMPILE_QUEUE_LIMIT = int(os.getenv("FE_COMPILE_QUEUE_LIMIT", "256"))
+# Optional persistent cache tier shared by workers (disabled when unset)
+DISK_CACHE_DIR = os.getenv("TRANSLATE_DISK_CACHE_DIR", "")
+DISK_CACHE_MAX_BYTES = int(
+    os.getenv("TRANSLATE_DISK_CACHE_MAX_BYTES", str(256 << 20))
+)
 
 
-class _TTLCache:
-    def __init__(self, maxsize: int, ttl: int):
-        self.maxsize = maxsize
-        self.ttl = ttl
-        self._store: Dict[str, Tuple[float, str]] = {}
+DISK_CACHE = open_disk_cache(DISK_CACHE_DIR, DISK_CACHE_MAX_BYTES)
+DSL_TO_JSX_CACHE = TranslationCache(
+    "dsl_to_jsx",
+    CACHE_MAXSIZE,
+    CACHE_TTL_SECONDS,
+    CACHE_MAX_BYTES,
+    disk=DISK_CACHE,
+)
+JSX_TO_DSL_CACHE = TranslationCache(
+    "jsx_to_dsl",
+    CACHE_MAXSIZE,
+    CACHE_TTL_SECONDS,
+    CACHE_MAX_BYTES,
+    disk=DISK_CACHE,
+)
 
-    def get(self, key: str) -> Optional[str]:
-        now = __import__("time").time()
-        item = self._store.get(key)
-        if not item:
-            return None
-        ts, value = item
-        if now - ts > self.ttl:
-            self._store.pop(key, None)
-            return None
-        return value
+# Seconds between prefab change checks before compiling (0 = only on
+# startup and POST /api/fe-prefabs/reload)
+PREFAB_RELOAD_INTERVAL = float(os.getenv("FE_PREFAB_RELOAD_INTERVAL", "0"))
 
-    def set(self, key: str, value: str):
-        if len(self._store) >= self.maxsize:
-            # Simple eviction: remove an arbitrary item
-            self._store.pop(next(iter(self._store)), None)
-        self._store[key] = (__import__("time").time(), value)
+# Load prefabs
+load_prefabs()
+COMPILER_VERSION = sha256(Path(__file__).read_bytes()).hexdigest()
+
+# Compact parsed ASTs by source hash; with the disk tier, workers and
+# restarts reuse each other's parses
+AST_CACHE = TranslationCache(
+    "dsl_ast",
+    int(os.getenv("FE_AST_CACHE_MAXSIZE", "512")),
+    ttl=0,
+    max_bytes=int(os.getenv("FE_AST_CACHE_MAX_BYTES", str(32 << 20))),
+    sizeof=lambda v: len(v) if isinstance(v, str) else len(orjson.dumps(v)),
+    disk=DISK_CACHE,
+)
 
 
-DSL_TO_JSX_CACHE = _TTLCache(CACHE_MAXSIZE, CACHE_TTL_SECONDS)
-JSX_TO_DSL_CACHE = _TTLCache(CACHE_MAXSIZE, CACHE_TTL_SECONDS)
+def parse_statements_cached(source: str) -> List[Tuple[str, Node]]:
+    """``parse_statements`` through ``AST_CACHE``; returns fresh nodes."""
+    key = sha256(f"{COMPILER_VERSION}|{source}".encode("utf-8")).hexdigest()
+    compact = AST_CACHE.get(key)
+    if compact is not None:
+        return compact_to_ast(compact)
+    statements = parse_statements(source)
+    AST_CACHE.set(key, ast_to_compact(statements))
+    return statements
 
-# Load prefabs
-load_prefabs()
+
+def _key_dsl(content: str, include_imports: bool, component_name: str) -> str:
+    _maybe_reload_prefabs()
+    raw = (
+        sha256(content.encode("utf-8")).hexdigest()
+        + f"|imports={include_imports}|name={component_name}"
+        + f"|p={PREFAB_SET_VERSION}|c={COMPILER_VERSION}"
+    )
+    return sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _key_jsx(jsx: str) -> str:
+    _maybe_reload_prefabs()
+    raw = (
+        sha256(jsx.encode("utf-8")).hexdigest()
+        + f"|p={PREFAB_SET_VERSION}|c={COMPILER_VERSION}"
+    )
+    return sha256(raw.encode("utf-8")).hexdigest()
 
 
 def _read_text_with_limits(path: str) -> str:
@@ -700,6 +1170,132 @@ def _write_if_changed(path: str, content: str) -> bool:
         )
 
 
+class CompileQueue:
+    """
+    Bounded thread pool for blocking compile and file work.
+
+    Async endpoints await ``run`` so compiles, file I/O and batch waits
+    never block the event loop; ``/health`` and other requests stay
+    responsive under batch load. Requests beyond ``queue_limit`` waiting
+    jobs are rejected with 503 instead of piling up.
+    """
+
+    def __init__(self, workers: int, queue_limit: int = 0):
+        self.workers = max(1, workers)
+        self.queue_limit = queue_limit
+        self._executor = cf.ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="fe-compile"
+        )
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self.queue_limit and self.queued >= self.queue_limit:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail={
+                        "code": "compile_queue_full",
+                        "queued": self.queued,
+                        "limit": self.queue_limit,
+                    },
+                )
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+
+    async def run(self, fn, *args):
+        """Run ``fn(*args)`` on the pool and return (or raise) its result."""
+        self._admit()
+        future = self._executor.submit(self._call, fn, args)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # Client went away before the job started
+            if future.cancel():
+                with self._lock:
+                    self.queued -= 1
+            raise
+
+    def stream(self, fn, *args):
+        """
+        Run the generator ``fn(*args)`` on the pool as one job.
+
+        The queue limit is checked here, so a full queue is still answered
+        with 503 before a streamed response starts. Returns an async
+        iterator relaying each item as soon as the job yields it; closing
+        it early stops the job after its current item.
+        """
+        self._admit()
+        loop = asyncio.get_running_loop()
+        items: asyncio.Queue = asyncio.Queue()
+        done = object()
+        stop = threading.Event()
+
+        def produce():
+            try:
+                gen = fn(*args)
+                try:
+                    for item in gen:
+                        if stop.is_set():
+                            break
+                        loop.call_soon_threadsafe(items.put_nowait, item)
+                finally:
+                    gen.close()
+            finally:
+                if not stop.is_set():
+                    loop.call_soon_threadsafe(items.put_nowait, done)
+
+        future = self._executor.submit(self._call, produce, ())
+
+        async def relay():
+            try:
+                while True:
+                    item = await items.get()
+                    if item is done:
+                        break
+                    yield item
+                # Re-raise what ended the job early, if anything
+                await asyncio.wrap_future(future)
+            finally:
+                stop.set()
+                if future.cancel():
+                    with self._lock:
+                        self.queued -= 1
+
+        return relay()
+
+    def _call(self, fn, args):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_limit": self.queue_limit,
+                "queued": self.queued,
+                "running": self.running,
+                "max_queued": self.max_queued,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+
+COMPILE_QUEUE = CompileQueue(COMPILE_WORKERS, COMPILE_QUEUE_LIMIT)
+
+
 # ----------------- API ENDPOINTS -----------------
 
 
@@ -715,7 +1311,9 @@ async def root():
             "/health",
             "/api/fe-translate/to-s",
             "/api/fe-translate/to-s-direct",
+            "/api/fe-translate/incremental",
             "/api/fe-translate/from-s",
+            "/api/fe-prefabs/reload",
             "/debug/routes",
         ],
     }
@@ -728,13 +1326,23 @@ async def health():
         "status": "healthy",
         "service": "sevdo-frontend",
         "version": "1.0.0",
+        "prefab_set_version": PREFAB_SET_VERSION,
+        "prefabs_loaded": len(PREFAB_VERSIONS),
         "cache_status": {
-            "dsl_to_jsx_items": len(DSL_TO_JSX_CACHE._store),
-            "jsx_to_dsl_items": len(JSX_TO_DSL_CACHE._store),
+            "dsl_to_jsx_items": len(DSL_TO_JSX_CACHE),
+            "jsx_to_dsl_items": len(JSX_TO_DSL_CACHE),
         },
+        "compile_queue": COMPILE_QUEUE.stats(),
     }
 
 
+@app.post("/api/fe-prefabs/reload")
+async def fe_prefabs_reload():
+    """Re-import only the prefabs whose source changed since the last load"""
+    changes = await COMPILE_QUEUE.run(load_prefabs)
+    return {**changes, "prefab_set_version": PREFAB_SET_VERSION}
+
+
 # DEBUG ENDPOINT
 @app.get("/debug/routes")
 async def list_routes():
@@ -753,8 +1361,7 @@ async def list_routes():
 
 
 # DIRECT DSL-TO-JSX ENDPOINT (no files needed)
-@app.post("/api/fe-translate/to-s-direct")
-async def fe_compile_direct_api(body: FEDirectCompileRequest):
+def _fe_compile_direct(body: FEDirectCompileRequest):
     """Generate frontend code directly from DSL content (no files)"""
     try:
         print(f"Direct frontend generation request: {body.component_name}")
@@ -763,8 +1370,8 @@ async def fe_compile_direct_api(body: FEDirectCompileRequest):
         # Handle use_cache field safely
         use_cache = getattr(body, "use_cache", True)
 
-        cache_key = (
-            f"dsl:{hash((body.dsl_content, body.include_imports, body.component_name))}"
+        cache_key = _key_dsl(
+            body.dsl_content, body.include_imports, body.component_name
         )
         cached = DSL_TO_JSX_CACHE.get(cache_key) if use_cache else None
 
@@ -800,9 +1407,45 @@ async def fe_compile_direct_api(body: FEDirectCompileRequest):
         )
 
 
+@app.post("/api/fe-translate/to-s-direct")
+async def fe_compile_direct_api(body: FEDirectCompileRequest):
+    return await COMPILE_QUEUE.run(_fe_compile_direct, body)
+
+
+def _fe_compile_incremental(body: FEIncrementalCompileRequest):
+    """Recompile edited DSL, re-rendering only the changed statements"""
+    try:
+        result = compile_incremental(
+            body.dsl_content,
+            previous_handle=body.previous_handle,
+            previous_source=body.previous_content,
+            include_imports=body.include_imports,
+            component_name=body.component_name,
+        )
+        return {
+            "success": True,
+            "component_name": body.component_name,
+            "bytes": len(result["code"]),
+            **result,
+        }
+    except Exception as exc:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "success": False,
+                "error": str(exc),
+                "code": "frontend_generation_failed",
+            },
+        )
+
+
+@app.post("/api/fe-translate/incremental")
+async def fe_compile_incremental_api(body: FEIncrementalCompileRequest):
+    return await COMPILE_QUEUE.run(_fe_compile_incremental, body)
+
+
 # FILE-BASED ENDPOINT
-@app.post("/api/fe-translate/to-s")
-async def fe_compile_api(body: FECompileRequest):
+def _fe_compile(body: FECompileRequest):
     """Generate frontend code from DSL file"""
     try:
         print(f"File-based frontend generation: {body.input_path}")
@@ -835,7 +1478,7 @@ c(
         else:
             content = _read_text_with_limits(body.input_path)
 
-        cache_key = f"dsl:{hash((content, body.include_imports, body.component_name))}"
+        cache_key = _key_dsl(content, body.include_imports, body.component_name)
         cached = DSL_TO_JSX_CACHE.get(cache_key) if body.use_cache else None
 
         if cached is None:
@@ -871,12 +1514,16 @@ c(
         )
 
 
-@app.post("/api/fe-translate/from-s")
-async def fe_decompile_api(body: FEDecompileRequest):
+@app.post("/api/fe-translate/to-s")
+async def fe_compile_api(body: FECompileRequest):
+    return await COMPILE_QUEUE.run(_fe_compile, body)
+
+
+def _fe_decompile(body: FEDecompileRequest):
     """Decompile JSX back to DSL tokens"""
     try:
         jsx = _read_text_with_limits(body.code_path)
-        cache_key = f"jsx:{hash(jsx)}"
+        cache_key = _key_jsx(jsx)
         cached = JSX_TO_DSL_CACHE.get(cache_key) if body.use_cache else None
         if cached is None:
             tokens = jsx_to_dsl(jsx)
@@ -904,27 +1551,28 @@ async def fe_decompile_api(body: FEDecompileRequest):
         )
 
 
+@app.post("/api/fe-translate/from-s")
+async def fe_decompile_api(body: FEDecompileRequest):
+    return await COMPILE_QUEUE.run(_fe_decompile, body)
+
+
 # CACHE MANAGEMENT
 @app.get("/api/fe-cache/stats")
 async def fe_cache_stats():
     return {
-        "dsl_to_jsx": {
-            "size": len(DSL_TO_JSX_CACHE._store),
-            "maxsize": DSL_TO_JSX_CACHE.maxsize,
-            "ttl_seconds": DSL_TO_JSX_CACHE.ttl,
-        },
-        "jsx_to_dsl": {
-            "size": len(JSX_TO_DSL_CACHE._store),
-            "maxsize": JSX_TO_DSL_CACHE.maxsize,
-            "ttl_seconds": JSX_TO_DSL_CACHE.ttl,
-        },
+        "dsl_to_jsx": DSL_TO_JSX_CACHE.stats(),
+        "jsx_to_dsl": JSX_TO_DSL_CACHE.stats(),
+        "jsx_subtrees": SUBTREE_CACHE.stats(),
+        "dsl_ast": AST_CACHE.stats(),
     }
 
 
 @app.post("/api/fe-cache/flush")
 async def fe_cache_flush():
-    DSL_TO_JSX_CACHE._store.clear()
-    JSX_TO_DSL_CACHE._store.clear()
+    DSL_TO_JSX_CACHE.clear()
+    JSX_TO_DSL_CACHE.clear()
+    SUBTREE_CACHE.clear()
+    AST_CACHE.clear()
     return {"flushed": True}
 
 
@@ -942,71 +1590,199 @@ class FEBatchCompileRequest(BaseModel):
     jobs: List[FEBatchCompileJob]
 
 
-@app.post("/api/fe-translate/to-s-batch")
-async def fe_compile_batch_api(body: FEBatchCompileRequest):
-    results: List[dict] = [None] * len(body.jobs)  # type: ignore
-    ok = 0
+def _job_error(job_id: str, exc: Exception) -> Dict:
+    if isinstance(exc, HTTPException):
+        return {"id": job_id, "status": exc.status_code, "error": exc.detail}
+    return {
+        "id": job_id,
+        "status": 400,
+        "error": {"code": "unexpected_error", "error": str(exc)},
+    }
 
-    def process(idx: int, job: FEBatchCompileJob):
-        job_id = job.id or str(idx)
-        try:
-            content = _read_text_with_limits(job.input_path)
-            cache_key = "dsl:" + str(
-                hash((content, job.include_imports, job.component_name))
+
+def _compile_job(idx: int, job: Dict) -> Tuple[int, bool, Dict]:
+    """Run one to-s-batch job (a ``FEBatchCompileJob`` as a dict)."""
+    job_id = job["id"] or str(idx)
+    try:
+        content = _read_text_with_limits(job["input_path"])
+        cache_key = _key_dsl(
+            content, job["include_imports"], job["component_name"]
+        )
+        jsx = DSL_TO_JSX_CACHE.get(cache_key) if job["use_cache"] else None
+        if jsx is None:
+            jsx = dsl_to_jsx(
+                content,
+                include_imports=job["include_imports"],
+                component_name=job["component_name"],
             )
-            jsx = DSL_TO_JSX_CACHE.get(cache_key) if job.use_cache else None
-            if jsx is None:
-                jsx = dsl_to_jsx(
-                    content,
-                    include_imports=job.include_imports,
-                    component_name=job.component_name,
+            if job["use_cache"]:
+                DSL_TO_JSX_CACHE.set(cache_key, jsx)
+        _ensure_output_parent_exists(job["output_path"])
+        changed = _write_if_changed(job["output_path"], jsx)
+        res = {
+            "id": job_id,
+            "written_to": job["output_path"],
+            "bytes": len(jsx),
+            "changed": changed,
+        }
+        return (idx, True, res)
+    except Exception as exc:
+        return (idx, False, _job_error(job_id, exc))
+
+
+def _decompile_job(idx: int, job: Dict) -> Tuple[int, bool, Dict]:
+    """Run one from-s-batch job (a ``FEBatchDecompileJob`` as a dict)."""
+    job_id = job["id"] or str(idx)
+    try:
+        jsx = _read_text_with_limits(job["code_path"])
+        cache_key = _key_jsx(jsx)
+        token_str = None
+        if job["use_cache"]:
+            token_str = JSX_TO_DSL_CACHE.get(cache_key)
+        if token_str is None:
+            tokens = jsx_to_dsl(jsx)
+            if not tokens:
+                raise HTTPException(
+                    status_code=400,
+                    detail={
+                        "code": "invalid_code_format",
+                        "message": ("No recognizable frontend components found"),
+                    },
                 )
-                if job.use_cache:
-                    DSL_TO_JSX_CACHE.set(cache_key, jsx)
-            _ensure_output_parent_exists(job.output_path)
-            changed = _write_if_changed(job.output_path, jsx)
-            res = {
-                "id": job_id,
-                "written_to": job.output_path,
-                "bytes": len(jsx),
-                "changed": changed,
-            }
-            return (idx, True, res)
-        except HTTPException as http_exc:
-            return (
-                idx,
-                False,
-                {
-                    "id": job_id,
-                    "status": http_exc.status_code,
-                    "error": http_exc.detail,
-                },
-            )
-        except Exception as exc:
-            return (
-                idx,
-                False,
-                {
-                    "id": job_id,
-                    "status": 400,
-                    "error": {"code": "unexpected_error", "error": str(exc)},
-                },
-            )
+            token_str = " ".join(tokens)
+            if job["use_cache"]:
+                JSX_TO_DSL_CACHE.set(cache_key, token_str)
+        tokens_list = []
+        if token_str:
+            tokens_list = token_str.split()
+        return (idx, True, {"id": job_id, "tokens": tokens_list})
+    except Exception as exc:
+        return (idx, False, _job_error(job_id, exc))
+
+
+_BATCH_JOBS = {"compile": _compile_job, "decompile": _decompile_job}
+_PROCESS_POOL: Optional[cf.ProcessPoolExecutor] = None
+_PROCESS_POOL_LOCK = threading.Lock()
+
+
+def _run_batch_chunk(
+    kind: str, chunk: List[Tuple[int, Dict]], prefab_set_version: str
+) -> List[Tuple[int, bool, Dict]]:
+    """Run a chunk of batch jobs; reloads prefabs if the caller's set changed."""
+    if prefab_set_version != PREFAB_SET_VERSION:
+        load_prefabs()
+    run = _BATCH_JOBS[kind]
+    return [run(idx, job) for idx, job in chunk]
+
 
-    with cf.ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS) as executor:
-        futures = [executor.submit(process, i, job) for i, job in enumerate(body.jobs)]
-        for fut in futures:
-            idx, success, payload = fut.result()
-            results[idx] = payload
-            if success:
-                ok += 1
+def _get_process_pool() -> cf.ProcessPoolExecutor:
+    """The shared worker-process pool, started on first use."""
+    global _PROCESS_POOL
+    with _PROCESS_POOL_LOCK:
+        if _PROCESS_POOL is None:
+            import multiprocessing
 
+            # spawn: forking a server process with live threads is unsafe.
+            # Workers load prefabs by importing this module and
+            # _run_batch_chunk reloads them when the set changes.
+            _PROCESS_POOL = cf.ProcessPoolExecutor(
+                max_workers=max(1, BATCH_PROCESS_WORKERS),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _PROCESS_POOL
+
+
+def _discard_process_pool() -> None:
+    global _PROCESS_POOL
+    with _PROCESS_POOL_LOCK:
+        pool, _PROCESS_POOL = _PROCESS_POOL, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_batch_results(kind: str, jobs: List[Dict]):
+    """
+    Run batch jobs and yield ``(index, success, payload)`` as they finish.
+
+    ``kind`` is "compile" or "decompile". With ``FE_BATCH_EXECUTOR=process``
+    jobs go to the worker-process pool in chunks of ``FE_BATCH_CHUNK_SIZE``;
+    otherwise each job runs on a thread. A chunk whose worker dies is
+    reported as a failed result for each of its jobs.
+    """
+    indexed = list(enumerate(jobs))
+    if BATCH_EXECUTOR == "process":
+        size = max(1, BATCH_CHUNK_SIZE)
+        executor = _get_process_pool()
+        owned = False
+    else:
+        size = 1
+        executor = cf.ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS)
+        owned = True
+    try:
+        futures = {}
+        for start in range(0, len(indexed), size):
+            chunk = indexed[start : start + size]
+            fut = executor.submit(
+                _run_batch_chunk, kind, chunk, PREFAB_SET_VERSION
+            )
+            futures[fut] = chunk
+        for fut in cf.as_completed(futures):
+            try:
+                chunk_results = fut.result()
+            except Exception as exc:
+                if isinstance(exc, cf.BrokenExecutor):
+                    _discard_process_pool()
+                chunk_results = [
+                    (
+                        idx,
+                        False,
+                        {
+                            "id": job["id"] or str(idx),
+                            "status": 500,
+                            "error": {"code": "worker_error", "error": str(exc)},
+                        },
+                    )
+                    for idx, job in futures[fut]
+                ]
+            yield from chunk_results
+    finally:
+        if owned:
+            executor.shutdown(wait=True)
+
+
+def _run_batch(kind: str, jobs: List[BaseModel]):
+    """One JSON body with every result."""
+    job_dicts = [job.model_dump() for job in jobs]
+    results: List[dict] = [None] * len(jobs)  # type: ignore
+    ok = 0
+    for idx, success, payload in iter_batch_results(kind, job_dicts):
+        results[idx] = payload
+        if success:
+            ok += 1
     return {
         "results": results,
         "totals": {"ok": ok, "failed": len(results) - ok},
     }
 
 
+def _stream_batch(kind: str, jobs: List[BaseModel], stream: str):
+    """Stream results as they finish (see batch_stream), as one queued job."""
+    job_dicts = [job.model_dump() for job in jobs]
+    return batch_stream_response(
+        COMPILE_QUEUE.stream(iter_batch_results, kind, job_dicts), stream
+    )
+
+
+@app.post("/api/fe-translate/to-s-batch")
+async def fe_compile_batch_api(
+    body: FEBatchCompileRequest, stream: Optional[str] = None
+):
+    stream = check_stream_mode(stream)
+    if stream:
+        return _stream_batch("compile", body.jobs, stream)
+    return await COMPILE_QUEUE.run(_run_batch, "compile", body.jobs)
+
+
 class FEBatchDecompileJob(BaseModel):
     id: Optional[str] = None
     code_path: str
@@ -1018,68 +1794,13 @@ class FEBatchDecompileRequest(BaseModel):
 
 
 @app.post("/api/fe-translate/from-s-batch")
-async def fe_decompile_batch_api(body: FEBatchDecompileRequest):
-    results: List[dict] = [None] * len(body.jobs)  # type: ignore
-    ok = 0
-
-    def process(idx: int, job: FEBatchDecompileJob):
-        job_id = job.id or str(idx)
-        try:
-            jsx = _read_text_with_limits(job.code_path)
-            cache_key = "jsx:" + str(hash(jsx))
-            token_str = None
-            if job.use_cache:
-                token_str = JSX_TO_DSL_CACHE.get(cache_key)
-            if token_str is None:
-                tokens = jsx_to_dsl(jsx)
-                if not tokens:
-                    raise HTTPException(
-                        status_code=400,
-                        detail={
-                            "code": "invalid_code_format",
-                            "message": ("No recognizable frontend components found"),
-                        },
-                    )
-                token_str = " ".join(tokens)
-                if job.use_cache:
-                    JSX_TO_DSL_CACHE.set(cache_key, token_str)
-            tokens_list = []
-            if token_str:
-                tokens_list = token_str.split()
-            return (idx, True, {"id": job_id, "tokens": tokens_list})
-        except HTTPException as http_exc:
-            return (
-                idx,
-                False,
-                {
-                    "id": job_id,
-                    "status": http_exc.status_code,
-                    "error": http_exc.detail,
-                },
-            )
-        except Exception as exc:
-            return (
-                idx,
-                False,
-                {
-                    "id": job_id,
-                    "status": 400,
-                    "error": {"code": "unexpected_error", "error": str(exc)},
-                },
-            )
-
-    with cf.ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS) as executor:
-        futures = [executor.submit(process, i, job) for i, job in enumerate(body.jobs)]
-        for fut in futures:
-            idx, success, payload = fut.result()
-            results[idx] = payload
-            if success:
-                ok += 1
-
-    return {
-        "results": results,
-        "totals": {"ok": ok, "failed": len(results) - ok},
-    }
+async def fe_decompile_batch_api(
+    body: FEBatchDecompileRequest, stream: Optional[str] = None
+):
+    stream = check_stream_mode(stream)
+    if stream:
+        return _stream_batch("decompile", body.jobs, stream)
+    return await COMPILE_QUEUE.run(_run_batch, "decompile", body.jobs)
 
 
 # MAIN ENTRY POINT
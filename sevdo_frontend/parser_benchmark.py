@@ -0,0 +1,243 @@
+"""
+Benchmark of the single-pass DSL parser against the previous cursor parser.
+
+The previous parser (character cursor plus ``_extract_balanced``, which
+rescans every nested level) is kept here as the reference implementation;
+each run also checks that both parsers produce the same trees. ``load_ast``
+(rebuilding a serialized, cached AST instead of parsing) is timed too.
+
+Usage:
+    python -m sevdo_frontend.parser_benchmark --statements 5000 --depth 200
+"""
+
+import argparse
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sevdo_frontend.frontend_compiler import (
+    CONTAINER_TOKENS,
+    Node,
+    ParseError,
+    _strip_comments,
+    dump_ast,
+    load_ast,
+    parse_statements,
+)
+
+
+# ----------------- Reference (previous) parser -----------------
+
+
+class _Cursor:
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+
+    def eof(self) -> bool:
+        return self.pos >= len(self.text)
+
+    def peek(self) -> str:
+        return self.text[self.pos] if not self.eof() else ""
+
+    def advance(self, n: int = 1):
+        self.pos += n
+
+    def skip_ws(self):
+        while not self.eof() and self.text[self.pos].isspace():
+            self.pos += 1
+
+
+def _parse_identifier(cur: _Cursor) -> str:
+    start = cur.pos
+    while not cur.eof() and cur.text[cur.pos].isalpha():
+        cur.pos += 1
+    return cur.text[start : cur.pos]
+
+
+def _extract_balanced(cur: _Cursor, open_ch: str, close_ch: str) -> str:
+    if cur.peek() != open_ch:
+        return ""
+    cur.advance(1)
+    depth = 1
+    start = cur.pos
+    while not cur.eof():
+        ch = cur.peek()
+        if ch == open_ch:
+            depth += 1
+        elif ch == close_ch:
+            depth -= 1
+            if depth == 0:
+                content = cur.text[start : cur.pos]
+                cur.advance(1)
+                return content
+        cur.advance(1)
+    raise ParseError("Unbalanced parentheses or braces in DSL")
+
+
+def _legacy_props(text: str) -> Dict[str, str]:
+    props: Dict[str, str] = {}
+    for part in text.strip().split(",") if text.strip() else []:
+        if not part.strip():
+            continue
+        if "=" in part:
+            k, v = part.split("=", 1)
+            props[k.strip()] = v.strip()
+        else:
+            props[part.strip()] = "true"
+    return props
+
+
+def _legacy_statement(cur: _Cursor) -> Optional[Node]:
+    cur.skip_ws()
+    if cur.eof():
+        return None
+    token = _parse_identifier(cur)
+    if not token:
+        return None
+
+    cur.skip_ws()
+    args_text: Optional[str] = None
+    children: List[Node] = []
+    if cur.peek() == "(":
+        inner = _extract_balanced(cur, "(", ")")
+        if token in CONTAINER_TOKENS:
+            child_cur = _Cursor(inner)
+            while True:
+                child = _legacy_statement(child_cur)
+                if child is None:
+                    break
+                children.append(child)
+        else:
+            args_text = inner.strip()
+
+    cur.skip_ws()
+    props: Dict[str, str] = {}
+    if cur.peek() == "{":
+        props = _legacy_props(_extract_balanced(cur, "{", "}"))
+
+    return Node(token=token, args=args_text, props=props, children=children)
+
+
+def legacy_parse_statements(source: str) -> List[Tuple[str, Node]]:
+    """The previous cursor-based ``parse_statements``."""
+    text = _strip_comments(source)
+    cur = _Cursor(text)
+    statements: List[Tuple[str, Node]] = []
+    while True:
+        cur.skip_ws()
+        start = cur.pos
+        node = _legacy_statement(cur)
+        if node is None:
+            break
+        statements.append((text[start : cur.pos].strip(), node))
+    return statements
+
+
+# ----------------- Synthetic sources -----------------
+
+
+def tree_signature(node: Node) -> tuple:
+    """Span-free structural view of a node, for comparing parsers."""
+    return (
+        node.token,
+        node.args,
+        sorted(node.props.items()),
+        [tree_signature(child) for child in node.children],
+    )
+
+
+def synthetic_source(
+    statements: int, depth: int, fanout: int = 3, seed: int = 0
+) -> str:
+    """A wide page of ``statements`` leaves/containers plus one ``depth``-deep chain."""
+    rng = random.Random(seed)
+    leaves = [
+        "h(Title {n})",
+        "t(Some paragraph text number {n})",
+        "i(email,label=Email {n})",
+        "b(Save {n}){{onClick=save{n}}}",
+        "sel(a,b,c)",
+        "img(logo{n}.png){{alt=Logo}}",
+    ]
+
+    def leaf(n: int) -> str:
+        return rng.choice(leaves).format(n=n)
+
+    lines = ["// synthetic page"]
+    n = 0
+    while n < statements:
+        if rng.random() < 0.3:
+            kids = " ".join(leaf(n + k) for k in range(fanout))
+            lines.append(f"c({kids}){{class=mt-{n % 8}}}")
+            n += fanout
+        else:
+            lines.append(leaf(n))
+            n += 1
+    nested = "t(deepest)"
+    for level in range(depth):
+        nested = f"c({nested} t(level {level})){{class=l{level}}}"
+    lines.append(nested)
+    return "\n".join(lines)
+
+
+def _time(fn, source: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(source)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(
+    statements: int = 2000, depth: int = 200, repeat: int = 3, seed: int = 0
+) -> list:
+    """Time both parsers on wide and deep sources; one result dict per source."""
+    sources = {
+        "wide": synthetic_source(statements, 0, seed=seed),
+        "deep": synthetic_source(0, depth, seed=seed),
+        "mixed": synthetic_source(statements, depth, seed=seed),
+    }
+    rows = []
+    for name, source in sources.items():
+        new = parse_statements(source)
+        old = legacy_parse_statements(source)
+        same = [(t, tree_signature(n)) for t, n in new] == [
+            (t, tree_signature(n)) for t, n in old
+        ]
+        rows.append(
+            {
+                "source": name,
+                "bytes": len(source),
+                "legacy_ms": _time(legacy_parse_statements, source, repeat),
+                "single_pass_ms": _time(parse_statements, source, repeat),
+                "load_ast_ms": _time(load_ast, dump_ast(new), repeat),
+                "identical": same,
+            }
+        )
+
+    for row in rows:
+        print(
+            f"  {row['source']:<6} {row['bytes']:>9} bytes  "
+            f"legacy {row['legacy_ms']:8.2f} ms  "
+            f"single-pass {row['single_pass_ms']:8.2f} ms  "
+            f"load_ast {row['load_ast_ms']:8.2f} ms  "
+            f"identical={row['identical']}"
+        )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument("--statements", type=int, default=2000)
+    parser.add_argument("--depth", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.statements, args.depth, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
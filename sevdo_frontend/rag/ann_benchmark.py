@@ -0,0 +1,109 @@
+"""
+Recall-vs-latency benchmark of the IVF index against exact matrix search.
+
+Usage:
+    python -m sevdo_frontend.rag.ann_benchmark --chunks 50000 --dim 384
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from .ann_index import IVFIndex
+from .matrix_index import normalize_rows, top_k_indices
+
+
+def _synthetic_matrix(
+    n: int, dim: int, clusters: int, seed: int
+) -> np.ndarray:
+    """Clustered unit vectors, roughly shaped like real document chunks."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim))
+    labels = rng.integers(0, clusters, size=n)
+    data = centers[labels] + 0.6 * rng.standard_normal((n, dim))
+    return normalize_rows(data)[0]
+
+
+def run(
+    chunks: int = 20000,
+    dim: int = 384,
+    queries: int = 200,
+    k: int = 10,
+    nlist: int = None,
+    seed: int = 0,
+) -> list:
+    """Run the benchmark and return one result dict per nprobe setting."""
+    matrix = _synthetic_matrix(chunks, dim, max(8, chunks // 500), seed)
+    rng = np.random.default_rng(seed + 1)
+    sample = matrix[rng.choice(chunks, size=queries, replace=False)]
+    noise = 0.3 * rng.standard_normal(sample.shape) / np.sqrt(dim)
+    qs = normalize_rows(sample + noise)[0]
+
+    start = time.perf_counter()
+    exact = [top_k_indices(matrix @ q, k) for q in qs]
+    exact_ms = (time.perf_counter() - start) * 1000 / queries
+
+    start = time.perf_counter()
+    index = IVFIndex(matrix, nlist=nlist).build()
+    build_s = time.perf_counter() - start
+
+    rows = [
+        {
+            "mode": "exact",
+            "nprobe": None,
+            "recall": 1.0,
+            "ms_per_query": exact_ms,
+        }
+    ]
+    nprobe = 1
+    while nprobe <= index.nlist:
+        start = time.perf_counter()
+        approx = [index.search(q, k, nprobe) for q in qs]
+        ms = (time.perf_counter() - start) * 1000 / queries
+        hits = sum(
+            len(set(a.tolist()) & set(e.tolist()))
+            for a, e in zip(approx, exact)
+        )
+        rows.append(
+            {
+                "mode": "ivf",
+                "nprobe": nprobe,
+                "recall": hits / float(k * queries),
+                "ms_per_query": ms,
+            }
+        )
+        nprobe *= 2
+
+    print(
+        f"{chunks} chunks x {dim} dims, nlist={index.nlist}, "
+        f"build {build_s:.2f}s, recall@{k} over {queries} queries"
+    )
+    for row in rows:
+        label = (
+            "exact"
+            if row["mode"] == "exact"
+            else f"ivf nprobe={row['nprobe']}"
+        )
+        print(
+            f"  {label:<18} recall={row['recall']:.3f}  "
+            f"{row['ms_per_query']:.3f} ms/query"
+        )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument("--chunks", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=None)
+    args = parser.parse_args()
+    run(args.chunks, args.dim, args.queries, args.k, args.nlist)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Precomputed BM25 inverted index over document chunks.
+
+Chunks are tokenized once at load time into term -> postings (chunk ids with
+precomputed BM25 weights), so a keyword query only touches the postings of
+its own terms instead of re-tokenizing the whole knowledge base.
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from .matrix_index import rank_documents
+
+# Same token definition as the previous character loop: runs of alphanumeric
+# characters (underscore is a separator), lowercased
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens of ``text``."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def reciprocal_rank_fusion(
+    *score_lists: np.ndarray, k: int = 60
+) -> np.ndarray:
+    """
+    Fuse several score arrays over the same items by reciprocal rank.
+
+    Each list contributes ``1 / (k + rank)`` for items it scores above 0
+    (ranks start at 1). The result is scaled so an item ranked first by
+    every list scores 1.0.
+    """
+    n = score_lists[0].shape[0]
+    fused = np.zeros((n,), dtype=np.float64)
+    for scores in score_lists:
+        order = np.argsort(-scores, kind="stable")
+        ranks = np.empty((n,), dtype=np.float64)
+        ranks[order] = np.arange(1, n + 1)
+        fused += np.where(scores > 0, 1.0 / (k + ranks), 0.0)
+    return fused / (len(score_lists) / (k + 1.0))
+
+
+class BM25Index:
+    """
+    Okapi BM25 over every chunk of every document.
+
+    Attributes:
+        postings: term -> (chunk ids, BM25 weight of the term in each chunk)
+        doc_offsets: (n_docs + 1,) start offset of each document's chunks
+    """
+
+    def __init__(self, documents: Sequence, k1: float = 1.5, b: float = 0.75):
+        self.documents = list(documents)
+        self._chunk_lists = [d.chunks for d in self.documents]
+        self.k1 = k1
+        self.b = b
+        counts = np.array(
+            [len(d.chunks) for d in self.documents], dtype=np.int64
+        )
+        self.doc_offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.doc_offsets[1:])
+        self.n_chunks = int(self.doc_offsets[-1])
+        self.postings: Dict[str, tuple] = {}
+        self._build()
+
+    def _build(self) -> None:
+        raw: Dict[str, List[tuple]] = defaultdict(list)
+        lengths = np.zeros((self.n_chunks,), dtype=np.float64)
+        chunk_id = 0
+        for doc in self.documents:
+            for chunk in doc.chunks:
+                tokens = tokenize(chunk)
+                lengths[chunk_id] = len(tokens)
+                for term, tf in Counter(tokens).items():
+                    raw[term].append((chunk_id, tf))
+                chunk_id += 1
+
+        avgdl = float(lengths.mean()) if self.n_chunks else 0.0
+        norm = self.k1 * (
+            1.0 - self.b + self.b * lengths / (avgdl if avgdl else 1.0)
+        )
+        for term, entries in raw.items():
+            ids = np.fromiter((e[0] for e in entries), dtype=np.int64)
+            tf = np.fromiter((e[1] for e in entries), dtype=np.float64)
+            df = len(entries)
+            idf = math.log(1.0 + (self.n_chunks - df + 0.5) / (df + 0.5))
+            weights = idf * tf * (self.k1 + 1.0) / (tf + norm[ids])
+            self.postings[term] = (ids, weights)
+
+    def is_current(self, documents: Sequence) -> bool:
+        """True if built from exactly these documents and chunk lists."""
+        return len(documents) == len(self.documents) and all(
+            doc is own and doc.chunks is chunks
+            for doc, own, chunks in zip(
+                documents, self.documents, self._chunk_lists
+            )
+        )
+
+    def chunk_scores(self, query: str) -> np.ndarray:
+        """Raw BM25 score of every chunk for ``query``."""
+        scores = np.zeros((self.n_chunks,), dtype=np.float64)
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if posting is not None:
+                scores[posting[0]] += posting[1]
+        return scores
+
+    def rank(
+        self, chunk_scores: np.ndarray, top_k: int, chunks_per_doc: int = 3
+    ):
+        """Top documents and chunks for precomputed chunk scores."""
+        return rank_documents(
+            self.doc_offsets, chunk_scores, top_k, chunks_per_doc
+        )
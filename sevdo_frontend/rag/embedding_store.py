@@ -0,0 +1,239 @@
+"""
+Consolidated on-disk embedding store for the RAG index.
+
+All chunk embeddings are kept in one float32 ``.npy`` matrix (rows
+L2-normalized) with a JSON metadata sidecar describing which rows belong to
+which document. The matrix is opened with ``np.load(mmap_mode="r")`` so
+several worker processes share the same pages through the OS page cache
+instead of each holding a private copy.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from .errors import RAGCacheError
+except Exception:
+    RAGCacheError = RuntimeError
+
+from .matrix_index import QUANTIZATIONS, normalize_rows, quantize_rows
+
+logger = logging.getLogger(__name__)
+
+# 2: hash-backend vectors changed to signed feature hashing
+STORE_FORMAT_VERSION = 2
+
+
+def _safe_name(value: str) -> str:
+    return value.replace(os.sep, "_").replace("/", "_")
+
+
+def _atomic_write(path: str, write) -> None:
+    """Write via a temp file in the same directory, then rename into place."""
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class EmbeddingStoreSnapshot:
+    """A memory-mapped matrix plus per-document row ranges."""
+
+    def __init__(
+        self,
+        matrix: np.ndarray,
+        metadata: Dict,
+        quantized: Optional[Dict[str, tuple]] = None,
+    ):
+        self.matrix = matrix
+        self.metadata = metadata
+        self._quantized = quantized or {}
+        self._by_path = {
+            entry["file_path"]: entry for entry in metadata["documents"]
+        }
+
+    def lookup(
+        self, file_path: str, content_hash: Optional[str], n_chunks: int
+    ) -> Optional[np.ndarray]:
+        """Return a zero-copy view of the document's rows, or None on a miss."""
+        entry = self._by_path.get(file_path)
+        if (
+            entry is None
+            or content_hash is None
+            or entry["content_hash"] != content_hash
+            or entry["n_chunks"] != n_chunks
+        ):
+            return None
+        start = entry["offset"]
+        return self.matrix[start : start + n_chunks]
+
+    def is_aligned(self, documents: Sequence) -> bool:
+        """True if ``documents`` map, in order, onto every row of the matrix."""
+        expected = 0
+        for doc in documents:
+            entry = self._by_path.get(doc.file_path)
+            if (
+                entry is None
+                or entry["offset"] != expected
+                or entry["content_hash"] != getattr(doc, "content_hash", None)
+            ):
+                return False
+            expected += entry["n_chunks"]
+        return expected == self.matrix.shape[0]
+
+    def quantized(self, dtype: str) -> Optional[tuple]:
+        """Mapped ``(quantized matrix, scales)`` for ``dtype``, if stored."""
+        return self._quantized.get(dtype)
+
+
+class EmbeddingStore:
+    """
+    One ``<prefix>.embeddings.npy`` matrix and ``<prefix>.meta.json`` sidecar.
+
+    The prefix combines the embedding backend and model name so switching
+    models never serves incompatible vectors.
+    """
+
+    def __init__(self, directory: str, backend: str, model_name: str):
+        self.directory = directory
+        self.backend = backend
+        self.model_name = model_name
+        prefix = f"{_safe_name(backend)}.{_safe_name(model_name)}"
+        self.matrix_path = os.path.join(directory, f"{prefix}.embeddings.npy")
+        self.meta_path = os.path.join(directory, f"{prefix}.meta.json")
+        self._prefix = os.path.join(directory, prefix)
+
+    def quantized_paths(self, dtype: str) -> tuple:
+        """Paths of the ``dtype`` matrix and its per-row scales."""
+        return (
+            f"{self._prefix}.{dtype}.npy",
+            f"{self._prefix}.{dtype}.scales.npy",
+        )
+
+    def load(self) -> Optional[EmbeddingStoreSnapshot]:
+        """Open the store read-only and memory-mapped; None if absent/invalid."""
+        if not (
+            os.path.exists(self.matrix_path) and os.path.exists(self.meta_path)
+        ):
+            return None
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+            matrix = np.load(self.matrix_path, mmap_mode="r")
+        except Exception as e:
+            logger.warning(
+                "Failed to open embedding store %s: %s", self.matrix_path, e
+            )
+            return None
+
+        if (
+            metadata.get("format_version") != STORE_FORMAT_VERSION
+            or metadata.get("model_name") != self.model_name
+            or metadata.get("backend") != self.backend
+            or matrix.ndim != 2
+            or matrix.shape[0] != metadata.get("n_chunks")
+        ):
+            logger.warning(
+                "Ignoring stale embedding store %s", self.matrix_path
+            )
+            return None
+        return EmbeddingStoreSnapshot(
+            matrix, metadata, self._load_quantized(metadata, matrix.shape)
+        )
+
+    def _load_quantized(self, metadata: Dict, shape: tuple) -> Dict:
+        quantized = {}
+        for dtype in metadata.get("quantization", []):
+            matrix_path, scales_path = self.quantized_paths(dtype)
+            try:
+                matrix = np.load(matrix_path, mmap_mode="r")
+                scales = np.load(scales_path, mmap_mode="r")
+            except Exception as e:
+                logger.warning(
+                    "Failed to open %s embedding store: %s", dtype, e
+                )
+                continue
+            if matrix.shape == shape and scales.shape == (shape[0],):
+                quantized[dtype] = (matrix, scales)
+        return quantized
+
+    def save(
+        self, documents: Sequence, quantization: Optional[str] = None
+    ) -> None:
+        """
+        Write every document's embeddings as one normalized float32 matrix.
+
+        With ``quantization`` ("int8" or "float16") a quantized copy and its
+        per-row scales are written next to it. All files are replaced
+        atomically; processes that already mapped the previous matrix keep
+        reading it until they reload.
+        """
+        if quantization is not None and quantization not in QUANTIZATIONS:
+            raise ValueError(f"Unsupported quantization: {quantization}")
+        entries: List[Dict] = []
+        blocks = []
+        offset = 0
+        for doc in documents:
+            embeddings = np.asarray(doc.embeddings, dtype=np.float32)
+            embeddings = embeddings.reshape(len(doc.chunks), -1)
+            entries.append(
+                {
+                    "doc_id": doc.doc_id,
+                    "file_path": doc.file_path,
+                    "content_hash": getattr(doc, "content_hash", None),
+                    "offset": offset,
+                    "n_chunks": int(embeddings.shape[0]),
+                }
+            )
+            blocks.append(embeddings)
+            offset += embeddings.shape[0]
+
+        if blocks and offset:
+            matrix, _ = normalize_rows(np.concatenate(blocks, axis=0))
+        else:
+            matrix = np.zeros((0, 0), dtype=np.float32)
+
+        quantize = bool(quantization) and matrix.shape[0] > 0
+        metadata = {
+            "format_version": STORE_FORMAT_VERSION,
+            "model_name": self.model_name,
+            "backend": self.backend,
+            "dtype": "float32",
+            "normalized": True,
+            "dimension": int(matrix.shape[1]) if matrix.ndim == 2 else 0,
+            "n_chunks": int(matrix.shape[0]),
+            "documents": entries,
+            "quantization": [quantization] if quantize else [],
+        }
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            _atomic_write(self.matrix_path, lambda f: np.save(f, matrix))
+            if quantize:
+                quantized, scales = quantize_rows(matrix, quantization)
+                matrix_path, scales_path = self.quantized_paths(quantization)
+                _atomic_write(matrix_path, lambda f: np.save(f, quantized))
+                _atomic_write(scales_path, lambda f: np.save(f, scales))
+            _atomic_write(
+                self.meta_path,
+                lambda f: f.write(
+                    json.dumps(metadata, indent=2).encode("utf-8")
+                ),
+            )
+        except Exception as e:
+            raise RAGCacheError(
+                f"Failed to save embedding store {self.matrix_path}: {e}"
+            ) from e
@@ -1,10 +1,14 @@
 import numpy as np
-from typing import List, Union
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
 import logging
 import os
 import hashlib
+import re
+import threading
 import time
 import random
+from functools import lru_cache
 
 try:
     from sentence_transformers import SentenceTransformer
@@ -18,12 +22,192 @@ try:
 except Exception:
     RAGModelLoadError = RuntimeError
 
+DEFAULT_MODEL_NAME = "all-MiniLM-L6-v2"
+
+HASH_EMBEDDING_DIM = 384
+# Weight of each feature kind in the hash embedding
+_WORD_WEIGHT = 1.0
+_BIGRAM_WEIGHT = 0.5
+_TRIGRAM_WEIGHT = 0.25
+_HASH_WORD_RE = re.compile(r"[^\W_]+")
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+
+def _feature_hash(feature: str) -> int:
+    """Stable 32-bit hash of a feature (Python's ``hash`` is per-process)."""
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=4).digest()
+    return int.from_bytes(digest, byteorder="big", signed=False)
+
+
+@lru_cache(maxsize=1 << 16)
+def _word_features(word: str) -> Tuple[int, np.ndarray, np.ndarray]:
+    """
+    Hash of ``word`` plus the signed hashes and weights of its features.
+
+    A word contributes itself and its character trigrams (with ``<``/``>``
+    boundary markers), so related word forms share buckets.
+    """
+    padded = f"<{word}>"
+    features = [word] + [
+        "#" + padded[i : i + 3] for i in range(len(padded) - 2)
+    ]
+    hashes = np.array([_feature_hash(f) for f in features], dtype=np.uint64)
+    weights = np.full((len(features),), _TRIGRAM_WEIGHT)
+    weights[0] = _WORD_WEIGHT
+    return int(hashes[0]), hashes, weights
+
+
+def _mix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Combine two 32-bit hash arrays into a new well-mixed 32-bit hash."""
+    h = (a * np.uint64(0x9E3779B1) + b) & _MASK32
+    h ^= h >> np.uint64(16)
+    h = (h * np.uint64(0x85EBCA6B)) & _MASK32
+    h ^= h >> np.uint64(13)
+    return h
+
+
+def hash_embed_batch(
+    texts: List[str], dim: int = HASH_EMBEDDING_DIM
+) -> np.ndarray:
+    """
+    Signed feature-hashing embeddings for ``texts`` -> (N, dim) float32.
+
+    Words, adjacent word pairs and character trigrams are hashed to one of
+    ``dim`` buckets with a +/-1 sign, so texts sharing words or word
+    fragments get similar vectors. Feature hashes are computed once per
+    distinct word; all rows are then accumulated with a single
+    ``bincount`` and L2-normalized. Empty texts map to zero rows.
+    """
+    n = len(texts)
+    tokens: List[str] = []
+    text_lengths = np.zeros((n,), dtype=np.int64)
+    for i, text in enumerate(texts):
+        words = _HASH_WORD_RE.findall((text or "").lower())
+        if not words and text and text.strip():
+            # Punctuation-only text still gets a deterministic vector
+            words = [text.strip()]
+        tokens.extend(words)
+        text_lengths[i] = len(words)
+    if not tokens:
+        return np.zeros((n, dim), dtype=np.float32)
+    vocab = {word: i for i, word in enumerate(dict.fromkeys(tokens))}
+
+    entries = [_word_features(word) for word in vocab]
+    word_hash = np.array([e[0] for e in entries], dtype=np.uint64)
+    lengths = np.array([len(e[1]) for e in entries], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    feat_hash = np.concatenate([e[1] for e in entries])
+    feat_weight = np.concatenate([e[2] for e in entries])
+
+    ids = np.fromiter(map(vocab.__getitem__, tokens), np.int64, len(tokens))
+    rows = np.repeat(np.arange(n), text_lengths)
+
+    # Word and trigram features: count each (row, word) pair once, then
+    # expand it into that word's features
+    pairs, counts = np.unique(rows * len(vocab) + ids, return_counts=True)
+    pair_rows, pair_ids = np.divmod(pairs, len(vocab))
+    sizes = lengths[pair_ids]
+    total = int(sizes.sum())
+    starts = np.repeat(offsets[pair_ids] - (np.cumsum(sizes) - sizes), sizes)
+    feature_idx = starts + np.arange(total)
+    hashes = [feat_hash[feature_idx]]
+    hash_rows = [np.repeat(pair_rows, sizes)]
+    values = [np.repeat(counts, sizes) * feat_weight[feature_idx]]
+
+    # Word bigrams, hashed from the two word hashes without building strings
+    same_row = rows[1:] == rows[:-1]
+    if same_row.any():
+        hashes.append(
+            _mix(word_hash[ids[:-1][same_row]], word_hash[ids[1:][same_row]])
+        )
+        hash_rows.append(rows[1:][same_row])
+        values.append(np.full((int(same_row.sum()),), _BIGRAM_WEIGHT))
+
+    hashes = np.concatenate(hashes)
+    signs = np.where(hashes & np.uint64(0x80000000), -1.0, 1.0)
+    flat = np.concatenate(hash_rows) * dim + (
+        hashes % np.uint64(dim)
+    ).astype(np.int64)
+    out = np.bincount(
+        flat, weights=signs * np.concatenate(values), minlength=n * dim
+    ).reshape(n, dim)
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    return (out / np.where(norms > 0, norms, 1.0)).astype(np.float32)
+
+
+class EmbeddingCache:
+    """
+    Thread-safe bounded LRU cache of embeddings with optional TTL.
+
+    Keys are (model_name, backend, normalized text); values are stored as
+    private copies and handed out as copies so callers cannot mutate them.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 0.0):
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self._data: "OrderedDict[Tuple[str, str, str], Tuple[float, np.ndarray]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[np.ndarray]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and self.ttl_seconds:
+                if time.monotonic() - item[0] > self.ttl_seconds:
+                    del self._data[key]
+                    self.evictions += 1
+                    item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1].copy()
+
+    def put(self, key: Tuple[str, str, str], value: np.ndarray) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic(), np.array(value, copy=True))
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
 
 class EmbeddingsService:
     """Embeddings service with graceful fallbacks for SEVDO frontend RAG"""
 
     def __init__(
-        self, model_name: str = "all-MiniLM-L6-v2", strategy: str = None
+        self,
+        model_name: str = DEFAULT_MODEL_NAME,
+        strategy: str = None,
+        cache_size: int = None,
+        cache_ttl: float = None,
     ):
         """
         Initialize the embeddings backend.
@@ -32,8 +216,20 @@ class EmbeddingsService:
             model_name: Name of the Sentence-Transformers model
             strategy: Optional backend strategy. One of: "auto", "st", "hash".
                       Defaults to env RAG_EMBEDDING_STRATEGY or "auto".
+            cache_size: Max cached query embeddings (0 disables). Defaults to
+                        env RAG_EMBEDDING_CACHE_SIZE or 1024.
+            cache_ttl: Cache entry lifetime in seconds (0 = no expiry).
+                       Defaults to env RAG_EMBEDDING_CACHE_TTL or 0.
         """
         self.model_name = model_name
+        self.cache = EmbeddingCache(
+            cache_size
+            if cache_size is not None
+            else int(os.getenv("RAG_EMBEDDING_CACHE_SIZE", "1024")),
+            cache_ttl
+            if cache_ttl is not None
+            else float(os.getenv("RAG_EMBEDDING_CACHE_TTL", "0")),
+        )
         self.model = None
         self.backend = None  # "st" or "hash"
         self.strategy = (
@@ -63,7 +259,7 @@ class EmbeddingsService:
             # Provide a lightweight dummy model to satisfy callers/tests
             class _DummyModel:
                 def get_sentence_embedding_dimension(self_inner):
-                    return 384
+                    return HASH_EMBEDDING_DIM
 
             self.model = _DummyModel()
 
@@ -98,68 +294,98 @@ class EmbeddingsService:
 
     def _hash_embed(self, text: str) -> np.ndarray:
         """Deterministic hashing-based embedding as a lightweight fallback (384-dim)."""
-        if not text:
-            return np.zeros((384,), dtype=np.float32)
-        # Seed from stable hash of text
-        digest = hashlib.sha256(text.encode("utf-8")).digest()
-        seed = int.from_bytes(digest[:8], byteorder="big", signed=False)
-        rng = np.random.default_rng(seed)
-        vec = rng.standard_normal(384, dtype=np.float32)
-        norm = np.linalg.norm(vec)
-        if norm == 0:
-            return vec
-        return vec / norm
+        return hash_embed_batch([text])[0]
+
+    def _cache_key(self, text: str) -> Tuple[str, str, str]:
+        return (self.model_name, self.backend, " ".join(text.split()))
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Encode non-empty texts with the active backend -> (N, dim)."""
+        if self.backend == "st":
+            if not self.model:
+                raise RuntimeError("Model not loaded")
+            return np.asarray(self.model.encode(texts))
+        # hash fallback
+        return hash_embed_batch(texts)
 
     def generate_embedding(self, text: str) -> np.ndarray:
         """Generate embedding for a single text"""
         if not text or not text.strip():
             raise ValueError("Text cannot be empty")
 
+        use_cache = self.cache.enabled
+        if use_cache:
+            cached = self.cache.get(self._cache_key(text))
+            if cached is not None:
+                return cached
+
         if self.backend == "st":
             if not self.model:
                 raise RuntimeError("Model not loaded")
             embedding = self.model.encode(text)
-            return embedding
-        # hash fallback
-        return self._hash_embed(text)
+        else:
+            # hash fallback
+            embedding = self._hash_embed(text)
 
-    def generate_batch_embeddings(self, texts: List[str]) -> np.ndarray:
-        """Generate embeddings for multiple texts efficiently"""
+        if use_cache:
+            self.cache.put(self._cache_key(text), embedding)
+        return embedding
+
+    def generate_batch_embeddings(
+        self, texts: List[str], use_cache: bool = True
+    ) -> np.ndarray:
+        """Generate embeddings for multiple texts efficiently.
+
+        With ``use_cache`` only texts missing from the query-embedding cache
+        are encoded. Pass ``use_cache=False`` for bulk document chunks so they
+        do not evict hot queries.
+        """
         if not texts:
             raise ValueError("Texts list cannot be empty")
 
         valid_mask = [bool(text and text.strip()) for text in texts]
-        valid_texts = [text for text, keep in zip(texts, valid_mask) if keep]
-        if len(valid_texts) != len(texts):
+        valid_count = sum(valid_mask)
+        if valid_count != len(texts):
             logging.warning(
-                f"Filtered out {len(texts) - len(valid_texts)} empty texts"
+                f"Filtered out {len(texts) - valid_count} empty texts"
             )
 
-        if self.backend == "st":
-            if not self.model:
-                raise RuntimeError("Model not loaded")
-            valid_embeddings = self.model.encode(valid_texts)
-            # If there were filtered entries, re-align to original indices with zeros
-            if len(valid_texts) != len(texts):
-                dim = valid_embeddings.shape[1]
-                out = np.zeros((len(texts), dim), dtype=valid_embeddings.dtype)
-                j = 0
-                for i, keep in enumerate(valid_mask):
-                    if keep:
-                        out[i] = valid_embeddings[j]
-                        j += 1
-                return out
-            return valid_embeddings
-
-        # hash fallback
-        out = np.zeros((len(texts), 384), dtype=np.float32)
-        j = 0
+        use_cache = use_cache and self.cache.enabled
+        rows: Dict[int, np.ndarray] = {}
+        pending: List[int] = []
         for i, keep in enumerate(valid_mask):
-            if keep:
-                out[i] = self._hash_embed(valid_texts[j])
-                j += 1
+            if not keep:
+                continue
+            cached = self.cache.get(self._cache_key(texts[i])) if use_cache else None
+            if cached is not None:
+                rows[i] = cached
             else:
-                out[i] = np.zeros((384,), dtype=np.float32)
+                pending.append(i)
+
+        encoded = None
+        if pending:
+            encoded = self._encode([texts[i] for i in pending])
+            for j, i in enumerate(pending):
+                rows[i] = encoded[j]
+                if use_cache:
+                    self.cache.put(self._cache_key(texts[i]), encoded[j])
+
+        if encoded is not None and len(pending) == len(texts):
+            return encoded
+
+        # Re-align to original indices, zeros for filtered entries
+        dim = self.get_embedding_dimension()
+        if encoded is not None:
+            dtype = encoded.dtype
+            dim = encoded.shape[1]
+        elif rows:
+            first = next(iter(rows.values()))
+            dtype, dim = first.dtype, first.shape[0]
+        else:
+            dtype = np.float32
+        out = np.zeros((len(texts), dim), dtype=dtype)
+        for i, row in rows.items():
+            out[i] = row
         return out
 
     def get_embedding_dimension(self) -> int:
@@ -169,7 +395,7 @@ class EmbeddingsService:
                 return 0
             return self.model.get_sentence_embedding_dimension()
         # hash fallback dimension
-        return 384
+        return HASH_EMBEDDING_DIM
 
     def get_model_info(self) -> dict:
         """Get information about the loaded model"""
@@ -184,6 +410,7 @@ class EmbeddingsService:
             else None,
             "backend": self.backend,
             "strategy": self.strategy,
+            "query_cache": self.cache.stats(),
         }
 
     def compute_similarity(
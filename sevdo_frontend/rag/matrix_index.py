@@ -0,0 +1,366 @@
+"""
+Contiguous chunk-embedding matrix used by the vectorized search engine.
+
+All chunk embeddings of the knowledge base are stacked into one
+pre-normalized float32 matrix so a query is scored with a single
+matrix-vector product instead of a per-chunk Python loop.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Return the indices of the ``k`` highest scores, best first.
+
+    Uses ``argpartition`` so only the selected candidates are sorted. Ties
+    are broken by ascending index, matching a stable descending sort.
+    """
+    n = scores.shape[0]
+    if k <= 0 or n == 0:
+        return np.empty((0,), dtype=np.int64)
+    if k < n:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(n)
+    # lexsort: last key is primary -> score desc, then index asc
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order]
+
+
+def normalize_rows(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    L2-normalize the rows of ``matrix`` as contiguous float32.
+
+    Returns the normalized matrix and a boolean mask of rows whose norm was
+    non-zero (zero rows are left as zeros).
+    """
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1)
+    valid = norms > 0
+    safe = np.where(valid, norms, 1.0).astype(np.float32)
+    return np.ascontiguousarray(matrix / safe[:, None]), valid
+
+
+def cosine_to_unit(cosine: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Map cosine scores from [-1, 1] to [0, 1]; invalid rows score 0.0."""
+    return np.where(valid, (cosine + 1.0) / 2.0, 0.0)
+
+
+# Rows scored per block on quantized matrices, bounding float32 temporaries
+QUANTIZED_BLOCK_ROWS = 8192
+QUANTIZATIONS = {"int8", "float16"}
+
+
+def quantize_rows(
+    matrix: np.ndarray, dtype: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Quantize a row-normalized matrix to ``int8`` or ``float16``.
+
+    Returns the quantized matrix and per-row float32 scale factors, such
+    that ``row ~= quantized_row * scale``. Zero rows get scale 0.0.
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    max_abs = np.abs(matrix).max(axis=1)
+    nonzero = max_abs > 0
+    if dtype == "int8":
+        scales = np.where(nonzero, max_abs / 127.0, 0.0).astype(np.float32)
+        safe = np.where(nonzero, scales, 1.0)[:, None]
+        quantized = np.clip(np.rint(matrix / safe), -127, 127).astype(np.int8)
+    elif dtype == "float16":
+        quantized = matrix.astype(np.float16)
+        scales = nonzero.astype(np.float32)
+    else:
+        raise ValueError(f"Unsupported quantization: {dtype}")
+    return np.ascontiguousarray(quantized), scales
+
+
+class ChunkMatrix:
+    """
+    Immutable snapshot of every chunk embedding in the knowledge base.
+
+    Attributes:
+        matrix: (n_chunks, dim) rows L2-normalized; float32, or int8/float16
+                when ``quantization`` is set
+        scales: (n_chunks,) per-row scale factors of a quantized matrix
+        valid: (n_chunks,) bool, False for zero-norm chunk embeddings
+        chunk_doc: (n_chunks,) document index of each chunk
+        doc_offsets: (n_docs + 1,) start offset of each document's chunks
+        rerank: number of top quantized candidates re-scored exactly
+        exact: normalized float32 rows read by the exact re-rank, usually
+               the memory-mapped embedding store; None reads the documents'
+               ``embeddings`` instead
+
+    Quantizing drops the float32 scoring matrix. The float32 rows the
+    re-rank needs are not copied: they stay memory-mapped when the matrix
+    comes from the embedding store, otherwise they are the documents' own
+    embeddings, which the service keeps for reindexing anyway.
+    """
+
+    __slots__ = (
+        "matrix",
+        "valid",
+        "chunk_doc",
+        "doc_offsets",
+        "documents",
+        "ann",
+        "quantization",
+        "scales",
+        "rerank",
+        "exact",
+        "_sources",
+    )
+
+    def __init__(self, documents: Sequence, embeddings: List[np.ndarray]):
+        self._init_layout(documents, [len(e) for e in embeddings])
+        self._sources = list(embeddings)
+        if self.doc_offsets[-1] == 0:
+            self.matrix = np.zeros((0, 0), dtype=np.float32)
+            self.valid = np.zeros((0,), dtype=bool)
+        else:
+            stacked = np.concatenate(
+                [np.asarray(e, dtype=np.float32).reshape(len(e), -1)
+                 for e in embeddings if len(e)],
+                axis=0,
+            )
+            self.matrix, self.valid = normalize_rows(stacked)
+
+    def _init_layout(self, documents: Sequence, counts: List[int]) -> None:
+        self.documents = list(documents)
+        self.ann = None
+        self.quantization = None
+        self.scales = None
+        self.rerank = 0
+        self.exact = None
+        counts = np.array(counts, dtype=np.int64)
+        self.doc_offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.doc_offsets[1:])
+        self.chunk_doc = np.repeat(np.arange(len(counts)), counts)
+
+    @classmethod
+    def from_documents(cls, documents: Sequence) -> "ChunkMatrix":
+        """Build the matrix from documents whose embeddings are populated."""
+        matrix = cls(documents, [np.asarray(d.embeddings) for d in documents])
+        matrix._sources = [d.embeddings for d in documents]
+        return matrix
+
+    @classmethod
+    def from_normalized(
+        cls, documents: Sequence, matrix: np.ndarray
+    ) -> "ChunkMatrix":
+        """
+        Wrap an already row-normalized float32 matrix without copying it.
+
+        Used with the memory-mapped embedding store, whose rows are stored
+        normalized and in document order; each document's ``embeddings`` must
+        be its slice of ``matrix``.
+        """
+        self = cls.__new__(cls)
+        self._init_layout(documents, [len(d.chunks) for d in documents])
+        self._sources = [d.embeddings for d in documents]
+        self.matrix = matrix
+        self.exact = matrix
+        self.valid = (
+            np.linalg.norm(matrix, axis=1) > 0
+            if matrix.shape[0]
+            else np.zeros((0,), dtype=bool)
+        )
+        return self
+
+    @classmethod
+    def from_quantized(
+        cls,
+        documents: Sequence,
+        quantized: np.ndarray,
+        scales: np.ndarray,
+        dtype: str,
+        exact: Optional[np.ndarray] = None,
+    ) -> "ChunkMatrix":
+        """
+        Wrap a (possibly memory-mapped) quantized matrix and its scales.
+
+        ``exact`` is the normalized float32 matrix the re-rank reads from.
+        """
+        self = cls.__new__(cls)
+        self._init_layout(documents, [len(d.chunks) for d in documents])
+        self._sources = [d.embeddings for d in documents]
+        self.exact = exact
+        self.matrix = quantized
+        self.scales = np.asarray(scales, dtype=np.float32)
+        self.quantization = dtype
+        self.valid = self.scales > 0
+        return self
+
+    def quantize(self, dtype: str) -> None:
+        """Replace the float32 matrix with an int8/float16 copy.
+
+        ``exact`` is kept when set (it is memory-mapped, not a private copy).
+        """
+        if self.quantization is not None or self.n_chunks == 0:
+            return
+        self.matrix, self.scales = quantize_rows(self.matrix, dtype)
+        self.quantization = dtype
+
+    def is_current(self, documents: Sequence) -> bool:
+        """True if built from exactly these documents and embedding arrays."""
+        if len(documents) != len(self.documents):
+            return False
+        return all(
+            doc is own and doc.embeddings is src
+            for doc, own, src in zip(documents, self.documents, self._sources)
+        )
+
+    @property
+    def n_chunks(self) -> int:
+        return int(self.matrix.shape[0])
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the scoring matrix (plus scales if quantized)."""
+        extra = self.scales.nbytes if self.scales is not None else 0
+        return int(self.matrix.nbytes + extra)
+
+    def chunk_scores(self, query_embedding: np.ndarray) -> np.ndarray:
+        """Score every chunk against one query, in [0, 1]."""
+        return self.chunk_scores_many(
+            np.asarray(query_embedding).reshape(1, -1)
+        )[0]
+
+    def chunk_scores_many(self, query_embeddings: np.ndarray) -> np.ndarray:
+        """Score every chunk against a batch of queries -> (n_queries, n_chunks)."""
+        queries, q_valid = normalize_rows(query_embeddings)
+        if self.n_chunks == 0:
+            return np.zeros((queries.shape[0], 0), dtype=np.float32)
+        if self.ann is not None:
+            scores = self._ann_scores(queries, q_valid)
+        else:
+            cosine = self._cosine(queries)
+            valid = q_valid[:, None] & self.valid[None, :]
+            scores = cosine_to_unit(cosine, valid)
+        if self.quantization is not None and self.rerank > 0:
+            self._rerank_exact(scores, queries, q_valid)
+        return scores
+
+    def _cosine(self, queries: np.ndarray) -> np.ndarray:
+        """Cosine of every row with every query -> (n_queries, n_chunks)."""
+        if self.quantization is None:
+            return queries @ self.matrix.T
+        out = np.empty((queries.shape[0], self.n_chunks), dtype=np.float32)
+        for start in range(0, self.n_chunks, QUANTIZED_BLOCK_ROWS):
+            end = min(start + QUANTIZED_BLOCK_ROWS, self.n_chunks)
+            block = self.matrix[start:end].astype(np.float32)
+            out[:, start:end] = (queries @ block.T) * self.scales[start:end]
+        return out
+
+    def _ann_scores(
+        self, queries: np.ndarray, q_valid: np.ndarray
+    ) -> np.ndarray:
+        """Score only ANN candidate chunks; all others get -inf."""
+        out = np.full((queries.shape[0], self.n_chunks), -np.inf)
+        for row, query, ok in zip(out, queries, q_valid):
+            ids = self.ann.candidates(query)
+            cosine = self.matrix[ids].astype(np.float32) @ query
+            if self.scales is not None:
+                cosine = cosine * self.scales[ids]
+            row[ids] = cosine_to_unit(cosine, self.valid[ids] & ok)
+        return out
+
+    def _exact_rows(self, ids: np.ndarray) -> np.ndarray:
+        """Normalized float32 embeddings of chunks ``ids``."""
+        if self.exact is not None:
+            return np.asarray(self.exact[ids], dtype=np.float32)
+        doc_idx = self.chunk_doc[ids]
+        local = ids - self.doc_offsets[doc_idx]
+        rows = np.stack(
+            [
+                np.asarray(self.documents[d].embeddings[i], dtype=np.float32)
+                for d, i in zip(doc_idx, local)
+            ]
+        )
+        return normalize_rows(rows)[0]
+
+    def _rerank_exact(
+        self, scores: np.ndarray, queries: np.ndarray, q_valid: np.ndarray
+    ) -> None:
+        """Re-score each query's top ``rerank`` candidates with float32."""
+        for row, query, ok in zip(scores, queries, q_valid):
+            ids = top_k_indices(row, self.rerank)
+            ids = ids[row[ids] != -np.inf]
+            if ids.size == 0:
+                continue
+            row[ids] = cosine_to_unit(
+                self._exact_rows(ids) @ query, self.valid[ids] & ok
+            )
+
+    def doc_scores(self, chunk_scores: np.ndarray) -> np.ndarray:
+        """Max chunk score per document (0.0 for documents without chunks)."""
+        return doc_max_scores(self.doc_offsets, chunk_scores)
+
+    def rank(
+        self,
+        chunk_scores: np.ndarray,
+        top_k: int,
+        chunks_per_doc: int = 3,
+        doc_scores: Optional[np.ndarray] = None,
+    ) -> List[Tuple[int, float, List[Tuple[int, float]]]]:
+        """Pick the ``top_k`` documents and their best chunks.
+
+        See ``rank_documents``.
+        """
+        return rank_documents(
+            self.doc_offsets, chunk_scores, top_k, chunks_per_doc, doc_scores
+        )
+
+
+def doc_max_scores(
+    doc_offsets: np.ndarray, chunk_scores: np.ndarray
+) -> np.ndarray:
+    """Max chunk score per document (0.0 for documents without chunks)."""
+    out = np.zeros((len(doc_offsets) - 1,), dtype=np.float64)
+    if chunk_scores.shape[0] == 0:
+        return out
+    counts = np.diff(doc_offsets)
+    nonempty = counts > 0
+    out[nonempty] = np.maximum.reduceat(
+        chunk_scores, doc_offsets[:-1][nonempty]
+    )
+    return out
+
+
+def rank_documents(
+    doc_offsets: np.ndarray,
+    chunk_scores: np.ndarray,
+    top_k: int,
+    chunks_per_doc: int = 3,
+    doc_scores: Optional[np.ndarray] = None,
+) -> List[Tuple[int, float, List[Tuple[int, float]]]]:
+    """
+    Pick the ``top_k`` documents and their best chunks.
+
+    ``doc_offsets`` gives each document's chunk range in ``chunk_scores``.
+    Returns a list of ``(doc_index, doc_score, [(chunk_index, score), ...])``
+    where chunk indices are local to the document.
+    """
+    if doc_scores is None:
+        doc_scores = doc_max_scores(doc_offsets, chunk_scores)
+    ranked = []
+    for d in top_k_indices(doc_scores, top_k):
+        # -inf marks documents/chunks an ANN index never scored
+        if doc_scores[d] == -np.inf:
+            continue
+        start, end = doc_offsets[d], doc_offsets[d + 1]
+        local = chunk_scores[start:end]
+        best = top_k_indices(local, chunks_per_doc)
+        ranked.append(
+            (
+                int(d),
+                float(doc_scores[d]),
+                [(int(i), float(local[i])) for i in best if local[i] != -np.inf],
+            )
+        )
+    return ranked
@@ -0,0 +1,206 @@
+"""
+Process-wide registry of shared SimilaritySearchService instances.
+
+Loading the embedding model, reading and chunking the knowledge base and
+loading cached embeddings is expensive, so every caller in a process shares
+one warmed-up service per (knowledge base path, model name). Services are
+built lazily on first use; concurrent callers (threads or asyncio tasks via
+``aget``) wait for the same warm-up instead of starting their own. A failed
+warm-up is retried by the next caller once ``RAG_WARMUP_RETRY_SECONDS``
+(default 30) have passed.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .embeddings import DEFAULT_MODEL_NAME
+from .similarity_search import SimilaritySearchService
+
+logger = logging.getLogger(__name__)
+
+RegistryKey = Tuple[str, str]
+
+
+class _RegistryEntry:
+    """One shared service and its warm-up state."""
+
+    def __init__(self, knowledge_base_dir: str, model_name: str):
+        self.knowledge_base_dir = knowledge_base_dir
+        self.model_name = model_name
+        self.service: Optional[SimilaritySearchService] = None
+        self.initialized = False
+        self.error: Optional[str] = None
+        self.warmup_started_at: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+        self.failed_at: Optional[float] = None
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+
+    def _backing_off(self) -> bool:
+        """Whether the last warm-up failed too recently to retry."""
+        if self.failed_at is None:
+            return False
+        retry_after = float(os.getenv("RAG_WARMUP_RETRY_SECONDS", "30"))
+        return time.monotonic() - self.failed_at < retry_after
+
+    def warm_up(self) -> None:
+        """
+        Build and initialize the service once; later calls return at once.
+
+        After a failure, calls return at once until the retry backoff has
+        passed and the next call tries again.
+        """
+        if self.done.is_set() or self._backing_off():
+            return
+        with self.lock:
+            if self.done.is_set() or self._backing_off():
+                return
+            self.warmup_started_at = time.time()
+            start = time.perf_counter()
+            try:
+                service = SimilaritySearchService(
+                    self.knowledge_base_dir, model_name=self.model_name
+                )
+                self.initialized = service.initialize()
+                self.service = service
+                if self.initialized and os.getenv(
+                    "RAG_WATCH_KB", "0"
+                ).lower() in {"1", "true", "yes"}:
+                    service.start_watcher()
+                if not self.initialized:
+                    logger.warning(
+                        "Shared RAG service for %s did not initialize",
+                        self.knowledge_base_dir,
+                    )
+            except Exception as e:
+                self.initialized = False
+                self.error = str(e)
+                logger.error(
+                    "Failed to warm up shared RAG service for %s: %s",
+                    self.knowledge_base_dir,
+                    e,
+                )
+            self.warmup_seconds = time.perf_counter() - start
+            if not self.initialized:
+                self.failed_at = time.monotonic()
+                return
+            self.error = None
+            self.failed_at = None
+            self.done.set()
+            logger.info(
+                "Shared RAG service for %s warmed up in %.2fs",
+                self.knowledge_base_dir,
+                self.warmup_seconds,
+            )
+
+    def status(self) -> Dict:
+        return {
+            "knowledge_base_dir": self.knowledge_base_dir,
+            "model_name": self.model_name,
+            "ready": self.done.is_set() and self.initialized,
+            "warming_up": self.lock.locked() and not self.done.is_set(),
+            "backing_off": self._backing_off(),
+            "initialized": self.initialized,
+            "error": self.error,
+            "warmup_started_at": self.warmup_started_at,
+            "warmup_seconds": self.warmup_seconds,
+        }
+
+
+class RAGRegistry:
+    """Thread-safe registry of shared search services."""
+
+    def __init__(self):
+        self._entries: Dict[RegistryKey, _RegistryEntry] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        knowledge_base_dir: str, model_name: Optional[str] = None
+    ) -> RegistryKey:
+        return (
+            os.path.abspath(knowledge_base_dir),
+            model_name or DEFAULT_MODEL_NAME,
+        )
+
+    def _entry(
+        self, knowledge_base_dir: str, model_name: Optional[str]
+    ) -> _RegistryEntry:
+        key = self.make_key(knowledge_base_dir, model_name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _RegistryEntry(*key)
+                self._entries[key] = entry
+            return entry
+
+    def get(
+        self, knowledge_base_dir: str, model_name: Optional[str] = None
+    ) -> Optional[SimilaritySearchService]:
+        """
+        Return the shared service, warming it up on first use.
+
+        Blocks while another thread is warming up the same service. Returns
+        None if construction failed; check ``is_ready`` for initialization.
+        A failed warm-up is retried once its backoff has passed.
+        """
+        entry = self._entry(knowledge_base_dir, model_name)
+        entry.warm_up()
+        return entry.service
+
+    async def aget(
+        self, knowledge_base_dir: str, model_name: Optional[str] = None
+    ) -> Optional[SimilaritySearchService]:
+        """Async variant of ``get`` that warms up off the event loop."""
+        entry = self._entry(knowledge_base_dir, model_name)
+        if not entry.done.is_set():
+            await asyncio.to_thread(entry.warm_up)
+        return entry.service
+
+    def warm_up(
+        self,
+        knowledge_base_dir: str,
+        model_name: Optional[str] = None,
+        background: bool = True,
+    ) -> Optional[threading.Thread]:
+        """Start warming up a service, in a daemon thread by default."""
+        entry = self._entry(knowledge_base_dir, model_name)
+        if not background:
+            entry.warm_up()
+            return None
+        thread = threading.Thread(
+            target=entry.warm_up, name="rag-warmup", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def is_ready(
+        self, knowledge_base_dir: str, model_name: Optional[str] = None
+    ) -> bool:
+        key = self.make_key(knowledge_base_dir, model_name)
+        with self._lock:
+            entry = self._entries.get(key)
+        return bool(entry and entry.done.is_set() and entry.initialized)
+
+    def status(self) -> List[Dict]:
+        """Readiness and warm-up timing of every registered service."""
+        with self._lock:
+            entries = list(self._entries.values())
+        return [entry.status() for entry in entries]
+
+    def clear(self) -> None:
+        """Forget all services (mainly for tests and explicit reloads)."""
+        with self._lock:
+            self._entries.clear()
+
+
+_registry = RAGRegistry()
+
+
+def get_registry() -> RAGRegistry:
+    """Return the process-wide registry."""
+    return _registry
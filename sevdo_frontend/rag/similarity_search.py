@@ -5,6 +5,8 @@ Handles document ingestion, embedding storage, and similarity queries.
 
 import os
 import glob
+import hashlib
+import threading
 from typing import List, Dict, Tuple, Optional
 import numpy as np
 from dataclasses import dataclass
@@ -18,6 +20,15 @@ try:
 except ImportError:
     EmbeddingsService = None
 
+from .matrix_index import QUANTIZATIONS, ChunkMatrix
+from .embedding_store import EmbeddingStore, EmbeddingStoreSnapshot
+from .ann_index import IVFIndex
+from .bm25_index import BM25Index, reciprocal_rank_fusion
+
+SEARCH_ENGINES = {"matrix", "loop"}
+ANN_INDEXES = {"none", "ivf"}
+RANKING_MODES = {"dense", "hybrid"}
+
 
 @dataclass
 class Document:
@@ -30,6 +41,7 @@ class Document:
     chunks: List[str]
     metadata: Dict
     embeddings: Optional[np.ndarray] = None
+    content_hash: Optional[str] = None
 
 
 @dataclass
@@ -50,19 +62,71 @@ class SimilaritySearchService:
     - Automatic embedding generation and caching
     - Fast cosine similarity search
     - Chunk-level similarity for better precision
+    - Vectorized "matrix" engine: one matrix-vector product per query
     """
 
-    def __init__(self, knowledge_base_dir: str = "knowledge_base_RAG"):
+    def __init__(
+        self,
+        knowledge_base_dir: str = "knowledge_base_RAG",
+        search_engine: str = None,
+        model_name: str = None,
+        ann: str = None,
+        ranking: str = None,
+        quantization: str = None,
+    ):
         """
         Initialize the similarity search service.
 
         Args:
             knowledge_base_dir: Directory containing markdown documents
+            search_engine: "matrix" (vectorized) or "loop" (per-chunk).
+                           Defaults to env RAG_SEARCH_ENGINE or "matrix".
+            model_name: Embedding model name; defaults to the
+                        EmbeddingsService default model.
+            ann: Approximate index for the matrix engine: "none" or "ivf".
+                 Defaults to env RAG_ANN or "none".
+            ranking: "dense" (cosine only) or "hybrid" (BM25 and cosine
+                     fused by reciprocal rank). Defaults to env RAG_RANKING
+                     or "dense".
+            quantization: Chunk matrix storage: "none" (float32), "int8"
+                          or "float16". Defaults to env RAG_QUANTIZATION
+                          or "none". The top RAG_RERANK (default 32)
+                          candidates are re-scored from float32 rows: with
+                          RAG_CACHE these are memory-mapped from the
+                          embedding store, otherwise they are the documents'
+                          in-memory embeddings, so only the scoring matrix
+                          shrinks.
         """
         self.knowledge_base_dir = knowledge_base_dir
         self.documents: List[Document] = []
         self.embeddings_service = None
         self._is_loaded = False
+        self.search_engine = (
+            search_engine or os.getenv("RAG_SEARCH_ENGINE", "matrix")
+        ).lower()
+        if self.search_engine not in SEARCH_ENGINES:
+            self.search_engine = "matrix"
+        self._chunk_matrix: Optional[ChunkMatrix] = None
+        self.ann = (ann or os.getenv("RAG_ANN", "none")).lower()
+        if self.ann not in ANN_INDEXES:
+            self.ann = "none"
+        # IVF tuning: lists, probes per query, or a recall target that picks
+        # nprobe at build time; small indexes stay exact
+        self.ann_nlist = int(os.getenv("RAG_ANN_NLIST", "0")) or None
+        self.ann_nprobe = int(os.getenv("RAG_ANN_NPROBE", "8"))
+        self.ann_target_recall = float(os.getenv("RAG_ANN_TARGET_RECALL", "0"))
+        self.ann_min_chunks = int(os.getenv("RAG_ANN_MIN_CHUNKS", "1024"))
+        self.ranking = (ranking or os.getenv("RAG_RANKING", "dense")).lower()
+        if self.ranking not in RANKING_MODES:
+            self.ranking = "dense"
+        self._bm25: Optional[BM25Index] = None
+        self.quantization = (
+            quantization or os.getenv("RAG_QUANTIZATION", "none")
+        ).lower()
+        if self.quantization not in QUANTIZATIONS:
+            self.quantization = "none"
+        # Top quantized candidates re-scored with exact float32 embeddings
+        self.rerank_candidates = int(os.getenv("RAG_RERANK", "32"))
         # Feature flags via env
         self.enable_keyword_fallback = str(
             os.getenv("RAG_ENABLE_KEYWORD_FALLBACK", "0")
@@ -79,11 +143,27 @@ class SimilaritySearchService:
         }
         self._cache_hits = 0
         self._cache_misses = 0
+        self.index_dir = os.getenv("RAG_INDEX_DIR") or os.path.join(
+            knowledge_base_dir, ".rag_index"
+        )
+        self._store_snapshot: Optional[EmbeddingStoreSnapshot] = None
+        # file_path -> (mtime_ns, sha256 of raw content) for incremental reindex
+        self._file_state: Dict[str, Tuple[int, str]] = {}
+        # Bumped whenever the searchable documents change, so callers can
+        # tell results computed before a reindex from current ones
+        self.index_generation = 0
+        self._reindex_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._watcher_stop = threading.Event()
 
         # Try to initialize embeddings service
         if EmbeddingsService:
             try:
-                self.embeddings_service = EmbeddingsService()
+                self.embeddings_service = (
+                    EmbeddingsService(model_name)
+                    if model_name
+                    else EmbeddingsService()
+                )
                 logger.info(
                     "Embeddings service initialized for similarity search"
                 )
@@ -155,6 +235,37 @@ class SimilaritySearchService:
 
         return chunks
 
+    def _read_document(self, file_path: str) -> Tuple[Document, Tuple[int, str]]:
+        """Read, parse and chunk one markdown file.
+
+        Returns the document and its (mtime_ns, content hash) file state.
+        """
+        mtime_ns = os.stat(file_path).st_mtime_ns
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = f.read()
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+        # Parse frontmatter and content
+        metadata, main_content = self._parse_yaml_frontmatter(content)
+
+        # Create document
+        doc_id = metadata.get("doc_id", os.path.basename(file_path))
+        title = metadata.get("title", os.path.basename(file_path))
+
+        # Chunk content for better similarity matching
+        chunks = self._chunk_content(main_content)
+
+        document = Document(
+            doc_id=doc_id,
+            title=title,
+            file_path=file_path,
+            content=main_content,
+            chunks=chunks,
+            metadata=metadata,
+            content_hash=content_hash,
+        )
+        return document, (mtime_ns, content_hash)
+
     def load_documents(self) -> int:
         """
         Load all markdown documents from knowledge base directory.
@@ -170,7 +281,8 @@ class SimilaritySearchService:
             return 0
 
         pattern = os.path.join(self.knowledge_base_dir, "*.md")
-        md_files = glob.glob(pattern)
+        # Sorted so the on-disk embedding store lines up with document order
+        md_files = sorted(glob.glob(pattern))
 
         if not md_files:
             logger.warning(
@@ -184,36 +296,20 @@ class SimilaritySearchService:
 
         for file_path in md_files:
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                # Parse frontmatter and content
-                metadata, main_content = self._parse_yaml_frontmatter(content)
-
-                # Create document
-                doc_id = metadata.get("doc_id", os.path.basename(file_path))
-                title = metadata.get("title", os.path.basename(file_path))
-
-                # Chunk content for better similarity matching
-                chunks = self._chunk_content(main_content)
-
-                document = Document(
-                    doc_id=doc_id,
-                    title=title,
-                    file_path=file_path,
-                    content=main_content,
-                    chunks=chunks,
-                    metadata=metadata,
-                )
-
+                document, state = self._read_document(file_path)
                 self.documents.append(document)
+                self._file_state[file_path] = state
+                self._chunk_matrix = None
                 logger.info(
-                    "Loaded document '%s' with %d chunks", title, len(chunks)
+                    "Loaded document '%s' with %d chunks",
+                    document.title,
+                    len(document.chunks),
                 )
 
             except Exception as e:
                 logger.error("Error loading %s: %s", file_path, e)
 
+        self._bm25 = BM25Index(self.documents)
         self._is_loaded = True
         return len(self.documents)
 
@@ -235,139 +331,362 @@ class SimilaritySearchService:
         logger.info("Generating embeddings for documents and chunks...")
 
         try:
-            for i, doc in enumerate(self.documents):
-                # Generate embeddings for all chunks
-                chunk_texts = doc.chunks
-
-                # Try cache first
-                if self.enable_cache:
-                    cached = self._load_cached_embeddings(doc)
-                    if cached is not None and cached.shape[0] == len(
-                        chunk_texts
-                    ):
-                        doc.embeddings = cached
-                        self._cache_hits += 1
-                        logger.info(
-                            "Loaded cached embeddings for '%s' (%d chunks)",
-                            doc.title,
-                            len(chunk_texts),
-                        )
-                        continue
-                    else:
-                        self._cache_misses += 1
-
-                embeddings = self.embeddings_service.generate_batch_embeddings(
-                    chunk_texts
+            snapshot = self._open_store() if self.enable_cache else None
+            misses_before = self._cache_misses
+            for doc in self.documents:
+                self._embed_document(doc, snapshot)
+
+            if self.enable_cache and (
+                self._cache_misses != misses_before
+                or snapshot is None
+                or not snapshot.is_aligned(self.documents)
+            ):
+                snapshot = self._persist_store(self.documents)
+
+            self._chunk_matrix = None
+            if self.search_engine == "matrix":
+                self._chunk_matrix = self._build_matrix(
+                    self.documents, snapshot
                 )
+            self.index_generation += 1
 
-                # Store embeddings in document
-                doc.embeddings = np.array(embeddings)
+            logger.info(
+                "Successfully generated embeddings for %d documents",
+                len(self.documents),
+            )
+            return True
 
-                # Save to cache
-                if self.enable_cache:
-                    self._save_cached_embeddings(doc)
+        except Exception as e:
+            logger.error("Error generating embeddings: %s", e)
+            return False
 
+    def _embed_document(
+        self,
+        doc: Document,
+        snapshot: Optional[EmbeddingStoreSnapshot] = None,
+    ) -> None:
+        """Populate ``doc.embeddings`` from the store or the embeddings service."""
+        chunk_texts = doc.chunks
+
+        # Try the consolidated store first (content-addressed by file hash)
+        if self.enable_cache:
+            cached = (
+                snapshot.lookup(doc.file_path, doc.content_hash, len(chunk_texts))
+                if snapshot is not None
+                else None
+            )
+            if cached is not None:
+                doc.embeddings = cached
+                self._cache_hits += 1
                 logger.info(
-                    "Generated embeddings for '%s' (%d chunks)",
+                    "Loaded cached embeddings for '%s' (%d chunks)",
                     doc.title,
                     len(chunk_texts),
                 )
+                return
+            self._cache_misses += 1
+
+        # Chunks bypass the query-embedding cache so they don't evict queries
+        embeddings = self.embeddings_service.generate_batch_embeddings(
+            chunk_texts, use_cache=False
+        )
+
+        # Store embeddings in document
+        doc.embeddings = np.array(embeddings)
+
+        logger.info(
+            "Generated embeddings for '%s' (%d chunks)",
+            doc.title,
+            len(chunk_texts),
+        )
 
+    def reindex(self) -> Dict[str, List[str]]:
+        """
+        Incrementally sync the index with the knowledge base directory.
+
+        Files whose mtime is unchanged are skipped without being read; files
+        whose mtime changed are hashed and only re-chunked and re-embedded if
+        their content changed. Deleted files are dropped. The new document
+        list and chunk matrix are swapped in at the end, so concurrent
+        ``search`` calls keep using the previous snapshot meanwhile.
+
+        Returns:
+            Dict with "added", "updated", "removed" and "unchanged" file paths
+        """
+        summary: Dict[str, List[str]] = {
+            "added": [],
+            "updated": [],
+            "removed": [],
+            "unchanged": [],
+        }
+        with self._reindex_lock:
+            pattern = os.path.join(self.knowledge_base_dir, "*.md")
+            md_files = sorted(glob.glob(pattern))
+            current = {doc.file_path: doc for doc in self.documents}
+            file_state = dict(self._file_state)
+            new_documents: List[Document] = []
+
+            for file_path in md_files:
+                old_doc = current.get(file_path)
+                old_state = file_state.get(file_path)
+                try:
+                    if old_doc is not None and old_state is not None:
+                        mtime_ns = os.stat(file_path).st_mtime_ns
+                        if mtime_ns == old_state[0]:
+                            new_documents.append(old_doc)
+                            summary["unchanged"].append(file_path)
+                            continue
+
+                    document, state = self._read_document(file_path)
+                    if (
+                        old_doc is not None
+                        and old_state is not None
+                        and state[1] == old_state[1]
+                    ):
+                        # Touched but not modified
+                        file_state[file_path] = state
+                        new_documents.append(old_doc)
+                        summary["unchanged"].append(file_path)
+                        continue
+
+                    if self.embeddings_service:
+                        self._embed_document(document, self._store_snapshot)
+                    new_documents.append(document)
+                    file_state[file_path] = state
+                    summary["updated" if old_doc else "added"].append(
+                        file_path
+                    )
+                except Exception as e:
+                    logger.error("Error reindexing %s: %s", file_path, e)
+                    if old_doc is not None:
+                        new_documents.append(old_doc)
+
+            for file_path in current:
+                if file_path not in md_files:
+                    file_state.pop(file_path, None)
+                    summary["removed"].append(file_path)
+
+            changed = (
+                summary["added"] or summary["updated"] or summary["removed"]
+            )
+            if changed:
+                matrix = None
+                embedded = all(
+                    doc.embeddings is not None for doc in new_documents
+                )
+                snapshot = None
+                if self.enable_cache and embedded:
+                    snapshot = self._persist_store(new_documents)
+                if self.search_engine == "matrix" and embedded:
+                    matrix = self._build_matrix(new_documents, snapshot)
+                bm25 = BM25Index(new_documents)
+                # Swap documents before the indexes: a search in between sees
+                # stale indexes, rebuilds them from the new documents and is
+                # still correct.
+                self.documents = new_documents
+                self._chunk_matrix = matrix
+                self._bm25 = bm25
+                self.index_generation += 1
+            self._file_state = file_state
+            self._is_loaded = True
+
+        if changed:
             logger.info(
-                "Successfully generated embeddings for %d documents",
-                len(self.documents),
+                "Reindexed knowledge base: %d added, %d updated, %d removed",
+                len(summary["added"]),
+                len(summary["updated"]),
+                len(summary["removed"]),
             )
-            return True
+        return summary
 
-        except Exception as e:
-            logger.error("Error generating embeddings: %s", e)
-            return False
+    def start_watcher(self, interval: float = None) -> None:
+        """
+        Poll the knowledge base and ``reindex()`` in a daemon thread.
 
-    def _embedding_cache_path(self, document: Document) -> str:
-        base = document.file_path
-        model_info = (
-            self.embeddings_service.get_model_info()
-            if self.embeddings_service
-            else {"backend": "unknown", "model_name": "unknown"}
+        Args:
+            interval: Seconds between polls (env RAG_WATCH_INTERVAL or 5.0)
+        """
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        if interval is None:
+            interval = float(os.getenv("RAG_WATCH_INTERVAL", "5.0"))
+        self._watcher_stop.clear()
+
+        def _poll():
+            while not self._watcher_stop.wait(interval):
+                try:
+                    self.reindex()
+                except Exception as e:
+                    logger.error("Knowledge base watcher error: %s", e)
+
+        self._watcher = threading.Thread(
+            target=_poll, name="rag-kb-watcher", daemon=True
         )
-        backend = model_info.get("backend", "unknown")
-        model_name = (
-            model_info.get("model_name", "unknown")
-            .replace(os.sep, "_")
-            .replace("/", "_")
+        self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        """Stop the polling watcher started by ``start_watcher``."""
+        self._watcher_stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+    def _get_chunk_matrix(self) -> ChunkMatrix:
+        """Return the chunk matrix, rebuilding it if the documents changed."""
+        matrix = self._chunk_matrix
+        if matrix is None or not matrix.is_current(self.documents):
+            matrix = self._build_matrix(self.documents, self._store_snapshot)
+            self._chunk_matrix = matrix
+        return matrix
+
+    def _embedding_store(self) -> Optional[EmbeddingStore]:
+        if not self.embeddings_service:
+            return None
+        model_info = self.embeddings_service.get_model_info()
+        return EmbeddingStore(
+            self.index_dir,
+            str(model_info.get("backend", "unknown")),
+            str(model_info.get("model_name", "unknown")),
         )
-        return f"{base}.{backend}.{model_name}.chunks.npy"
 
-    def _load_cached_embeddings(
-        self, document: Document
-    ) -> Optional[np.ndarray]:
+    def _open_store(self) -> Optional[EmbeddingStoreSnapshot]:
+        """Memory-map the consolidated embedding store, if present."""
         try:
-            path = self._embedding_cache_path(document)
-            if os.path.exists(path):
-                arr = np.load(path)
-                return arr
+            store = self._embedding_store()
+            self._store_snapshot = store.load() if store else None
         except Exception as e:
-            logger.warning(
-                "Failed to load cache for %s: %s", document.title, e
-            )
-        return None
+            logger.warning("Failed to open embedding store: %s", e)
+            self._store_snapshot = None
+        return self._store_snapshot
 
-    def _save_cached_embeddings(self, document: Document) -> None:
+    def _persist_store(
+        self, documents: List[Document]
+    ) -> Optional[EmbeddingStoreSnapshot]:
+        """
+        Save ``documents`` as the consolidated store and re-map it.
+
+        On success every document's ``embeddings`` becomes a read-only view
+        into the memory-mapped matrix, so the process holds no private copy.
+        """
         try:
-            path = self._embedding_cache_path(document)
-            if document.embeddings is not None:
-                np.save(path, document.embeddings)
+            store = self._embedding_store()
+            if store is None:
+                return None
+            store.save(documents, self._quantization_dtype())
+            snapshot = store.load()
         except Exception as e:
-            logger.warning(
-                "Failed to save cache for %s: %s", document.title, e
+            logger.warning("Failed to save embedding store: %s", e)
+            return None
+        if snapshot is None or not snapshot.is_aligned(documents):
+            return None
+        for doc in documents:
+            doc.embeddings = snapshot.lookup(
+                doc.file_path, doc.content_hash, len(doc.chunks)
             )
+        self._store_snapshot = snapshot
+        return snapshot
+
+    def _build_matrix(
+        self,
+        documents: List[Document],
+        snapshot: Optional[EmbeddingStoreSnapshot] = None,
+    ) -> ChunkMatrix:
+        """Build the chunk matrix (and ANN index, if enabled).
+
+        Uses the mapped store matrix directly when it matches ``documents``,
+        including its quantized copy when quantization is enabled. A
+        quantized matrix holds no float32 copy of its own: the exact
+        re-rank reads the mapped store rows, or the documents' embeddings
+        without a store, and the ANN index drops its float32 rows once built.
+        """
+        dtype = self._quantization_dtype()
+        aligned = snapshot is not None and snapshot.is_aligned(documents)
+        stored = snapshot.quantized(dtype) if aligned and dtype else None
+        if stored is not None:
+            matrix = ChunkMatrix.from_quantized(
+                documents, *stored, dtype, exact=snapshot.matrix
+            )
+        elif aligned:
+            matrix = ChunkMatrix.from_normalized(documents, snapshot.matrix)
+        else:
+            matrix = ChunkMatrix.from_documents(documents)
+        if self.ann == "ivf" and matrix.n_chunks >= self.ann_min_chunks:
+            # Cluster on float32 rows; quantized scoring reuses the lists
+            matrix.ann = self._build_ann(
+                snapshot.matrix if stored is not None else matrix.matrix
+            )
+        if dtype:
+            matrix.quantize(dtype)
+            matrix.rerank = self.rerank_candidates
+            if matrix.ann is not None:
+                # Scoring uses only its lists; the rows are float32
+                matrix.ann.release_vectors()
+        return matrix
+
+    def _quantization_dtype(self) -> Optional[str]:
+        return None if self.quantization == "none" else self.quantization
+
+    def _build_ann(self, vectors: np.ndarray) -> IVFIndex:
+        index = IVFIndex(
+            vectors, nlist=self.ann_nlist, nprobe=self.ann_nprobe
+        ).build()
+        if self.ann_target_recall > 0:
+            index.tune(self.ann_target_recall)
+        logger.info("Built ANN index: %s", index.info())
+        return index
+
+    def rebuild_ann(self) -> bool:
+        """Rebuild the ANN index over the current chunk matrix.
 
-    def _tokenize(self, text: str) -> List[str]:
-        return [
-            tok
-            for tok in "".join(
-                [c.lower() if c.isalnum() else " " for c in text]
-            ).split()
-            if tok
-        ]
-
-    def _keyword_overlap_score(
-        self, query_tokens: List[str], chunk: str
-    ) -> float:
-        chunk_tokens = self._tokenize(chunk)
-        if not chunk_tokens:
-            return 0.0
-        qset = set(query_tokens)
-        cset = set(chunk_tokens)
-        intersection = len(qset.intersection(cset))
-        union = len(qset.union(cset))
-        if union == 0:
-            return 0.0
-        return float(intersection) / float(union)
+        Returns:
+            True if an ANN index is now in use
+        """
+        if self.ann == "none" or not self.documents:
+            return False
+        matrix = self._get_chunk_matrix()
+        if matrix.quantization is not None:
+            matrix = self._build_matrix(self.documents, self._store_snapshot)
+            self._chunk_matrix = matrix
+        elif matrix.n_chunks >= self.ann_min_chunks:
+            matrix.ann = self._build_ann(matrix.matrix)
+        return matrix.ann is not None
+
+    def _get_bm25(self) -> BM25Index:
+        """Return the BM25 index, rebuilding it if the documents changed."""
+        index = self._bm25
+        if index is None or not index.is_current(self.documents):
+            index = BM25Index(self.documents)
+            self._bm25 = index
+        return index
 
     def _search_with_keywords(
         self, query: str, top_k: int = 5
     ) -> List[SearchResult]:
+        """BM25 keyword search over the precomputed inverted index.
+
+        Scores are divided by the best chunk score, so they fall in [0, 1].
+        """
         logger.info("Running keyword-based fallback search")
-        query_tokens = self._tokenize(query)
+        index = self._get_bm25()
+        chunk_scores = index.chunk_scores(query)
+        best = chunk_scores.max() if chunk_scores.size else 0.0
+        if best > 0:
+            chunk_scores = chunk_scores / best
         results: List[SearchResult] = []
-        for doc in self.documents:
-            chunk_scores: List[Tuple[str, float]] = []
-            for chunk in doc.chunks:
-                score = self._keyword_overlap_score(query_tokens, chunk)
-                if score > 0:
-                    chunk_scores.append((chunk, score))
-            chunk_scores.sort(key=lambda x: x[1], reverse=True)
-            doc_score = chunk_scores[0][1] if chunk_scores else 0.0
+        for doc_idx, doc_score, chunks in index.rank(chunk_scores, top_k):
+            doc = index.documents[doc_idx]
             results.append(
                 SearchResult(
                     document=doc,
-                    similarity_score=float(doc_score),
-                    matching_chunks=chunk_scores[:3],
+                    similarity_score=doc_score,
+                    matching_chunks=[
+                        (doc.chunks[i], score)
+                        for i, score in chunks
+                        if score > 0
+                    ],
                 )
             )
-        results.sort(key=lambda x: x.similarity_score, reverse=True)
-        return results[:top_k]
+        return results
 
     def search(self, query: str, top_k: int = 5) -> List[SearchResult]:
         """
@@ -399,10 +718,18 @@ class SimilaritySearchService:
                 return self._search_with_keywords(query, top_k)
             return []
 
+        # Blank queries match nothing; embedding them would fail and count
+        # against the circuit breaker
+        if not query or not query.strip():
+            return []
+
         try:
             # Generate query embedding
             query_embedding = self.embeddings_service.generate_embedding(query)
 
+            if self.search_engine == "matrix":
+                return self._search_matrix(query, query_embedding, top_k)
+
             results = []
 
             for doc in self.documents:
@@ -439,19 +766,121 @@ class SimilaritySearchService:
             return results[:top_k]
 
         except Exception as e:
-            self._recent_failures += 1
-            logger.error(
-                "Search error: %s (failure %d)", e, self._recent_failures
-            )
-            if self._recent_failures >= self.circuit_breaker_threshold:
-                self._embedding_backend_disabled = True
-                logger.error(
-                    "Embedding backend disabled due to repeated failures"
-                )
+            self._record_search_failure(e)
             if self.enable_keyword_fallback:
                 return self._search_with_keywords(query, top_k)
             return []
 
+    def search_many(
+        self, queries: List[str], top_k: int = 5
+    ) -> List[List[SearchResult]]:
+        """
+        Search for several queries at once.
+
+        All queries are embedded with one ``generate_batch_embeddings`` call
+        and scored with a single matrix-matrix product.
+
+        Args:
+            queries: Search query texts
+            top_k: Number of top results to return per query
+
+        Returns:
+            One list of search results per query, in input order
+        """
+        if not queries:
+            return []
+
+        def keyword_or_empty() -> List[List[SearchResult]]:
+            if self.enable_keyword_fallback and self.documents:
+                return [self._search_with_keywords(q, top_k) for q in queries]
+            return [[] for _ in queries]
+
+        if not self.embeddings_service or self._embedding_backend_disabled:
+            logger.error("Embeddings service not available")
+            return keyword_or_empty()
+
+        if not self.documents:
+            logger.error("No documents loaded")
+            return [[] for _ in queries]
+
+        if not all(doc.embeddings is not None for doc in self.documents):
+            logger.error(
+                "Embeddings not generated. Call generate_embeddings() first."
+            )
+            return keyword_or_empty()
+
+        # Blank queries get no results and are not embedded, as in search()
+        positions = [i for i, q in enumerate(queries) if q and q.strip()]
+        results: List[List[SearchResult]] = [[] for _ in queries]
+        if not positions:
+            return results
+
+        try:
+            query_embeddings = np.asarray(
+                self.embeddings_service.generate_batch_embeddings(
+                    [queries[i] for i in positions]
+                )
+            )
+            matrix = self._get_chunk_matrix()
+            scores = matrix.chunk_scores_many(query_embeddings)
+            for row, pos in zip(scores, positions):
+                row = self._fuse_keyword_scores(matrix, queries[pos], row)
+                results[pos] = self._results_from_scores(matrix, row, top_k)
+            return results
+
+        except Exception as e:
+            self._record_search_failure(e)
+            return keyword_or_empty()
+
+    def _record_search_failure(self, error: Exception) -> None:
+        """Count a failed search and trip the circuit breaker if needed."""
+        self._recent_failures += 1
+        logger.error(
+            "Search error: %s (failure %d)", error, self._recent_failures
+        )
+        if self._recent_failures >= self.circuit_breaker_threshold:
+            self._embedding_backend_disabled = True
+            logger.error(
+                "Embedding backend disabled due to repeated failures"
+            )
+
+    def _search_matrix(
+        self, query: str, query_embedding: np.ndarray, top_k: int
+    ) -> List[SearchResult]:
+        """Score all chunks with one matrix-vector product."""
+        matrix = self._get_chunk_matrix()
+        chunk_scores = matrix.chunk_scores(query_embedding)
+        chunk_scores = self._fuse_keyword_scores(matrix, query, chunk_scores)
+        return self._results_from_scores(matrix, chunk_scores, top_k)
+
+    def _fuse_keyword_scores(
+        self, matrix: ChunkMatrix, query: str, chunk_scores: np.ndarray
+    ) -> np.ndarray:
+        """In hybrid ranking, fuse cosine and BM25 chunk ranks (RRF)."""
+        if self.ranking != "hybrid":
+            return chunk_scores
+        index = self._get_bm25()
+        if not index.is_current(matrix.documents):
+            return chunk_scores
+        return reciprocal_rank_fusion(chunk_scores, index.chunk_scores(query))
+
+    def _results_from_scores(
+        self, matrix: ChunkMatrix, chunk_scores: np.ndarray, top_k: int
+    ) -> List[SearchResult]:
+        results = []
+        for doc_idx, doc_score, chunks in matrix.rank(chunk_scores, top_k):
+            doc = matrix.documents[doc_idx]
+            results.append(
+                SearchResult(
+                    document=doc,
+                    similarity_score=doc_score,
+                    matching_chunks=[
+                        (doc.chunks[i], score) for i, score in chunks
+                    ],
+                )
+            )
+        return results
+
     def get_info(self) -> Dict:
         """Get information about the search service state."""
         return {
@@ -474,6 +903,27 @@ class SimilaritySearchService:
             "cache_enabled": self.enable_cache,
             "cache_hits": self._cache_hits,
             "cache_misses": self._cache_misses,
+            "index_dir": self.index_dir,
+            "store_mapped": self._store_snapshot is not None,
+            "quantization": self.quantization,
+            "index_bytes": self._chunk_matrix.nbytes
+            if self._chunk_matrix is not None
+            else 0,
+            "search_engine": self.search_engine,
+            "ranking": self.ranking,
+            "keyword_index_terms": len(self._bm25.postings)
+            if self._bm25 is not None
+            else 0,
+            "tracked_files": len(self._file_state),
+            "watcher_running": self._watcher is not None
+            and self._watcher.is_alive(),
+            "indexed_chunks": self._chunk_matrix.n_chunks
+            if self._chunk_matrix is not None
+            else 0,
+            "ann": self._chunk_matrix.ann.info()
+            if self._chunk_matrix is not None
+            and self._chunk_matrix.ann is not None
+            else None,
         }
 
     def initialize(self) -> bool:
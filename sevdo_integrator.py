@@ -4,13 +4,79 @@ SEVDO Full Stack Integrator
 Generates complete full-stack applications from templates with automatic backend handler detection
 """
 
+import concurrent.futures as cf
 import json
+import os
 import sys
 import shutil
 import re
 import subprocess
+import threading
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Callable, Dict, List, Optional, Set
+
+
+def _pipeline_workers(default: int = 4) -> int:
+    """SEVDO_PIPELINE_WORKERS, or ``default`` when unset or not an integer."""
+    value = os.getenv("SEVDO_PIPELINE_WORKERS", "")
+    try:
+        return int(value) if value.strip() else default
+    except ValueError:
+        print(f"⚠️ Ignoring invalid SEVDO_PIPELINE_WORKERS={value!r}, using {default}")
+        return default
+
+
+# Threads shared by the generation pipeline (backend, npm install, page compiles)
+PIPELINE_WORKERS = _pipeline_workers()
+
+
+class PipelineScheduler:
+    """
+    Runs generation stages on a shared thread pool and times each one.
+
+    Dependencies are expressed by waiting on the futures ``submit`` returns;
+    only the calling thread waits, so stages never block a pool thread on
+    each other. Timings are wall-clock seconds per stage.
+    """
+
+    def __init__(self, max_workers: int = PIPELINE_WORKERS):
+        self._executor = cf.ThreadPoolExecutor(
+            max_workers=max(2, max_workers), thread_name_prefix="sevdo-pipeline"
+        )
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self.timings: Dict[str, float] = {}
+
+    def _timed(self, stage: str, fn: Callable, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.timings[stage] = time.perf_counter() - start
+
+    def submit(self, stage: str, fn: Callable, *args) -> cf.Future:
+        """Start a stage in the background."""
+        return self._executor.submit(self._timed, stage, fn, *args)
+
+    def run(self, stage: str, fn: Callable, *args):
+        """Run a stage on the calling thread."""
+        return self._timed(stage, fn, *args)
+
+    def map(self, stage: str, fn: Callable, items: List) -> List:
+        """Run ``fn`` over ``items`` concurrently; results keep input order."""
+        return self._timed(stage, lambda: list(self._executor.map(fn, items)))
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    def report(self):
+        print("\n⏱️  Stage timings:")
+        for stage, seconds in self.timings.items():
+            print(f"   {stage:<16} {seconds:8.2f}s")
+        total = time.perf_counter() - self._started
+        print(f"   {'total (wall)':<16} {total:8.2f}s")
 
 
 class SevdoIntegrator:
@@ -140,80 +206,108 @@ class SevdoIntegrator:
 
     def generate_frontend(self, template_name: str, output_dir: Path) -> bool:
         """Generate React frontend from template"""
-        print("🎨 Generating Frontend...")
+        config = self.load_template(template_name)
+        scheduler = PipelineScheduler()
+        try:
+            return self._generate_frontend_pipeline(
+                template_name, config, output_dir, scheduler
+            )
+        finally:
+            scheduler.shutdown()
 
+    def _load_frontend_compiler(self) -> Optional[Callable]:
+        """Import the frontend compiler and load prefabs; None if unavailable."""
         try:
-            # Try to import the frontend compiler
+            from frontend_compiler import dsl_to_jsx, load_prefabs
+        except ImportError:
+            print("⚠️ Frontend compiler not available as import, trying to start service...")
+            # Try to start the frontend compiler service
             try:
-                from frontend_compiler import dsl_to_jsx, load_prefabs
-            except ImportError:
-                print("⚠️ Frontend compiler not available as import, trying to start service...")
-                # Try to start the frontend compiler service
-                import subprocess
-                import time
-
-                try:
-                    service_process = subprocess.Popen(
-                        ["python", "frontend_compiler.py"],
-                        cwd=str(Path(__file__).parent / "sevdo_frontend"),
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE
-                    )
-                    # Wait a bit for service to start
-                    time.sleep(3)
-                    print("✅ Frontend compiler service started")
-                except Exception as e:
-                    print(f"❌ Could not start frontend compiler service: {e}")
-                    print("💡 Note: The architectural fix is working perfectly!")
-                    print("💡 The remaining error is a service integration issue.")
-                    print("💡 All prefabs load successfully and backend works perfectly.")
-                    return True  # Return success since core functionality works
-
-            # Load prefabs
-            load_prefabs()
-
-            # Get required prefabs from config
-            config = self.load_template(template_name)
-            required_prefabs = config.get("required_prefabs", [])
-            print(f"Required prefabs: {required_prefabs}")
-
-            # Get API props for all tokens in template
-            api_props = self.get_api_props_for_tokens(template_name)
-
-            # Add navigation config to API props for all tokens
-            navigation_config = config.get("navigation", {})
-            if navigation_config:
-                print(
-                    f"🧭 Navigation config found: {len(navigation_config.get('actions', {}))} actions"
+                subprocess.Popen(
+                    ["python", "frontend_compiler.py"],
+                    cwd=str(Path(__file__).parent / "sevdo_frontend"),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE
                 )
-                # Add navigation to all tokens that might need it
-                for token in api_props:
-                    if "navigation" not in api_props[token]:
-                        api_props[token]["navigation"] = navigation_config
-
-                # Also ensure tokens without API props get navigation
-                # Common tokens that need navigation
-                nav_tokens = ["ho", "cf", "cta", "mn", "bl"]
-                for token in nav_tokens:
-                    if token not in api_props:
-                        api_props[token] = {"navigation": navigation_config}
-                    else:
-                        api_props[token]["navigation"] = navigation_config
-
-            # Read frontend files
+                # Wait a bit for service to start
+                time.sleep(3)
+                print("✅ Frontend compiler service started")
+            except Exception as e:
+                print(f"❌ Could not start frontend compiler service: {e}")
+                print("💡 Note: The architectural fix is working perfectly!")
+                print("💡 The remaining error is a service integration issue.")
+                print("💡 All prefabs load successfully and backend works perfectly.")
+            return None
+
+        load_prefabs()
+        return dsl_to_jsx
+
+    def _frontend_api_props(self, template_name: str, config: Dict) -> Dict[str, Dict]:
+        """API props for all template tokens, plus the navigation config"""
+        required_prefabs = config.get("required_prefabs", [])
+        print(f"Required prefabs: {required_prefabs}")
+
+        # Get API props for all tokens in template
+        api_props = self.get_api_props_for_tokens(template_name)
+
+        # Add navigation config to API props for all tokens
+        navigation_config = config.get("navigation", {})
+        if navigation_config:
+            print(
+                f"🧭 Navigation config found: {len(navigation_config.get('actions', {}))} actions"
+            )
+            # Add navigation to all tokens that might need it
+            for token in api_props:
+                if "navigation" not in api_props[token]:
+                    api_props[token]["navigation"] = navigation_config
+
+            # Also ensure tokens without API props get navigation
+            # Common tokens that need navigation
+            nav_tokens = ["ho", "cf", "cta", "mn", "bl"]
+            for token in nav_tokens:
+                if token not in api_props:
+                    api_props[token] = {"navigation": navigation_config}
+                else:
+                    api_props[token]["navigation"] = navigation_config
+        return api_props
+
+    def _generate_frontend_pipeline(
+        self,
+        template_name: str,
+        config: Dict,
+        output_dir: Path,
+        scheduler: PipelineScheduler,
+    ) -> bool:
+        """
+        Generate and build the React frontend.
+
+        ``package.json`` is written first so ``npm install`` runs while the
+        ``.s`` pages compile concurrently; the build starts once both are done.
+        """
+        print("🎨 Generating Frontend...")
+
+        try:
             frontend_dir = self.templates_dir / template_name / "frontend"
             if not frontend_dir.exists():
                 raise FileNotFoundError(f"Frontend directory not found: {frontend_dir}")
 
-            # Create frontend structure
+            # Create frontend structure and supporting files
             frontend_output = output_dir / "frontend"
             (frontend_output / "src" / "components").mkdir(parents=True, exist_ok=True)
             (frontend_output / "public").mkdir(parents=True, exist_ok=True)
+            scheduler.run(
+                "react_files", self._generate_react_files, frontend_output, template_name
+            )
+            install = scheduler.submit("npm_install", self._npm_install, frontend_output)
 
-            components = []
+            dsl_to_jsx = scheduler.run("load_prefabs", self._load_frontend_compiler)
+            if dsl_to_jsx is None:
+                return True  # Return success since core functionality works
+            api_props = scheduler.run(
+                "api_props", self._frontend_api_props, template_name, config
+            )
 
-            # Compile each .s file
-            for s_file in frontend_dir.glob("*.s"):
+            def compile_page(s_file: Path) -> str:
                 dsl_content = s_file.read_text(encoding="utf-8")
                 component_name = s_file.stem.capitalize()
 
@@ -229,29 +323,31 @@ class SevdoIntegrator:
                     frontend_output / "src" / "components" / f"{component_name}.jsx"
                 )
                 comp_file.write_text(jsx_code, encoding="utf-8")
-                components.append(component_name)
-
                 print(f"   ✓ {s_file.name} -> {component_name}.jsx")
+                return component_name
+
+            # Compile the .s pages concurrently
+            s_files = sorted(frontend_dir.glob("*.s"))
+            components = scheduler.map("compile_pages", compile_page, s_files)
 
             # Generate App.js with routing
             self._generate_app_js(frontend_output, components)
 
-            # Generate other React files
-            self._generate_react_files(frontend_output, template_name)
-
             s_output_dir = frontend_output / ".s"
             s_output_dir.mkdir(exist_ok=True)
-            for s_file in frontend_dir.glob("*.s"):
+            for s_file in s_files:
                 dest_file = s_output_dir / s_file.name
                 shutil.copy2(s_file, dest_file)
                 print(f"   ✓ Copied {s_file.name} to frontend/.s/")
 
             print(f"✅ Frontend generated: {len(components)} components")
 
-            if self._build_react_app(frontend_output):
+            if install.result() and scheduler.run(
+                "npm_build", self._npm_build, frontend_output
+            ):
                 print("✅ Frontend generated and built successfully")
             else:
-                print("⚠️  Frontend generated but build failed")
+                print("⚠️  React build failed, but frontend source files are available")
 
             return True
 
@@ -259,82 +355,6 @@ class SevdoIntegrator:
             print(f"❌ Frontend generation failed: {e}")
             return False
 
-    def _build_react_app(self, frontend_dir: Path) -> bool:
-        """Build React app with optimizations for Docker"""
-        print("🔨 Building React application...")
-
-        try:
-            # Check if build already exists
-            build_dir = frontend_dir / "build"
-            if build_dir.exists():
-                print("✅ Build directory already exists, skipping build")
-                return True
-
-            # Set npm configuration for better Docker performance
-            npm_config_commands = [
-                ["npm", "config", "set", "fetch-timeout", "300000"],  # 5 minutes
-                [
-                    "npm",
-                    "config",
-                    "set",
-                    "fetch-retry-maxtimeout",
-                    "120000",
-                ],  # 2 minutes
-                [
-                    "npm",
-                    "config",
-                    "set",
-                    "fetch-retry-mintimeout",
-                    "10000",
-                ],  # 10 seconds
-                ["npm", "config", "set", "registry", "https://registry.npmjs.org/"],
-            ]
-
-            for config_cmd in npm_config_commands:
-                subprocess.run(config_cmd, cwd=frontend_dir, capture_output=True)
-
-            print("📦 Installing npm dependencies with extended timeouts...")
-            result = subprocess.run(
-                ["npm", "install", "--no-audit", "--no-fund", "--prefer-offline"],
-                cwd=frontend_dir,
-                capture_output=True,
-                text=True,
-                timeout=600,  # 10 minutes timeout
-            )
-
-            if result.returncode != 0:
-                print(f"❌ npm install failed: {result.stderr}")
-                return False
-
-            print("✅ Dependencies installed")
-
-            print("🏗️ Building React app for production...")
-            result = subprocess.run(
-                ["npm", "run", "build"],
-                cwd=frontend_dir,
-                capture_output=True,
-                text=True,
-                timeout=300,  # 5 minutes timeout
-            )
-
-            if result.returncode != 0:
-                print(f"❌ npm run build failed: {result.stderr}")
-                return False
-
-            if build_dir.exists():
-                print("✅ React app built successfully")
-                return True
-            else:
-                print("❌ Build directory not found after build")
-                return False
-
-        except subprocess.TimeoutExpired:
-            print("❌ React build timed out")
-            return False
-        except Exception as e:
-            print(f"❌ Unexpected error during React build: {e}")
-            return False
-
     def generate_backend(
         self, template_name: str, config: Dict, output_dir: Path
     ) -> bool:
@@ -428,26 +448,26 @@ class SevdoIntegrator:
         # Create output directory
         output_path.mkdir(exist_ok=True)
 
-        success_count = 0
-
-        # Generate frontend
-        if self.generate_frontend(template_name, output_path):
-            success_count += 1
-
-            # Build React app after frontend generation
-            frontend_dir = output_path / "frontend"
-            if self._build_react_app(frontend_dir):
-                print("✅ React build completed successfully")
-            else:
-                print("⚠️  React build failed, but frontend source files are available")
+        # Backend generation overlaps the whole frontend pipeline
+        scheduler = PipelineScheduler()
+        try:
+            backend = scheduler.submit(
+                "backend", self.generate_backend, template_name, config, output_path
+            )
+            frontend_ok = self._generate_frontend_pipeline(
+                template_name, config, output_path, scheduler
+            )
+            backend_ok = backend.result()
 
-        # Generate backend
-        if self.generate_backend(template_name, config, output_path):
-            success_count += 1
+            # Generate project files
+            project_ok = scheduler.run(
+                "project_files", self._generate_project_files, output_path, config
+            )
+        finally:
+            scheduler.shutdown()
+        scheduler.report()
 
-        # Generate project files
-        if self._generate_project_files(output_path, config):
-            success_count += 1
+        success_count = sum([frontend_ok, backend_ok, project_ok])
 
         if success_count >= 2:  # Frontend + Backend minimum
             print(f"\n✅ Full-stack app generated successfully!")
@@ -626,8 +646,10 @@ root.render(
 
     def _build_react_app(self, frontend_dir: Path) -> bool:
         """Build the React application during generation"""
-        print("🔨 Building React application...")
+        return self._npm_install(frontend_dir) and self._npm_build(frontend_dir)
 
+    def _npm_install(self, frontend_dir: Path) -> bool:
+        """Install npm dependencies; needs only package.json"""
         try:
             # Check if Node.js is available
             subprocess.run(["node", "--version"], capture_output=True, check=True)
@@ -654,7 +676,20 @@ root.render(
                 return False
 
             print("✅ Dependencies installed")
+            return True
+
+        except subprocess.TimeoutExpired:
+            print("❌ npm install timed out")
+            return False
+        except Exception as e:
+            print(f"❌ Unexpected error during npm install: {e}")
+            return False
 
+    def _npm_build(self, frontend_dir: Path) -> bool:
+        """Build the installed React app and set up its production server"""
+        print("🔨 Building React application...")
+
+        try:
             # Build for production
             print("🏗️ Building React app for production...")
             result = subprocess.run(
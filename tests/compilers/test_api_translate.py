@@ -1,4 +1,5 @@
 import importlib
+import json
 from fastapi.testclient import TestClient
 
 
@@ -85,6 +86,39 @@ def test_batch_endpoints(tmp_path):
     assert ids == {"a1", "b2"}
 
 
+def test_batch_endpoints_stream_ndjson_and_sse(tmp_path):
+    client = get_client()
+    in1 = tmp_path / "a.txt"
+    in1.write_text("r l\n", encoding="utf-8")
+    jobs = [
+        {"id": "a1", "input_path": str(in1), "output_path": str(tmp_path / "a.py")},
+        {"id": "b2", "input_path": str(tmp_path / "missing.txt"), "output_path": str(tmp_path / "b.py")},
+    ]
+
+    resp = client.post("/api/translate/to-s-batch?stream=ndjson", json={"jobs": jobs})
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in resp.text.splitlines()]
+    assert records[-1] == {"type": "summary", "totals": {"ok": 1, "failed": 1}}
+    by_index = {r["index"]: r for r in records[:-1]}
+    assert by_index[0]["ok"] is True and by_index[0]["result"]["tokens"] == ["r", "l"]
+    assert by_index[1]["ok"] is False and by_index[1]["result"]["status"] == 404
+
+    resp = client.post(
+        "/api/translate/from-s-batch?stream=sse",
+        json={"jobs": [{"id": "a1", "code_path": str(tmp_path / "a.py")}]},
+    )
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = [e for e in resp.text.split("\n\n") if e]
+    assert events[0].startswith("event: result\ndata: ")
+    assert json.loads(events[0].split("data: ", 1)[1])["result"]["tokens"] == ["r", "l"]
+    assert events[-1].startswith("event: summary")
+
+    resp = client.post("/api/translate/to-s-batch?stream=xml", json={"jobs": jobs})
+    assert resp.status_code == 400
+    assert resp.json()["detail"]["code"] == "invalid_stream_mode"
+
+
 def test_errors_404_and_413(tmp_path, monkeypatch):
     client = get_client()
 
@@ -1,4 +1,8 @@
+import ast
 import importlib
+import json
+import sys
+from pathlib import Path
 
 
 def test_round_trip_tokens_to_code_and_back():
@@ -23,3 +27,156 @@ def test_write_if_changed(tmp_path):
     # Different content should be True again
     changed3 = mod._write_if_changed(str(out), "print('b')\n")
     assert changed3 is True
+
+
+def test_code_to_tokens_indexes_module_endpoints_with_offsets(monkeypatch):
+    # Endpoint modules import as `endpoints.<name>`
+    monkeypatch.syspath_prepend(str(Path(__file__).resolve().parents[2] / "sevdo_backend"))
+    mod = importlib.import_module("sevdo_backend.backend_compiler")
+    compiler = mod.BackendCompiler()
+    # bt and nlh are module endpoints with several routes each
+    tokens = ["bt", "r", "nlh", "m"]
+    assert not isinstance(compiler.mapping["bt"], str)
+    code = compiler.tokens_to_code(tokens, include_imports=True)
+
+    offsets = compiler.code_to_token_offsets(code)
+    assert [t for t, _ in offsets] == tokens
+    positions = [pos for _, pos in offsets]
+    assert positions == sorted(positions)
+    assert all(code.startswith("@app.", pos) for pos in positions)
+
+    # Repeated and unknown routes are ignored; each token is reported once
+    doubled = code + code + '\n@app.get("/not-a-known-route")\n'
+    assert compiler.code_to_tokens(doubled) == tokens
+
+
+def test_tokens_to_code_reuses_cached_endpoint_fragments(monkeypatch):
+    monkeypatch.syspath_prepend(str(Path(__file__).resolve().parents[2] / "sevdo_backend"))
+    mod = importlib.import_module("sevdo_backend.backend_compiler")
+    compiler = mod.BackendCompiler()
+    mod.ENDPOINT_FRAGMENT_CACHE.clear()
+    module = compiler.mapping["bs"]
+    calls = []
+    original = module.render_endpoint
+    monkeypatch.setattr(
+        module, "render_endpoint", lambda *a: calls.append(a) or original(*a)
+    )
+
+    first = compiler.tokens_to_code(["bs", "r"], include_imports=False)
+    second = compiler.tokens_to_code(["l", "bs"], include_imports=False)
+    assert calls == [()]
+    assert compiler.code_to_tokens(first) == ["bs", "r"]
+    assert compiler.code_to_tokens(second) == ["l", "bs"]
+
+    # Different args/props are separate fragments
+    hits = mod.ENDPOINT_FRAGMENT_CACHE.stats()["hits"]
+    compiler.render_fragment("bs", props={"limit": 5})
+    compiler.render_fragment("bs", props={"limit": 5})
+    assert calls == [(), (None, {"limit": 5})]
+    assert mod.ENDPOINT_FRAGMENT_CACHE.stats()["hits"] == hits + 1
+
+
+def test_tokens_to_code_hoists_and_dedupes_imports_and_models(monkeypatch):
+    monkeypatch.syspath_prepend(str(Path(__file__).resolve().parents[2] / "sevdo_backend"))
+    mod = importlib.import_module("sevdo_backend.backend_compiler")
+    compiler = mod.BackendCompiler()
+    code = compiler.tokens_to_code(["bt", "abp", "cha", "bt", "r", "r"])
+    tree = ast.parse(code)
+
+    top_level = [
+        node.name
+        for node in tree.body
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef))
+    ]
+    assert len(top_level) == len(set(top_level))
+    imports = [
+        ast.dump(node)
+        for node in tree.body
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    ]
+    assert len(imports) == len(set(imports))
+    # `import re` used to be repeated inside the blog tag and admin handlers
+    assert ast.dump(ast.parse("import re").body[0]) in imports
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef):
+            assert not any(isinstance(s, ast.Import) and s.names[0].name == "re" for s in node.body)
+    assert compiler.code_to_tokens(code) == ["bt", "abp", "cha", "r"]
+
+
+def test_assemble_module_falls_back_to_concatenation():
+    mod = importlib.import_module("sevdo_backend.code_assembly")
+    header = "import os\n"
+    # A module-level statement using a fragment function cannot be reordered
+    fragments = ["def f():\n    import re\n    return re\n", "g = f()\n"]
+    assert mod.assemble_module(header, fragments) == header + "".join(
+        f + "\n\n" for f in fragments
+    )
+    assert mod.assemble_module("", ["def broken(:\n"]) == "def broken(:\n\n\n"
+
+    code = mod.assemble_module(
+        header, ["def f():\n    import re\n    return re\n", "def g():\n    import re\n    re = 1\n    return re\n"]
+    )
+    assert code.index("import re") < code.index("def f")
+    # g rebinds `re`, so its import stays local
+    assert "def g():\n    import re\n" in code
+
+
+def test_endpoint_modules_load_lazily_from_manifest(monkeypatch):
+    endpoints = importlib.import_module("sevdo_backend.endpoints")
+    mod = importlib.import_module("sevdo_backend.backend_compiler")
+    monkeypatch.setattr(endpoints, "ENDPOINT_REGISTRY", {})
+    for name in list(sys.modules):
+        if name.startswith("sevdo_backend.endpoints."):
+            monkeypatch.delitem(sys.modules, name)
+
+    compiler = mod.BackendCompiler()
+    assert "bt" in compiler.mapping and "cha" in compiler.mapping
+    assert compiler.code_to_tokens('@app.get("/api/blog/tags")') == ["bt"]
+    assert compiler._get_required_model_modules(["bt", "r"]) == {"auth_models", "blog_models"}
+    assert not [n for n in sys.modules if n.startswith("sevdo_backend.endpoints.")]
+
+    compiler.tokens_to_code(["bt"])
+    assert [n for n in sys.modules if n.startswith("sevdo_backend.endpoints.")] == [
+        "sevdo_backend.endpoints.blog_tags"
+    ]
+
+
+def test_stale_manifest_entries_are_refreshed(monkeypatch, tmp_path):
+    endpoints = importlib.import_module("sevdo_backend.endpoints")
+    manifest = json.loads(endpoints.MANIFEST_PATH.read_text(encoding="utf-8"))
+    manifest["endpoints"]["blog_tags"]["sha256"] = "stale"
+    manifest["endpoints"]["blog_tags"]["routes"] = []
+    del manifest["endpoints"]["me"]
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(manifest), encoding="utf-8")
+    monkeypatch.setattr(endpoints, "_MANIFEST", None)
+    monkeypatch.setattr(endpoints, "_TOKEN_MODULES", {})
+
+    loaded = endpoints.load_manifest(path)
+    assert ["GET", "/api/blog/tags"] in loaded["endpoints"]["blog_tags"]["routes"]
+    assert "m" in endpoints.list_available_tokens()
+    # Refreshed in memory only; the file is left for build_manifest()
+    assert json.loads(path.read_text(encoding="utf-8")) == manifest
+    # Later calls reuse the loaded manifest
+    assert endpoints.load_manifest(path) is loaded
+
+
+def test_build_manifest_replaces_file_atomically(monkeypatch, tmp_path):
+    endpoints = importlib.import_module("sevdo_backend.endpoints")
+    monkeypatch.setattr(endpoints, "_MANIFEST", None)
+    monkeypatch.setattr(endpoints, "_TOKEN_MODULES", {})
+    path = tmp_path / "manifest.json"
+    path.write_text("{}", encoding="utf-8")
+    replaced = []
+    original_replace = endpoints.os.replace
+    monkeypatch.setattr(
+        endpoints.os,
+        "replace",
+        lambda src, dst: replaced.append((src, dst)) or original_replace(src, dst),
+    )
+
+    built = endpoints.build_manifest(path)
+    assert json.loads(path.read_text(encoding="utf-8")) == built
+    assert built == json.loads(endpoints.MANIFEST_PATH.read_text(encoding="utf-8"))
+    assert [dst for _, dst in replaced] == [path]
+    assert list(tmp_path.iterdir()) == [path]
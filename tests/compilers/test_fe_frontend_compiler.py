@@ -1,4 +1,6 @@
 import importlib
+import json
+import os
 import httpx
 import pytest
 
@@ -185,3 +187,312 @@ async def test_fe_nesting_render(tmp_path):
 		assert "<form>" in jsx
 		assert "onClick={save}" in jsx
 
+
+
+def test_prefab_hot_reload_changes_cache_keys(tmp_path):
+	mod = importlib.reload(importlib.import_module("sevdo_frontend.frontend_compiler"))
+	prefab = tmp_path / "demo_prefab.py"
+	prefab.write_text(
+		"COMPONENT_TOKEN = 'zz'\n"
+		"PREFAB_METADATA = {'name': 'Demo'}\n"
+		"def render_prefab(args, props):\n"
+		"    return '<Demo />'\n",
+		encoding="utf-8",
+	)
+	mod.PREFABS_DIR = tmp_path
+	try:
+		changes = mod.load_prefabs()
+		assert changes["loaded"] == ["demo_prefab.py"]
+		assert len(changes["removed"]) > 0
+		assert mod.get_prefab_metadata("zz") == {"name": "Demo"}
+		version = mod.PREFAB_SET_VERSION
+		key = mod._key_dsl("zz", True, "C")
+
+		# Unchanged files are not re-imported
+		assert mod.load_prefabs() == {"loaded": [], "removed": []}
+
+		# Metadata edits change the prefab version and the cache keys
+		prefab.write_text(
+			prefab.read_text(encoding="utf-8").replace("Demo'}", "Demo2'}"),
+			encoding="utf-8",
+		)
+		os.utime(prefab, ns=(0, 1))
+		assert mod.load_prefabs()["loaded"] == ["demo_prefab.py"]
+		assert mod.get_prefab_metadata("zz") == {"name": "Demo2"}
+		assert mod.PREFAB_SET_VERSION != version
+		assert mod._key_dsl("zz", True, "C") != key
+
+		prefab.unlink()
+		assert mod.load_prefabs()["removed"] == ["demo_prefab.py"]
+		assert mod.get_prefab_module("zz") is None
+	finally:
+		importlib.reload(mod)
+
+
+def test_dsl_to_jsx_memoizes_unchanged_subtrees(monkeypatch):
+	mod = importlib.reload(importlib.import_module("sevdo_frontend.frontend_compiler"))
+	page = "c(h(Title) t(Intro) c(t(A) t(B)){class=mt-2}) f(i(name) b(Save))"
+	first = mod.dsl_to_jsx(page, component_name="Page")
+
+	rendered = []
+	original = mod._jsx_for_token
+	monkeypatch.setattr(
+		mod, "_jsx_for_token",
+		lambda token, args, props: rendered.append((token, args)) or original(token, args, props),
+	)
+	assert mod.dsl_to_jsx(page, component_name="Page") == first
+	assert rendered == []
+
+	# Editing one leaf re-renders only that leaf; its ancestors are reassembled
+	edited = page.replace("t(B)", "t(B2)")
+	jsx = mod.dsl_to_jsx(edited, component_name="Page")
+	assert rendered == [("t", "B2")]
+	mod.SUBTREE_CACHE.clear()
+	assert jsx == mod.dsl_to_jsx(edited, component_name="Page")
+	assert mod.SUBTREE_CACHE.stats()["size"] > 0
+
+
+@pytest.mark.anyio
+async def test_fe_incremental_compile_reuses_unchanged_statements():
+	mod = importlib.reload(importlib.import_module("sevdo_frontend.frontend_compiler"))
+	old = "h(Title)\nt(Intro)\nb(Save)"
+	new = "h(Title)\nt(Intro changed)\nb(Save)\ni(email)"
+	transport = httpx.ASGITransport(app=mod.app)
+	async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+		resp = await client.post("/api/fe-translate/incremental", json={
+			"dsl_content": old, "component_name": "Page",
+		})
+		assert resp.status_code == 200
+		first = resp.json()
+		assert first["rendered_statements"] == 3
+		assert first["changes"]["added"] and first["previous_handle_found"] is False
+
+		resp = await client.post("/api/fe-translate/incremental", json={
+			"dsl_content": new, "component_name": "Page",
+			"previous_handle": first["handle"],
+		})
+		data = resp.json()
+	assert data["previous_handle_found"] is True
+	assert data["rendered_statements"] == 2
+	assert data["changes"]["unchanged"] == 2
+	assert [c["index"] for c in data["changes"]["modified"]] == [1]
+	assert [c["index"] for c in data["changes"]["added"]] == [3]
+	assert data["changes"]["removed"] == []
+	assert data["code"] == mod.dsl_to_jsx(new, component_name="Page")
+
+	# Unknown handle: diff against the previous source instead
+	fallback = mod.compile_incremental(new, previous_handle="missing", previous_source=old)
+	assert fallback["previous_handle_found"] is False
+	assert fallback["changes"]["unchanged"] == 2
+	assert len(fallback["changes"]["modified"]) == 1
+	assert fallback["code"] == mod.dsl_to_jsx(new)
+
+
+def test_fe_incremental_compile_rerenders_after_prefab_or_props_change(monkeypatch):
+	mod = importlib.reload(importlib.import_module("sevdo_frontend.frontend_compiler"))
+	monkeypatch.setattr(mod, "PREFAB_RELOAD_INTERVAL", 0)
+	source = "h(Hello)\nt(World)"
+	first = mod.compile_incremental(source, component_name="Page")
+	assert "<h2>" not in first["code"]
+
+	# A new `h` renderer arrives with a new prefab set version
+	monkeypatch.setitem(mod.COMPONENT_REGISTRY, "h", lambda args, props: "<h2>Hello</h2>")
+	monkeypatch.setattr(mod, "PREFAB_SET_VERSION", mod.PREFAB_SET_VERSION + "-next")
+	second = mod.compile_incremental(source, previous_handle=first["handle"], component_name="Page")
+	assert second["previous_handle_found"] is True
+	assert second["changes"]["unchanged"] == 2
+	assert second["rendered_statements"] == 2
+	assert second["code"] == mod.dsl_to_jsx(source, component_name="Page")
+	assert "<h2>Hello</h2>" in second["code"]
+
+	# Different api_props also invalidate the rendered statements
+	props = {"b": {"onClick": "save"}}
+	third = mod.compile_incremental(
+		source, previous_handle=second["handle"], component_name="Page", api_props=props,
+	)
+	assert third["rendered_statements"] == 2
+	assert third["code"] == mod.dsl_to_jsx(source, component_name="Page", api_props=props)
+
+
+def test_parser_matches_legacy_parser_and_records_spans():
+	from sevdo_frontend import parser_benchmark as bench
+
+	mod = importlib.import_module("sevdo_frontend.frontend_compiler")
+	source = bench.synthetic_source(300, 60, seed=3)
+	new = mod.parse_statements(source)
+	old = bench.legacy_parse_statements(source)
+	assert [(t, bench.tree_signature(n)) for t, n in new] == [
+		(t, bench.tree_signature(n)) for t, n in old
+	]
+
+	source = "# header\r\nh(Title)\r\n// note\r\nc(t(A)\n# inner\nb(Go){onClick=go})"
+	(_, title), (_, box) = mod.parse_statements(source)
+	assert source[slice(*title.span)] == "h(Title)"
+	assert source[slice(*box.span)] == source[source.index("c(t(A)"):]
+	assert source[slice(*box.children[1].span)] == "b(Go){onClick=go}"
+
+	with pytest.raises(mod.ParseError):
+		mod.parse_statements("c(t(A){x=1)}")
+
+
+def test_props_support_quoted_values():
+	mod = importlib.import_module("sevdo_frontend.frontend_compiler")
+	(node,) = mod.parse_dsl('b(Go){label="Save, then close", class=\'a=b\', disabled}')
+	assert node.props == {"label": "Save, then close", "class": "a=b", "disabled": "true"}
+
+
+def test_ast_serialization_round_trip_and_cache():
+	from sevdo_frontend import parser_benchmark as bench
+
+	mod = importlib.reload(importlib.import_module("sevdo_frontend.frontend_compiler"))
+	source = "# page\n" + bench.synthetic_source(50, 30, seed=1)
+	statements = mod.parse_statements(source)
+	data = mod.dump_ast(statements)
+	assert isinstance(data, bytes)
+
+	loaded = mod.load_ast(data)
+	assert [t for t, _ in loaded] == [t for t, _ in statements]
+	assert [bench.tree_signature(n) for _, n in loaded] == [
+		bench.tree_signature(n) for _, n in statements
+	]
+
+	def spans(node):
+		return [node.span] + [s for child in node.children for s in spans(child)]
+
+	assert [spans(n) for _, n in loaded] == [spans(n) for _, n in statements]
+	assert not hasattr(statements[0][1], "__dict__")
+
+	first = mod.parse_statements_cached(source)
+	second = mod.parse_statements_cached(source)
+	assert mod.AST_CACHE.stats()["hits"] == 1
+	assert second[0][1] is not first[0][1]
+	assert [bench.tree_signature(n) for _, n in second] == [
+		bench.tree_signature(n) for _, n in statements
+	]
+
+	with pytest.raises(ValueError):
+		mod.compact_to_ast([mod.AST_FORMAT_VERSION + 1, [], []])
+
+
+def test_parse_statements_cached_does_not_share_props_with_cache():
+	mod = importlib.reload(importlib.import_module("sevdo_frontend.frontend_compiler"))
+	source = "b(Save){color=blue}"
+	first = mod.parse_statements_cached(source)
+	first[0][1].props["color"] = "red"
+	assert mod.parse_statements_cached(source)[0][1].props["color"] == "blue"
+
+
+@pytest.mark.anyio
+async def test_fe_batch_process_pool(tmp_path):
+	mod = importlib.reload(importlib.import_module("sevdo_frontend.frontend_compiler"))
+	mod.BATCH_EXECUTOR = "process"
+	mod.BATCH_PROCESS_WORKERS = 2
+	mod.BATCH_CHUNK_SIZE = 2
+	jobs = []
+	for n in range(5):
+		src = tmp_path / f"p{n}.dsl"
+		src.write_text(f"h(Page {n})\nc(t(Body {n}) b(Go))\n", encoding="utf-8")
+		jobs.append({"id": f"p{n}", "input_path": str(src), "output_path": str(tmp_path / f"p{n}.jsx"), "component_name": f"P{n}"})
+	jobs.append({"id": "missing", "input_path": str(tmp_path / "nope.dsl"), "output_path": str(tmp_path / "nope.jsx")})
+	try:
+		transport = httpx.ASGITransport(app=mod.app)
+		async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+			resp = await client.post("/api/fe-translate/to-s-batch", json={"jobs": jobs})
+		body = resp.json()
+		assert body["totals"] == {"ok": 5, "failed": 1}
+		assert [r["id"] for r in body["results"]] == [j["id"] for j in jobs]
+		assert body["results"][-1]["status"] == 404
+		assert body["results"][-1]["error"]["code"] == "file_not_found"
+		for n in range(5):
+			src = (tmp_path / f"p{n}.dsl").read_text(encoding="utf-8")
+			assert (tmp_path / f"p{n}.jsx").read_text(encoding="utf-8") == mod.dsl_to_jsx(src, component_name=f"P{n}")
+	finally:
+		mod._discard_process_pool()
+
+
+@pytest.mark.anyio
+async def test_fe_batch_stream_ndjson(tmp_path):
+	app = _get_app()
+	transport = httpx.ASGITransport(app=app)
+	inp = tmp_path / "a.dsl"
+	inp.write_text("h(A)\n", encoding="utf-8")
+	async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+		resp = await client.post("/api/fe-translate/to-s-batch?stream=ndjson", json={
+			"jobs": [
+				{"id": "a1", "input_path": str(inp), "output_path": str(tmp_path / "a.jsx")},
+				{"id": "b2", "input_path": str(tmp_path / "nope.dsl"), "output_path": str(tmp_path / "b.jsx")},
+			]
+		})
+	assert resp.status_code == 200
+	records = [json.loads(line) for line in resp.text.splitlines()]
+	assert records[-1] == {"type": "summary", "totals": {"ok": 1, "failed": 1}}
+	results = {r["result"]["id"]: r for r in records[:-1]}
+	assert results["a1"]["ok"] and results["a1"]["index"] == 0
+	assert results["b2"]["result"]["error"]["code"] == "file_not_found"
+
+
+@pytest.mark.anyio
+async def test_fe_batch_stream_goes_through_compile_queue(tmp_path, monkeypatch):
+	monkeypatch.setenv("FE_COMPILE_QUEUE_LIMIT", "1")
+	mod = importlib.reload(importlib.import_module("sevdo_frontend.frontend_compiler"))
+	inp = tmp_path / "a.dsl"
+	inp.write_text("h(A)\n", encoding="utf-8")
+	job = {"id": "a1", "input_path": str(inp), "output_path": str(tmp_path / "a.jsx")}
+	transport = httpx.ASGITransport(app=mod.app)
+	async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+		resp = await client.post("/api/fe-translate/to-s-batch?stream=sse", json={"jobs": [job]})
+		assert resp.status_code == 200
+		assert resp.text.startswith("event: result\n")
+		assert mod.COMPILE_QUEUE.stats()["completed"] == 1
+
+		# A full queue rejects streamed batches before the stream starts
+		mod.COMPILE_QUEUE.queued = 1
+		rejected = await client.post("/api/fe-translate/to-s-batch?stream=ndjson", json={"jobs": [job]})
+		mod.COMPILE_QUEUE.queued = 0
+	assert rejected.status_code == 503
+	assert rejected.json()["detail"]["code"] == "compile_queue_full"
+	assert mod.COMPILE_QUEUE.stats()["rejected"] == 1
+
+
+@pytest.mark.anyio
+async def test_fe_compile_runs_off_event_loop_with_bounded_queue(monkeypatch):
+	import asyncio
+	import threading
+
+	monkeypatch.setenv("FE_COMPILE_WORKERS", "1")
+	monkeypatch.setenv("FE_COMPILE_QUEUE_LIMIT", "1")
+	mod = importlib.reload(importlib.import_module("sevdo_frontend.frontend_compiler"))
+	release = threading.Event()
+	original = mod.dsl_to_jsx
+	monkeypatch.setattr(mod, "dsl_to_jsx", lambda *a, **kw: release.wait(5) and original(*a, **kw))
+
+	transport = httpx.ASGITransport(app=mod.app)
+	async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+		def compile_request(text):
+			return asyncio.ensure_future(client.post("/api/fe-translate/to-s-direct", json={
+				"dsl_content": text, "use_cache": False,
+			}))
+
+		running = compile_request("h(A)")
+		queued = compile_request("h(B)")
+		for _ in range(100):
+			if mod.COMPILE_QUEUE.stats()["running"] == 1 and mod.COMPILE_QUEUE.stats()["queued"] == 1:
+				break
+			await asyncio.sleep(0.01)
+
+		# The event loop stays free while the compile worker is blocked
+		health = await client.get("/health")
+		assert health.status_code == 200
+		stats = health.json()["compile_queue"]
+		assert stats["running"] == 1 and stats["queued"] == 1
+
+		rejected = await client.post("/api/fe-translate/to-s-direct", json={"dsl_content": "h(C)"})
+		assert rejected.status_code == 503
+		assert rejected.json()["detail"]["code"] == "compile_queue_full"
+
+		release.set()
+		first, second = await running, await queued
+	assert first.status_code == 200 and first.json()["code"] == original("h(A)")
+	assert second.status_code == 200
+	stats = mod.COMPILE_QUEUE.stats()
+	assert stats["completed"] == 2 and stats["rejected"] == 1 and stats["queued"] == 0
@@ -0,0 +1,114 @@
+import concurrent.futures as cf
+import time
+
+from sevdo_common import disk_cache
+from sevdo_common.disk_cache import DiskCache
+from sevdo_common.translation_cache import TranslationCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = TranslationCache("t", maxsize=2, ttl=0)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"  # "a" is now most recent
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 3 and stats["misses"] == 1
+
+
+def test_byte_budget_and_ttl():
+    cache = TranslationCache("t", maxsize=100, ttl=0, max_bytes=20)
+    cache.set("k1", "x" * 8)
+    cache.set("k2", "y" * 8)
+    assert cache.stats()["bytes"] == 20
+    cache.set("k3", "z" * 8)
+    assert cache.get("k1") is None and len(cache) == 2
+
+    # Entries larger than the whole budget are not cached
+    cache.set("big", "x" * 100)
+    assert cache.get("big") is None
+
+    expiring = TranslationCache("t", maxsize=4, ttl=0.01)
+    expiring.set("k", ["r", "l"])
+    time.sleep(0.02)
+    assert expiring.get("k") is None
+    assert expiring.stats()["expirations"] == 1
+    assert expiring.stats()["bytes"] == 0
+
+
+def test_concurrent_access_keeps_accounting_consistent():
+    cache = TranslationCache("t", maxsize=16, ttl=0)
+
+    def work(i):
+        key = f"k{i % 32}"
+        if cache.get(key) is None:
+            cache.set(key, "v" * (i % 7))
+
+    with cf.ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(work, range(2000)))
+
+    stats = cache.stats()
+    assert stats["size"] <= 16
+    assert stats["hits"] + stats["misses"] == 2000
+    assert stats["bytes"] == sum(
+        len(k) + len(v) for k, (v, _, _) in cache._store.items()
+    )
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    first = TranslationCache("tokens_to_code", disk=DiskCache(str(tmp_path)))
+    first.set("k", "generated code")
+    first.set("tokens", ["r", "l"])
+
+    # A new process (or worker) with an empty memory tier
+    second = TranslationCache("tokens_to_code", disk=DiskCache(str(tmp_path)))
+    assert second.get("k") == "generated code"
+    assert second.get("tokens") == ["r", "l"]
+    assert second.get("missing") is None
+    stats = second.stats()
+    assert stats["disk_hits"] == 2 and stats["size"] == 2
+    assert stats["disk"]["entries"] == 2
+
+    # Namespaces do not share entries
+    other = TranslationCache("dsl_to_jsx", disk=DiskCache(str(tmp_path)))
+    assert other.get("k") is None
+
+    second.clear()
+    assert first.disk.get("tokens_to_code", "k") is None
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    disk = DiskCache(str(tmp_path), max_bytes=100)
+    for i in range(5):
+        disk.set("ns", f"k{i}", "x" * 28)  # 30 bytes as JSON
+
+    stats = disk.stats("ns")
+    assert stats["bytes"] <= 100
+    assert stats["evictions"] >= 2
+    assert disk.get("ns", "k4") == "x" * 28
+    assert disk.get("ns", "k0") is None
+
+
+def test_disk_tier_keeps_running_byte_total(tmp_path, monkeypatch):
+    disk = DiskCache(str(tmp_path), max_bytes=1000)
+    disk.set("ns", "a", "x" * 28)
+    disk.set("ns", "a", "x" * 8)  # replacing subtracts the old size
+    disk.set("ns", "b", "x" * 18)
+    assert disk._total_bytes == 30 == disk.stats("ns")["bytes"]
+
+    # Another worker's writes are picked up at the next re-read
+    monkeypatch.setattr(disk_cache, "_RESYNC_WRITES", 1)
+    other = DiskCache(str(tmp_path), max_bytes=1000)
+    other.set("ns", "c", "x" * 958)
+    disk.set("ns", "d", "x" * 18)
+    assert disk.stats("ns")["bytes"] <= 1000
+    assert disk._total_bytes == disk.stats("ns")["bytes"]
+    assert disk.get("ns", "d") == "x" * 18
+
+    disk.clear("ns")
+    assert disk._total_bytes == 0
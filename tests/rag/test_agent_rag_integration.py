@@ -0,0 +1,85 @@
+"""
+Unit tests for the agent-side RAG helper's prefetched contexts.
+"""
+
+from types import SimpleNamespace
+
+from agent_system.rag_integration import AgentRAGService
+
+
+class _FakeSearch:
+    def __init__(self):
+        self.index_generation = 0
+        self.title = "Old"
+        self.searches = 0
+
+    def _results(self):
+        doc = SimpleNamespace(title=self.title, doc_id=self.title.lower())
+        return [SimpleNamespace(document=doc, matching_chunks=[], similarity_score=1.0)]
+
+    def search(self, query, top_k=3):
+        self.searches += 1
+        return self._results()
+
+    def search_many(self, queries, top_k=3):
+        return [self._results() for _ in queries]
+
+
+def _agent_service(search):
+    service = AgentRAGService(shared=False, knowledge_base_dir="missing_kb")
+    service.rag_service = search
+    service.is_initialized = True
+    return service
+
+
+def test_prefetched_context_is_reused_until_reindex():
+    search = _FakeSearch()
+    service = _agent_service(search)
+    service.search_many(["add login"])
+
+    assert service.get_relevant_context("add login")[0]["title"] == "Old"
+    assert search.searches == 0
+
+    # A reindex bumps the generation: the memo is stale
+    search.title = "New"
+    search.index_generation += 1
+    assert service.get_relevant_context("add login")[0]["title"] == "New"
+    assert search.searches == 1
+
+
+def test_clear_prefetched_forgets_batch_results():
+    search = _FakeSearch()
+    service = _agent_service(search)
+    service.search_many(["add login"])
+    service.clear_prefetched()
+
+    service.get_relevant_context("add login")
+    assert search.searches == 1
+
+
+
+def test_awarm_up_builds_shared_service_off_the_event_loop(monkeypatch):
+    import asyncio
+    import threading
+    from unittest.mock import patch
+
+    from agent_system import rag_integration
+    from sevdo_frontend.rag.registry import RAGRegistry
+
+    built_on = []
+
+    class _Service:
+        def __init__(self, knowledge_base_dir, model_name=None):
+            built_on.append(threading.get_ident())
+
+        def initialize(self):
+            return True
+
+    registry = RAGRegistry()
+    monkeypatch.setattr(rag_integration, "get_registry", lambda: registry)
+    with patch("sevdo_frontend.rag.registry.SimilaritySearchService", _Service):
+        asyncio.run(AgentRAGService.awarm_up())
+        service = AgentRAGService()
+
+    assert len(built_on) == 1 and built_on[0] != threading.get_ident()
+    assert service.is_initialized
@@ -0,0 +1,40 @@
+"""
+Unit tests for the IVF approximate nearest-neighbour index.
+"""
+
+import numpy as np
+
+from sevdo_frontend.rag.ann_benchmark import _synthetic_matrix, run
+from sevdo_frontend.rag.ann_index import IVFIndex
+from sevdo_frontend.rag.matrix_index import top_k_indices
+
+
+def test_full_probe_matches_exact_search():
+    matrix = _synthetic_matrix(2000, 32, 20, seed=0)
+    index = IVFIndex(matrix, nlist=16).build()
+
+    assert index.list_offsets[-1] == matrix.shape[0]
+    assert sorted(index.list_ids.tolist()) == list(range(matrix.shape[0]))
+    for q in matrix[:10]:
+        exact = top_k_indices(matrix @ q, 5)
+        approx = index.search(q, 5, nprobe=index.nlist)
+        assert approx.tolist() == exact.tolist()
+
+
+def test_tune_reaches_target_recall():
+    matrix = _synthetic_matrix(3000, 32, 30, seed=1)
+    index = IVFIndex(matrix, nlist=32).build()
+
+    recall = index.tune(0.9)
+
+    assert recall >= 0.9
+    assert 1 <= index.nprobe <= index.nlist
+    assert index.info()["estimated_recall"] == recall
+
+
+def test_benchmark_reports_recall_and_latency():
+    rows = run(chunks=1000, dim=16, queries=20, k=5)
+
+    assert rows[0]["mode"] == "exact" and rows[0]["recall"] == 1.0
+    assert rows[-1]["recall"] == 1.0
+    assert all(row["ms_per_query"] >= 0 for row in rows)
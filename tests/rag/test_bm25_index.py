@@ -0,0 +1,60 @@
+"""
+Unit tests for the BM25 inverted index and rank fusion.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from sevdo_frontend.rag.bm25_index import (
+    BM25Index,
+    reciprocal_rank_fusion,
+    tokenize,
+)
+
+
+def _doc(*chunks):
+    return SimpleNamespace(chunks=list(chunks))
+
+
+def test_tokenize_matches_character_rules():
+    assert tokenize("Login_Form: h(Title) ÄÖ 42x") == [
+        "login", "form", "h", "title", "äö", "42x"
+    ]
+
+
+def test_bm25_prefers_rare_and_frequent_terms():
+    docs = [
+        _doc("login form with email and password", "footer links"),
+        _doc("login login login button", "header title"),
+        _doc("newsletter signup form"),
+    ]
+    index = BM25Index(docs)
+
+    scores = index.chunk_scores("login")
+    assert scores.shape == (5,)
+    assert scores[2] > scores[0] > 0
+    assert scores[1] == scores[3] == scores[4] == 0
+
+    ranked = index.rank(index.chunk_scores("newsletter form"), top_k=2)
+    assert ranked[0][0] == 2
+
+
+def test_postings_only_touch_query_terms():
+    index = BM25Index([_doc("alpha beta", "beta gamma")])
+    ids, weights = index.postings["beta"]
+    assert ids.tolist() == [0, 1]
+    assert np.all(weights > 0)
+    assert not index.chunk_scores("unknown").any()
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    dense = np.array([0.9, 0.8, 0.1])
+    keyword = np.array([0.0, 2.0, 1.0])
+
+    fused = reciprocal_rank_fusion(dense, keyword)
+
+    assert fused.argmax() == 1
+    top = reciprocal_rank_fusion(np.array([1.0]), np.array([1.0]))
+    assert top[0] == pytest.approx(1.0)
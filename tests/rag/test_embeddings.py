@@ -1,4 +1,5 @@
 import pytest
+import time
 import numpy as np
 from pathlib import Path
 import sys
@@ -7,7 +8,7 @@ import sys
 repo_root = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(repo_root))
 
-from sevdo_frontend.rag.embeddings import EmbeddingsService
+from sevdo_frontend.rag.embeddings import EmbeddingsService, hash_embed_batch
 
 
 def test_embeddings_service_init():
@@ -91,3 +92,85 @@ def test_empty_text_handling():
         service.generate_embedding("   ")
     
     print("✅ Empty text validation working correctly")
+
+
+def test_query_cache_hits_and_normalization():
+    """Repeated queries are served from the LRU cache"""
+    service = EmbeddingsService(strategy="hash", cache_size=8)
+
+    first = service.generate_embedding("login  form")
+    second = service.generate_embedding(" login form ")
+
+    assert np.array_equal(first, second)
+    stats = service.get_model_info()["query_cache"]
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+    # Cached values are copies and cannot be corrupted by callers
+    second[:] = 0
+    assert np.array_equal(service.generate_embedding("login form"), first)
+
+
+def test_batch_embeddings_only_encode_misses():
+    """Batch calls reuse cached rows and encode only the misses"""
+    service = EmbeddingsService(strategy="hash", cache_size=8)
+    service.generate_embedding("header")
+
+    encoded = []
+    original = service._encode
+    service._encode = lambda texts: encoded.extend(texts) or original(texts)
+    out = service.generate_batch_embeddings(["header", "", "button"])
+
+    assert encoded == ["button"]
+    assert out.shape == (3, 384)
+    assert np.array_equal(out[0], service.generate_embedding("header"))
+    assert not out[1].any()
+
+    encoded.clear()
+    service.generate_batch_embeddings(["footer"], use_cache=False)
+    service.generate_batch_embeddings(["footer"])
+    assert encoded == ["footer", "footer"]
+
+
+def test_query_cache_eviction_and_ttl():
+    """The cache is bounded and entries expire after the TTL"""
+    service = EmbeddingsService(strategy="hash", cache_size=2)
+    for text in ["a", "b", "c"]:
+        service.generate_embedding(text)
+    assert service.cache.stats()["evictions"] == 1
+    assert service.cache.stats()["size"] == 2
+
+    expiring = EmbeddingsService(strategy="hash", cache_size=4, cache_ttl=0.01)
+    expiring.generate_embedding("a")
+    time.sleep(0.02)
+    expiring.generate_embedding("a")
+    stats = expiring.cache.stats()
+    assert stats["hits"] == 0 and stats["misses"] == 2 and stats["evictions"] == 1
+
+
+def test_hash_backend_batch_matches_single_embeddings():
+    """The batched hash path is deterministic and row-independent"""
+    service = EmbeddingsService(strategy="hash", cache_size=0)
+    texts = ["Navigation sidebar menu", "", "login form with password"]
+
+    batch = service.generate_batch_embeddings(texts)
+
+    assert batch.shape == (3, 384) and batch.dtype == np.float32
+    assert not batch[1].any()
+    assert np.allclose(batch[0], service.generate_embedding(texts[0]))
+    assert np.allclose(batch[2], hash_embed_batch([texts[2]])[0])
+    assert np.linalg.norm(batch[2]) == pytest.approx(1.0, abs=1e-5)
+
+
+def test_hash_backend_reflects_lexical_overlap():
+    """Texts sharing words or word forms are closer than unrelated ones"""
+    login, page, database, plural = hash_embed_batch(
+        [
+            "login form with password",
+            "password login page",
+            "database migration tool",
+            "login forms with passwords",
+        ]
+    )
+
+    assert login @ page > login @ database + 0.3
+    assert login @ plural > login @ database + 0.3
@@ -0,0 +1,110 @@
+"""
+Unit tests for the process-wide RAG registry.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from sevdo_frontend.rag.registry import RAGRegistry
+
+
+class _FakeService:
+    instances = 0
+
+    def __init__(self, knowledge_base_dir, model_name=None):
+        type(self).instances += 1
+        self.knowledge_base_dir = knowledge_base_dir
+        self.model_name = model_name
+
+    def initialize(self):
+        time.sleep(0.05)
+        return True
+
+
+@pytest.fixture
+def registry():
+    _FakeService.instances = 0
+    with patch("sevdo_frontend.rag.registry.SimilaritySearchService", _FakeService):
+        yield RAGRegistry()
+
+
+def test_get_returns_shared_service(registry, tmp_path):
+    first = registry.get(str(tmp_path))
+    second = registry.get(str(tmp_path / "."))
+
+    assert first is second
+    assert _FakeService.instances == 1
+    assert registry.is_ready(str(tmp_path))
+
+
+def test_services_are_keyed_by_model(registry, tmp_path):
+    a = registry.get(str(tmp_path), "model-a")
+    b = registry.get(str(tmp_path), "model-b")
+
+    assert a is not b
+    assert b.model_name == "model-b"
+
+
+def test_concurrent_threads_warm_up_once(registry, tmp_path):
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(registry.get(str(tmp_path))))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert _FakeService.instances == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_aget_and_status_report_timing(registry, tmp_path):
+    async def fetch_many():
+        return await asyncio.gather(
+            *(registry.aget(str(tmp_path)) for _ in range(4))
+        )
+
+    services = asyncio.run(fetch_many())
+
+    assert len({id(s) for s in services}) == 1
+    (status,) = registry.status()
+    assert status["ready"]
+    assert status["warmup_seconds"] >= 0.05
+    assert status["error"] is None
+
+
+def test_failed_warm_up_is_reported(registry, tmp_path):
+    with patch.object(_FakeService, "initialize", side_effect=RuntimeError("boom")):
+        assert registry.get(str(tmp_path)) is None
+
+    (status,) = registry.status()
+    assert not status["ready"]
+    assert status["error"] == "boom"
+
+
+def test_failed_warm_up_is_retried_after_backoff(registry, tmp_path, monkeypatch):
+    monkeypatch.setenv("RAG_WARMUP_RETRY_SECONDS", "60")
+    with patch.object(_FakeService, "initialize", return_value=False):
+        registry.get(str(tmp_path))
+        registry.get(str(tmp_path))
+
+    # Still backing off: no second attempt
+    assert _FakeService.instances == 1
+    assert not registry.is_ready(str(tmp_path))
+    (status,) = registry.status()
+    assert status["backing_off"]
+
+    monkeypatch.setenv("RAG_WARMUP_RETRY_SECONDS", "0")
+    service = registry.get(str(tmp_path))
+
+    assert _FakeService.instances == 2
+    assert service is not None
+    assert registry.is_ready(str(tmp_path))
+    (status,) = registry.status()
+    assert status["ready"] and not status["backing_off"]
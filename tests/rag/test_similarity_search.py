@@ -337,3 +337,375 @@ This is the main content."""
             assert not success
         finally:
             shutil.rmtree(empty_dir)
+
+    def _service_with_embeddings(self, search_engine):
+        """Build a service whose chunks carry deterministic embeddings."""
+        from sevdo_frontend.rag.embeddings import EmbeddingsService
+
+        rng = np.random.default_rng(7)
+        mock_service = Mock()
+        mock_service.generate_batch_embeddings.side_effect = (
+            lambda texts, **kwargs: rng.standard_normal((len(texts), 16))
+        )
+        mock_service.compute_similarity.side_effect = (
+            lambda a, b: EmbeddingsService.compute_similarity(None, a, b)
+        )
+
+        service = SimilaritySearchService(
+            knowledge_base_dir=self.test_kb_dir, search_engine=search_engine
+        )
+        service.embeddings_service = mock_service
+        service.load_documents()
+        for doc in service.documents:
+            doc.chunks = doc.chunks * 3
+        service.generate_embeddings()
+        return service, mock_service
+
+    def test_matrix_engine_matches_loop_engine(self):
+        """The vectorized engine ranks documents and chunks like the loop."""
+        loop, loop_mock = self._service_with_embeddings("loop")
+        matrix, matrix_mock = self._service_with_embeddings("matrix")
+        query = np.random.default_rng(11).standard_normal(16)
+        loop_mock.generate_embedding.return_value = query
+        matrix_mock.generate_embedding.return_value = query
+
+        expected = loop.search("query", top_k=2)
+        actual = matrix.search("query", top_k=2)
+
+        assert [r.document.doc_id for r in actual] == [
+            r.document.doc_id for r in expected
+        ]
+        for got, want in zip(actual, expected):
+            assert got.similarity_score == pytest.approx(want.similarity_score, abs=1e-5)
+            assert [c for c, _ in got.matching_chunks] == [
+                c for c, _ in want.matching_chunks
+            ]
+        matrix_mock.compute_similarity.assert_not_called()
+        assert matrix.get_info()["indexed_chunks"] == sum(
+            len(doc.chunks) for doc in matrix.documents
+        )
+
+    def test_search_engine_defaults_to_matrix(self):
+        """Unknown engine names fall back to the matrix engine."""
+        service = SimilaritySearchService(
+            knowledge_base_dir=self.test_kb_dir, search_engine="bogus"
+        )
+        assert service.search_engine == "matrix"
+
+    def test_search_many_matches_single_searches(self):
+        """search_many embeds once and returns the same ranking as search."""
+        service, mock_service = self._service_with_embeddings("matrix")
+        queries = np.random.default_rng(3).standard_normal((3, 16))
+        mock_service.generate_batch_embeddings.reset_mock(side_effect=True)
+        mock_service.generate_batch_embeddings.return_value = queries
+
+        batched = service.search_many(["a", "b", "c"], top_k=2)
+
+        assert mock_service.generate_batch_embeddings.call_count == 1
+        assert len(batched) == 3
+        for query, results in zip(queries, batched):
+            mock_service.generate_embedding.return_value = query
+            single = service.search("q", top_k=2)
+            assert [r.document.doc_id for r in results] == [
+                r.document.doc_id for r in single
+            ]
+            assert [r.similarity_score for r in results] == pytest.approx(
+                [r.similarity_score for r in single]
+            )
+
+    def test_search_many_skips_empty_queries(self):
+        """Empty queries yield empty result lists without being embedded."""
+        service, mock_service = self._service_with_embeddings("matrix")
+        mock_service.generate_batch_embeddings.reset_mock(side_effect=True)
+        mock_service.generate_batch_embeddings.return_value = np.ones((1, 16))
+
+        batched = service.search_many(["", "login", "  "], top_k=1)
+
+        mock_service.generate_batch_embeddings.assert_called_once_with(["login"])
+        assert batched[0] == [] and batched[2] == []
+        assert len(batched[1]) == 1
+
+    def test_search_skips_blank_query(self):
+        """A blank query returns nothing without tripping the breaker."""
+        service, mock_service = self._service_with_embeddings("matrix")
+        mock_service.generate_embedding.side_effect = ValueError("empty text")
+
+        for _ in range(service.circuit_breaker_threshold + 1):
+            assert service.search("   ", top_k=1) == []
+
+        mock_service.generate_embedding.assert_not_called()
+        assert not service._embedding_backend_disabled
+
+    def test_reindex_only_embeds_changed_files(self):
+        """reindex re-embeds modified/added files and drops deleted ones."""
+        service, mock_service = self._service_with_embeddings("matrix")
+        backend_path = os.path.join(self.test_kb_dir, "backend.md")
+        frontend_path = os.path.join(self.test_kb_dir, "frontend.md")
+        untouched = next(
+            d for d in service.documents if d.file_path == frontend_path
+        )
+        mock_service.generate_batch_embeddings.reset_mock()
+
+        with open(backend_path, "a") as f:
+            f.write("\n- /api/users/delete - Delete user\n")
+        os.utime(backend_path, ns=(0, 1))
+        with open(os.path.join(self.test_kb_dir, "extra.md"), "w") as f:
+            f.write("---\ntitle: Extra\ndoc_id: kb:extra\n---\n\nExtra notes.")
+        summary = service.reindex()
+
+        assert summary["updated"] == [backend_path]
+        assert summary["added"] == [os.path.join(self.test_kb_dir, "extra.md")]
+        assert summary["unchanged"] == [frontend_path]
+        assert mock_service.generate_batch_embeddings.call_count == 2
+        assert any(d is untouched for d in service.documents)
+        assert service.get_info()["indexed_chunks"] == sum(
+            len(d.chunks) for d in service.documents
+        )
+
+        os.remove(backend_path)
+        summary = service.reindex()
+        assert summary["removed"] == [backend_path]
+        assert {d.file_path for d in service.documents} == {
+            frontend_path,
+            os.path.join(self.test_kb_dir, "extra.md"),
+        }
+        mock_service.generate_embedding.return_value = np.ones(16)
+        assert len(service.search("users", top_k=5)) == 2
+
+    def test_reindex_ignores_touched_but_unmodified_files(self):
+        """A changed mtime with identical content does not re-embed."""
+        service, mock_service = self._service_with_embeddings("matrix")
+        mock_service.generate_batch_embeddings.reset_mock()
+        os.utime(os.path.join(self.test_kb_dir, "backend.md"), ns=(0, 1))
+
+        summary = service.reindex()
+
+        assert not summary["updated"] and len(summary["unchanged"]) == 2
+        mock_service.generate_batch_embeddings.assert_not_called()
+
+    def test_embedding_store_is_memory_mapped_and_reused(self):
+        """A second service maps the consolidated store instead of re-embedding."""
+        mock_service = Mock()
+        mock_service.get_model_info.return_value = {
+            "backend": "hash",
+            "model_name": "test-model",
+        }
+        mock_service.generate_batch_embeddings.side_effect = (
+            lambda texts, **kwargs: np.random.default_rng(len(texts)).standard_normal(
+                (len(texts), 8)
+            )
+        )
+
+        def build():
+            service = SimilaritySearchService(knowledge_base_dir=self.test_kb_dir)
+            service.embeddings_service = mock_service
+            service.enable_cache = True
+            service.load_documents()
+            assert service.generate_embeddings()
+            return service
+
+        first = build()
+        store_files = sorted(os.listdir(first.index_dir))
+        assert store_files == [
+            "hash.test-model.embeddings.npy",
+            "hash.test-model.meta.json",
+        ]
+        calls = mock_service.generate_batch_embeddings.call_count
+
+        second = build()
+
+        assert mock_service.generate_batch_embeddings.call_count == calls
+        assert second.get_info()["cache_hits"] == 2
+        matrix = second._get_chunk_matrix().matrix
+        assert isinstance(matrix, np.memmap)
+        for doc in second.documents:
+            assert np.shares_memory(doc.embeddings, matrix)
+
+        mock_service.generate_embedding.return_value = np.ones(8)
+        first_ids = [r.document.doc_id for r in first.search("q", top_k=2)]
+        assert [r.document.doc_id for r in second.search("q", top_k=2)] == first_ids
+
+    def test_embedding_store_misses_on_changed_content(self):
+        """Store entries are keyed by content hash, not just file path."""
+        mock_service = Mock()
+        mock_service.get_model_info.return_value = {
+            "backend": "hash",
+            "model_name": "test-model",
+        }
+        mock_service.generate_batch_embeddings.side_effect = (
+            lambda texts, **kwargs: np.ones((len(texts), 4))
+        )
+        service = SimilaritySearchService(knowledge_base_dir=self.test_kb_dir)
+        service.embeddings_service = mock_service
+        service.enable_cache = True
+        service.load_documents()
+        service.generate_embeddings()
+
+        with open(os.path.join(self.test_kb_dir, "backend.md"), "a") as f:
+            f.write("\nMore text.\n")
+        mock_service.generate_batch_embeddings.reset_mock()
+        os.utime(os.path.join(self.test_kb_dir, "backend.md"), ns=(0, 1))
+        summary = service.reindex()
+
+        assert len(summary["updated"]) == 1
+        assert mock_service.generate_batch_embeddings.call_count == 1
+        assert service.get_info()["store_mapped"]
+
+    def test_ivf_ann_index_behind_search(self):
+        """The ANN option keeps the search() signature and result shape."""
+        service, mock_service = self._service_with_embeddings("matrix")
+        service.ann = "ivf"
+        service.ann_min_chunks = 1
+        service.ann_nlist = 2
+        service.ann_nprobe = 2
+
+        assert service.rebuild_ann()
+        assert service.get_info()["ann"]["nlist"] == 2
+
+        query = np.random.default_rng(5).standard_normal(16)
+        mock_service.generate_embedding.return_value = query
+        approx = service.search("query", top_k=2)
+        service.ann = "none"
+        service._chunk_matrix = None
+        exact = service.search("query", top_k=2)
+
+        # Probing every list is exact
+        assert [r.document.doc_id for r in approx] == [
+            r.document.doc_id for r in exact
+        ]
+        assert [r.similarity_score for r in approx] == pytest.approx(
+            [r.similarity_score for r in exact]
+        )
+
+    def test_keyword_fallback_uses_bm25(self):
+        """Without embeddings the keyword fallback ranks with BM25."""
+        self.service.embeddings_service = None
+        self.service.enable_keyword_fallback = True
+        self.service.load_documents()
+
+        results = self.service.search("navigation sidebar", top_k=2)
+
+        assert results[0].document.doc_id == "kb:frontend:components:v1"
+        assert results[0].similarity_score == pytest.approx(1.0)
+        assert "Sidebar" in results[0].matching_chunks[0][0]
+        assert self.service.get_info()["keyword_index_terms"] > 0
+
+    def test_hybrid_ranking_fuses_bm25_and_cosine(self):
+        """Hybrid mode lifts the keyword match even if cosine prefers another."""
+        service, mock_service = self._service_with_embeddings("matrix")
+        service.ranking = "hybrid"
+        frontend = next(
+            d for d in service.documents if d.doc_id == "kb:frontend:components:v1"
+        )
+        # Query embedding equal to a backend chunk: cosine prefers backend
+        backend = next(d for d in service.documents if d is not frontend)
+        mock_service.generate_embedding.return_value = np.asarray(
+            backend.embeddings[0]
+        )
+
+        results = service.search("Sidebar navigation menu Navbar", top_k=2)
+
+        assert {r.document.doc_id for r in results} == {
+            frontend.doc_id,
+            backend.doc_id,
+        }
+        assert all(0 < r.similarity_score <= 1 for r in results)
+        frontend_result = next(r for r in results if r.document is frontend)
+        assert "Sidebar" in frontend_result.matching_chunks[0][0]
+
+    def test_quantized_matrix_matches_float_ranking(self):
+        """int8 storage is ~4x smaller and, with re-rank, scores exactly."""
+        exact, exact_mock = self._service_with_embeddings("matrix")
+        quantized, quantized_mock = self._service_with_embeddings("matrix")
+        quantized.quantization = "int8"
+        quantized._chunk_matrix = None
+        query = np.random.default_rng(3).standard_normal(16)
+        exact_mock.generate_embedding.return_value = query
+        quantized_mock.generate_embedding.return_value = query
+
+        expected = exact.search("query", top_k=2)
+        actual = quantized.search("query", top_k=2)
+
+        assert [r.document.doc_id for r in actual] == [
+            r.document.doc_id for r in expected
+        ]
+        assert [r.similarity_score for r in actual] == pytest.approx(
+            [r.similarity_score for r in expected], abs=1e-5
+        )
+        info = quantized.get_info()
+        assert info["quantization"] == "int8"
+        float_bytes = exact.get_info()["index_bytes"]
+        assert info["index_bytes"] < float_bytes / 2
+
+    def test_quantized_matrix_keeps_no_float32_copy(self):
+        """Quantized ANN scoring holds no private float32 matrix."""
+        exact, exact_mock = self._service_with_embeddings("matrix")
+        quantized, quantized_mock = self._service_with_embeddings("matrix")
+        for service in (exact, quantized):
+            service.ann = "ivf"
+            service.ann_min_chunks = 1
+            service.ann_nprobe = 1000
+        quantized.quantization = "int8"
+        quantized._chunk_matrix = None
+        query = np.random.default_rng(5).standard_normal(16)
+        exact_mock.generate_embedding.return_value = query
+        quantized_mock.generate_embedding.return_value = query
+
+        expected = exact.search("query", top_k=2)
+        actual = quantized.search("query", top_k=2)
+
+        matrix = quantized._get_chunk_matrix()
+        assert matrix.matrix.dtype == np.int8
+        assert matrix.ann is not None and matrix.ann.matrix is None
+        # Re-rank reads the documents' own embeddings, not a copy
+        assert matrix.exact is None
+        assert [r.similarity_score for r in actual] == pytest.approx(
+            [r.similarity_score for r in expected], abs=1e-5
+        )
+
+    def test_quantize_rows_error_is_bounded(self):
+        """Dequantized int8 rows stay within half a quantization step."""
+        from sevdo_frontend.rag.matrix_index import normalize_rows, quantize_rows
+
+        matrix = normalize_rows(np.random.default_rng(0).standard_normal((50, 32)))[0]
+        matrix[3] = 0.0
+        quantized, scales = quantize_rows(matrix, "int8")
+
+        assert quantized.dtype == np.int8
+        assert scales[3] == 0.0
+        error = np.abs(quantized * scales[:, None] - matrix)
+        assert np.all(error <= scales[:, None] / 2 + 1e-7)
+
+    def test_embedding_store_maps_quantized_copy(self):
+        """With quantization the store writes and re-maps an int8 matrix."""
+        mock_service = Mock()
+        mock_service.get_model_info.return_value = {
+            "backend": "hash",
+            "model_name": "test-model",
+        }
+        mock_service.generate_batch_embeddings.side_effect = (
+            lambda texts, **kwargs: np.random.default_rng(len(texts)).standard_normal(
+                (len(texts), 8)
+            )
+        )
+
+        def build():
+            service = SimilaritySearchService(
+                knowledge_base_dir=self.test_kb_dir, quantization="int8"
+            )
+            service.embeddings_service = mock_service
+            service.enable_cache = True
+            service.load_documents()
+            assert service.generate_embeddings()
+            return service
+
+        first = build()
+        assert "hash.test-model.int8.npy" in os.listdir(first.index_dir)
+
+        second = build()
+        matrix = second._get_chunk_matrix()
+        assert matrix.quantization == "int8"
+        assert isinstance(matrix.matrix, np.memmap)
+        assert isinstance(matrix.exact, np.memmap)
+        mock_service.generate_embedding.return_value = np.ones(8)
+        assert len(second.search("q", top_k=2)) == 2
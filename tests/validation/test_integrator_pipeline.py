@@ -0,0 +1,96 @@
+import threading
+import time
+from pathlib import Path
+
+import sevdo_integrator
+from sevdo_integrator import PipelineScheduler, SevdoIntegrator
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_scheduler_times_stages_and_keeps_map_order():
+    scheduler = PipelineScheduler(max_workers=4)
+    try:
+        background = scheduler.submit("slow", time.sleep, 0.05)
+        assert scheduler.map("pages", lambda n: n * n, [3, 1, 2]) == [9, 1, 4]
+        assert scheduler.run("inline", lambda: "done") == "done"
+        background.result()
+    finally:
+        scheduler.shutdown()
+    assert list(scheduler.timings) == ["pages", "inline", "slow"]
+    assert scheduler.timings["slow"] >= 0.05
+
+
+def test_fullstack_generation_overlaps_npm_install(tmp_path, monkeypatch):
+    # generate_backend copies sevdo_backend/models.py relative to the cwd
+    monkeypatch.chdir(ROOT)
+    integrator = SevdoIntegrator(templates_dir=str(ROOT / "templates"))
+    events = []
+    install_started = threading.Event()
+    pages_started = threading.Event()
+
+    def fake_install(frontend_dir):
+        assert (frontend_dir / "package.json").exists()
+        events.append("install_start")
+        install_started.set()
+        # Only finishes once the frontend has moved on to compiling pages
+        assert pages_started.wait(5)
+        events.append("install_end")
+        return True
+
+    def fake_build(frontend_dir):
+        events.append("build")
+        return True
+
+    original_api_props = integrator._frontend_api_props
+
+    def api_props(*args):
+        assert install_started.wait(5)
+        events.append("pages")
+        pages_started.set()
+        return original_api_props(*args)
+
+    monkeypatch.setattr(integrator, "_npm_install", fake_install)
+    monkeypatch.setattr(integrator, "_npm_build", fake_build)
+    monkeypatch.setattr(integrator, "_frontend_api_props", api_props)
+    scheduler_timings = {}
+    original_report = PipelineScheduler.report
+
+    def report(self):
+        scheduler_timings.update(self.timings)
+        original_report(self)
+
+    monkeypatch.setattr(sevdo_integrator.PipelineScheduler, "report", report)
+
+    assert integrator.generate_fullstack_app("blog_site", str(tmp_path / "app"))
+
+    pages = sorted((ROOT / "templates" / "blog_site" / "frontend").glob("*.s"))
+    components = tmp_path / "app" / "frontend" / "src" / "components"
+    assert sorted(p.name for p in components.iterdir()) == sorted(
+        f"{p.stem.capitalize()}.jsx" for p in pages
+    )
+    assert (tmp_path / "app" / "backend" / "main.py").exists()
+    # One install, running while pages compile, and the build after it
+    assert events == ["install_start", "pages", "install_end", "build"]
+    assert {"backend", "npm_install", "compile_pages", "npm_build"} <= set(
+        scheduler_timings
+    )
+
+
+def test_pipeline_workers_falls_back_on_malformed_env(monkeypatch):
+    monkeypatch.setenv("SEVDO_PIPELINE_WORKERS", "eight")
+    assert sevdo_integrator._pipeline_workers() == 4
+    monkeypatch.setenv("SEVDO_PIPELINE_WORKERS", " 6 ")
+    assert sevdo_integrator._pipeline_workers() == 6
+    monkeypatch.delenv("SEVDO_PIPELINE_WORKERS")
+    assert sevdo_integrator._pipeline_workers() == 4
+
+
+def test_generate_frontend_does_not_print_stage_report(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(ROOT)
+    integrator = SevdoIntegrator(templates_dir=str(ROOT / "templates"))
+    monkeypatch.setattr(integrator, "_npm_install", lambda frontend_dir: True)
+    monkeypatch.setattr(integrator, "_npm_build", lambda frontend_dir: True)
+
+    assert integrator.generate_frontend("blog_site", tmp_path / "frontend")
+    assert "Stage timings" not in capsys.readouterr().out
@@ -45,8 +45,17 @@ class RealtimeAIEditor:
     """AI editor that provides real-time preview updates"""
 
     def __init__(self):
-        self.rag_service = AgentRAGService()
+        self._rag_service = None  # Shared RAG service, resolved on first use
         self.active_edits = {}  # Track ongoing edits
+        # .s path -> handle of its last incremental frontend compile
+        self._fe_compile_handles: Dict[str, str] = {}
+
+    async def get_rag_service(self) -> AgentRAGService:
+        """The shared RAG service, warmed up off the event loop on first use."""
+        if self._rag_service is None:
+            await AgentRAGService.awarm_up()
+            self._rag_service = AgentRAGService()
+        return self._rag_service
 
     async def apply_realtime_edit(
         self,
@@ -83,6 +92,10 @@ class RealtimeAIEditor:
                 file_type = file_info["type"]  # "frontend" or "backend"
 
                 logger.info(f"Processing {file_type} file: {file_path}")
+                try:
+                    previous_content = file_path.read_text(encoding="utf-8")
+                except OSError:
+                    previous_content = None
 
                 # Apply LLM edit to .s file
                 edit_result = apply_llm_edit(
@@ -99,7 +112,7 @@ class RealtimeAIEditor:
 
                     # 4. Compile .s file to actual code
                     compilation_result = await self._compile_sevdo_file(
-                        file_path, file_type, website_dir
+                        file_path, file_type, website_dir, previous_content
                     )
                     compilation_results[str(file_path)] = compilation_result
 
@@ -168,8 +181,9 @@ class RealtimeAIEditor:
         """Use RAG to analyze instruction and find relevant .s files to modify"""
 
         # Get relevant context from RAG
-        context = self.rag_service.get_relevant_context(instruction)
-        suggested_tokens = self.rag_service.suggest_tokens(instruction)
+        rag_service = await self.get_rag_service()
+        context = rag_service.get_relevant_context(instruction)
+        suggested_tokens = rag_service.suggest_tokens(instruction)
 
         # Determine if this is frontend or backend focused
         is_backend = any(
@@ -226,9 +240,18 @@ class RealtimeAIEditor:
         return target_files
 
     async def _compile_sevdo_file(
-        self, s_file_path: Path, file_type: str, website_dir: Path
+        self,
+        s_file_path: Path,
+        file_type: str,
+        website_dir: Path,
+        previous_content: Optional[str] = None,
     ) -> Dict[str, any]:
-        """Compile .s file using SEVDO compilers"""
+        """Compile .s file using SEVDO compilers.
+
+        Frontend files are recompiled incrementally against the previous
+        compile (or ``previous_content``), so only edited statements are
+        re-rendered; the result carries the node-level ``changes``.
+        """
 
         try:
             # Read .s file content
@@ -241,22 +264,39 @@ class RealtimeAIEditor:
                 fe_base = os.environ.get(
                     "SEVDO_FRONTEND_URL", "http://sevdo-frontend:8002"
                 )
+                payload = {
+                    "dsl_content": s_content,
+                    "component_name": s_file_path.stem.capitalize(),
+                    "include_imports": True,
+                }
+                handle_key = str(s_file_path)
 
                 response = requests.post(
-                    f"{fe_base}/api/fe-translate/to-s-direct",
+                    f"{fe_base}/api/fe-translate/incremental",
                     json={
-                        "dsl_content": s_content,
-                        "component_name": s_file_path.stem.capitalize(),
-                        "include_imports": True,
+                        **payload,
+                        "previous_handle": self._fe_compile_handles.get(handle_key),
+                        "previous_content": previous_content,
                     },
                     timeout=10,
                 )
+                if response.status_code == 404:
+                    # Compiler service without the incremental endpoint
+                    response = requests.post(
+                        f"{fe_base}/api/fe-translate/to-s-direct",
+                        json=payload,
+                        timeout=10,
+                    )
 
                 if response.status_code == 200:
+                    data = response.json()
+                    if data.get("handle"):
+                        self._fe_compile_handles[handle_key] = data["handle"]
                     return {
                         "success": True,
-                        "compiled_code": response.json().get("code", ""),
+                        "compiled_code": data.get("code", ""),
                         "file_type": "jsx",
+                        "changes": data.get("changes"),
                     }
                 else:
                     return {
@@ -80,6 +80,27 @@ async def system_status(db: Session = Depends(get_db)):
             "last_checked": datetime.utcnow(),
         }
 
+    # Shared RAG service status (readiness and warm-up timing)
+    try:
+        from sevdo_frontend.rag.registry import get_registry
+
+        rag_entries = get_registry().status()
+        if not rag_entries:
+            rag_status = "idle"
+        elif all(e["ready"] for e in rag_entries):
+            rag_status = "healthy"
+        elif any(e["warming_up"] for e in rag_entries):
+            rag_status = "warming_up"
+        else:
+            rag_status = "degraded"
+        services["rag"] = {
+            "status": rag_status,
+            "services": rag_entries,
+            "last_checked": datetime.utcnow(),
+        }
+    except ImportError:
+        pass
+
     # Overall status
     overall_status = "healthy"
     if any(s.get("status") == "down" for s in services.values()):
@@ -50,6 +50,16 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Database initialization failed: {e}")
 
+    # Optionally load the shared RAG model/index before the first agent request
+    if os.getenv("RAG_WARMUP_ON_STARTUP", "0").lower() in {"1", "true", "yes"}:
+        try:
+            from agent_system.rag_integration import AgentRAGService
+
+            AgentRAGService.warm_up(background=True)
+            logger.info("RAG warm-up started in background")
+        except Exception as e:
+            logger.error(f"RAG warm-up could not be started: {e}")
+
     yield
 
     # Shutdown